@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 import matplotlib.pyplot as plt
 from strategies.ict_combined_strategy import ICTCombinedStrategy
+from backtesting.ledger import TradeLedger, EquityBuffer, max_drawdown, sharpe_ratio, trade_metrics
 
 class Backtest:
     def __init__(self, strategy: ICTCombinedStrategy, initial_balance: float = 10000):
@@ -11,33 +12,34 @@ class Backtest:
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.positions = []
-        self.trades = []
-        self.equity_curve = []
+        self.trades = TradeLedger()
+        self.equity_curve = EquityBuffer()
         
-    def run(self, data: pd.DataFrame) -> Dict:
+    def run(self, data: pd.DataFrame, mode: str = 'full') -> Dict:
         """
         Run backtest on historical data
         
         Args:
             data (pd.DataFrame): Historical price data
+            mode (str): 'full' re-analyzes the growing history on every bar,
+                'incremental' streams each bar once through the strategy's
+                on_bar state, 'vectorized' precomputes every signal with
+                analyze_batch. All three produce the same trades.
             
         Returns:
             Dict: Backtest results
         """
+        if mode not in ('full', 'incremental', 'vectorized'):
+            raise ValueError(f"Unknown backtest mode: {mode}")
+            
         self.balance = self.initial_balance
         self.positions = []
-        self.trades = []
-        self.equity_curve = []
+        self.trades = TradeLedger(tz=getattr(data.index, 'tz', None))
+        self.equity_curve = EquityBuffer(capacity=len(data))
         
-        for i in range(len(data)):
-            current_data = data.iloc[:i+1]
-            current_price = current_data['close'].iloc[-1]
-            
+        for current_time, current_price, signal in self._signal_stream(data, mode):
             # Update existing positions
-            self._update_positions(current_price)
-            
-            # Generate new signals
-            signal = self.strategy.analyze(current_data)
+            self._update_positions(current_price, current_time)
             
             if signal and not self.positions:  # Only enter if no current position
                 self._enter_position(signal, current_price)
@@ -47,64 +49,94 @@ class Backtest:
         
         return self._generate_results()
     
-    def _update_positions(self, current_price: float):
+    def _signal_stream(self, data: pd.DataFrame, mode: str):
+        """Yield (time, close, signal) for every bar in the requested engine mode"""
+        if mode == 'full':
+            for i in range(len(data)):
+                current_data = data.iloc[:i+1]
+                yield data.index[i], current_data['close'].iloc[-1], self.strategy.analyze(current_data)
+            return
+            
+        closes = data['close'].to_numpy()
+        if mode == 'vectorized':
+            signals = self.strategy.analyze_batch(data).to_numpy()
+            yield from zip(data.index, closes, signals)
+            return
+            
+        self.strategy.reset_incremental_state()
+        opens = data['open'].to_numpy()
+        highs = data['high'].to_numpy()
+        lows = data['low'].to_numpy()
+        for i, timestamp in enumerate(data.index):
+            signal = self.strategy.on_bar(timestamp, opens[i], highs[i], lows[i], closes[i])
+            yield timestamp, closes[i], signal
+    
+    def _update_positions(self, current_price: float, current_time=None):
         """Update existing positions"""
         for position in self.positions[:]:  # Create a copy to iterate
-            position['current_time'] = current_price  # Update current time
+            position['current_time'] = current_time  # Update current time
             
             if position['action'] == 'buy':
                 if current_price >= position['take_profit']:
                     # Close at take profit
                     profit = (position['take_profit'] - position['entry_price']) * position['size']
                     self.balance += profit
-                    self.trades.append({
-                        'entry_time': position['entry_time'],
-                        'exit_time': position['current_time'],
-                        'entry_price': position['entry_price'],
-                        'exit_price': position['take_profit'],
-                        'profit': profit,
-                        'type': 'tp'
-                    })
+                    self.trades.append(
+                        entry_time=position['entry_time'],
+                        exit_time=position['current_time'],
+                        entry_price=position['entry_price'],
+                        exit_price=position['take_profit'],
+                        profit=profit,
+                        exit_type='tp',
+                        action=position['action'],
+                        size=position['size']
+                    )
                     self.positions.remove(position)
                 elif current_price <= position['stop_loss']:
                     # Close at stop loss
                     loss = (position['stop_loss'] - position['entry_price']) * position['size']
                     self.balance += loss
-                    self.trades.append({
-                        'entry_time': position['entry_time'],
-                        'exit_time': position['current_time'],
-                        'entry_price': position['entry_price'],
-                        'exit_price': position['stop_loss'],
-                        'profit': loss,
-                        'type': 'sl'
-                    })
+                    self.trades.append(
+                        entry_time=position['entry_time'],
+                        exit_time=position['current_time'],
+                        entry_price=position['entry_price'],
+                        exit_price=position['stop_loss'],
+                        profit=loss,
+                        exit_type='sl',
+                        action=position['action'],
+                        size=position['size']
+                    )
                     self.positions.remove(position)
             else:  # sell position
                 if current_price <= position['take_profit']:
                     # Close at take profit
                     profit = (position['entry_price'] - position['take_profit']) * position['size']
                     self.balance += profit
-                    self.trades.append({
-                        'entry_time': position['entry_time'],
-                        'exit_time': position['current_time'],
-                        'entry_price': position['entry_price'],
-                        'exit_price': position['take_profit'],
-                        'profit': profit,
-                        'type': 'tp'
-                    })
+                    self.trades.append(
+                        entry_time=position['entry_time'],
+                        exit_time=position['current_time'],
+                        entry_price=position['entry_price'],
+                        exit_price=position['take_profit'],
+                        profit=profit,
+                        exit_type='tp',
+                        action=position['action'],
+                        size=position['size']
+                    )
                     self.positions.remove(position)
                 elif current_price >= position['stop_loss']:
                     # Close at stop loss
                     loss = (position['entry_price'] - position['stop_loss']) * position['size']
                     self.balance += loss
-                    self.trades.append({
-                        'entry_time': position['entry_time'],
-                        'exit_time': position['current_time'],
-                        'entry_price': position['entry_price'],
-                        'exit_price': position['stop_loss'],
-                        'profit': loss,
-                        'type': 'sl'
-                    })
+                    self.trades.append(
+                        entry_time=position['entry_time'],
+                        exit_time=position['current_time'],
+                        entry_price=position['entry_price'],
+                        exit_price=position['stop_loss'],
+                        profit=loss,
+                        exit_type='sl',
+                        action=position['action'],
+                        size=position['size']
+                    )
                     self.positions.remove(position)
     
     def _enter_position(self, signal: Dict, current_price: float):
@@ -137,8 +169,16 @@ class Backtest:
         return equity
     
     def _generate_results(self) -> Dict:
-        """Generate backtest results"""
-        if not self.trades:
+        """
+        Generate backtest results
+
+        Returns:
+            Dict: Summary statistics, plus 'trades' as a list of trade dicts and
+                'equity_curve' as a list of floats, as before; the arrays
+                behind them stay on self.trades and self.equity_curve
+        """
+        equity = self.equity_curve.values
+        if not len(self.trades):
             return {
                 'total_trades': 0,
                 'winning_trades': 0,
@@ -149,42 +189,19 @@ class Backtest:
                 'final_balance': self.initial_balance,
                 'total_return': 0,
                 'sharpe_ratio': 0,
-                'trades': [],  # Add empty trades list
-                'equity_curve': self.equity_curve
+                'trades': self.trades.to_list(),
+                'equity_curve': equity.tolist()
             }
         
-        # Calculate basic statistics
-        winning_trades = [t for t in self.trades if t['profit'] > 0]
-        losing_trades = [t for t in self.trades if t['profit'] <= 0]
-        
-        total_profit = sum(t['profit'] for t in winning_trades)
-        total_loss = abs(sum(t['profit'] for t in losing_trades))
-        
-        # Calculate drawdown
-        peak = self.initial_balance
-        max_drawdown = 0
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            drawdown = (peak - equity) / peak
-            max_drawdown = max(max_drawdown, drawdown)
-        
-        # Calculate Sharpe Ratio (assuming risk-free rate of 2%)
-        returns = pd.Series(self.equity_curve).pct_change().dropna()
-        sharpe_ratio = np.sqrt(252) * (returns.mean() - 0.02) / returns.std() if len(returns) > 0 else 0
-        
         return {
-            'total_trades': len(self.trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / len(self.trades) * 100,
-            'profit_factor': total_profit / total_loss if total_loss > 0 else float('inf'),
-            'max_drawdown': max_drawdown * 100,
-            'final_balance': self.equity_curve[-1],
-            'total_return': (self.equity_curve[-1] - self.initial_balance) / self.initial_balance * 100,
-            'sharpe_ratio': sharpe_ratio,
-            'trades': self.trades,
-            'equity_curve': self.equity_curve
+            **trade_metrics(self.trades.records['profit']),
+            'max_drawdown': max_drawdown(equity, self.initial_balance) * 100,
+            'final_balance': equity[-1],
+            'total_return': (equity[-1] - self.initial_balance) / self.initial_balance * 100,
+            # Assuming risk-free rate of 2%
+            'sharpe_ratio': sharpe_ratio(equity),
+            'trades': self.trades.to_list(),
+            'equity_curve': equity.tolist()
         }
     
     def plot_results(self, data: pd.DataFrame):
@@ -221,7 +238,10 @@ class Backtest:
         plt.tight_layout()
         plt.show()
         
-        # Print results
+        self._print_results(results)
+
+    def _print_results(self, results: Dict):
+        """Print the summary statistics of a results dict"""
         print("\nBacktest Results:")
         print(f"Total Trades: {results['total_trades']}")
         print(f"Winning Trades: {results['winning_trades']}")
@@ -0,0 +1,256 @@
+import heapq
+import itertools
+from typing import Dict, Iterator
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from backtesting.backtest import Backtest
+from backtesting.ledger import TradeLedger, EquityBuffer
+
+# Event kinds. At equal times a bar close is handled before the ticks that
+# already belong to the next bar.
+BAR_CLOSE = 0
+TICK = 1
+
+
+def bar_path_ticks(data: pd.DataFrame, bar_duration: pd.Timedelta) -> Iterator[tuple]:
+    """
+    Replay bars as four ticks each: open, the nearer extreme, the other
+    extreme and close, spread evenly over the bar.
+
+    A bullish bar is assumed to visit its low before its high and a bearish
+    bar its high before its low, the usual convention for OHLC replay.
+
+    Yields:
+        tuple: (time in ns, price)
+    """
+    step = pd.Timedelta(bar_duration).value // 4
+    times = _index_ns(data.index)
+    open_ = data['open'].to_numpy(dtype=float)
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    close = data['close'].to_numpy(dtype=float)
+    bullish = close >= open_
+
+    for i in range(len(times)):
+        first, second = (low[i], high[i]) if bullish[i] else (high[i], low[i])
+        yield times[i], open_[i]
+        yield times[i] + step, first
+        yield times[i] + 2 * step, second
+        yield times[i] + 3 * step, close[i]
+
+
+def read_tick_file(path: str, price_column: str = 'bid', time_column: str = 'time',
+                   chunksize: int = 1_000_000) -> Iterator[tuple]:
+    """
+    Stream ticks from a CSV file sorted by time, one chunk in memory at a time.
+
+    Yields:
+        tuple: (time in ns, price); naive times are taken as UTC
+    """
+    for chunk in pd.read_csv(path, usecols=[time_column, price_column], chunksize=chunksize):
+        times = _index_ns(pd.DatetimeIndex(pd.to_datetime(chunk[time_column])))
+        yield from zip(times.tolist(), chunk[price_column].to_numpy(dtype=float).tolist())
+
+
+def _index_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Bar times as int64 nanoseconds since the epoch, UTC"""
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+class EventBacktest(Backtest):
+    """
+    Event-driven backtest across several symbols that resolves stop losses
+    and take profits at the tick that hits them.
+
+    Every symbol contributes two time-ordered streams: its bar closes, which
+    drive the strategy, and its ticks, either replayed from the bars' high/low
+    path or read from a tick file. The streams are merged through a heap
+    holding one pending event per stream, so memory stays flat however many
+    ticks are replayed. Each symbol holds at most one position at a time, as
+    in Backtest.run, but positions on different symbols run concurrently
+    against one shared balance.
+    """
+
+    def __init__(self, strategies: Dict, initial_balance: float = 10000):
+        """
+        Args:
+            strategies (Dict): Strategy per symbol, each with
+                reset_incremental_state() and on_bar() like ICTCombinedStrategy
+            initial_balance (float): Starting balance shared by all symbols
+        """
+        super().__init__(None, initial_balance)
+        self.strategies = strategies
+
+    def run(self, data: Dict[str, pd.DataFrame], ticks: Dict[str, Iterator[tuple]] = None,
+            bar_duration=None) -> Dict:
+        """
+        Run the backtest.
+
+        Args:
+            data (Dict[str, pd.DataFrame]): OHLC bars per symbol, indexed by
+                bar open time
+            ticks (Dict[str, Iterator[tuple]]): Optional (time ns, price)
+                streams per symbol, e.g. from read_tick_file; symbols without
+                one are replayed from their bars with bar_path_ticks
+            bar_duration: Bar length, inferred from the bar spacing when None
+
+        Returns:
+            Dict: Backtest results; trades also carry their symbol and action
+        """
+        ticks = ticks or {}
+        self.balance = self.initial_balance
+        self.positions = []
+        self.trades = TradeLedger()
+        self.equity_curve = EquityBuffer()
+        self.equity_times = []
+        last_prices = {}
+
+        sequence = itertools.count()
+        queue = []
+
+        def push(stream, kind, symbol):
+            event = next(stream, None)
+            if event is not None:
+                heapq.heappush(queue, (event[0], kind, next(sequence), symbol, event, stream))
+
+        for symbol, bars in data.items():
+            duration = pd.Timedelta(bar_duration) if bar_duration is not None else _infer_duration(bars)
+            self.strategies[symbol].reset_incremental_state()
+            push(self._bar_closes(bars, duration), BAR_CLOSE, symbol)
+            push(iter(ticks[symbol]) if symbol in ticks else bar_path_ticks(bars, duration), TICK, symbol)
+
+        while queue:
+            time_ns, kind, _, symbol, event, stream = heapq.heappop(queue)
+            if kind == TICK:
+                last_prices[symbol] = event[1]
+                self._check_exits(symbol, time_ns, event[1])
+            else:
+                self._on_bar_close(symbol, time_ns, event, last_prices)
+            push(stream, kind, symbol)
+
+        return self._generate_results()
+
+    def plot_results(self, data: Dict[str, pd.DataFrame]):
+        """
+        Plot every symbol's closes with its trades, and the equity curve.
+
+        The equity curve has one point per distinct bar close time across
+        all symbols rather than one per bar of a single series, so it is
+        drawn against those close times.
+
+        Args:
+            data (Dict[str, pd.DataFrame]): The OHLC bars per symbol passed to run
+        """
+        results = self._generate_results()
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
+
+        for symbol, bars in data.items():
+            ax1.plot(bars.index, bars['close'], label=symbol)
+        for trade in results['trades']:
+            color = 'green' if trade['profit'] > 0 else 'red'
+            ax1.scatter(trade['entry_time'], trade['entry_price'], color=color, marker='^', s=100)
+            ax1.scatter(trade['exit_time'], trade['exit_price'], color=color, marker='v', s=100)
+        ax1.set_title('Prices with Trades')
+        ax1.legend()
+
+        like = next(iter(data.values())).index[0] if data else None
+        times = [_timestamp(time_ns, like) for time_ns in self.equity_times]
+        ax2.plot(times, results['equity_curve'], label='Equity', color='green')
+        ax2.set_title('Equity Curve at Bar Closes')
+        ax2.legend()
+
+        plt.tight_layout()
+        plt.show()
+
+        self._print_results(results)
+
+    def _bar_closes(self, bars: pd.DataFrame, duration: pd.Timedelta) -> Iterator[tuple]:
+        """Yield (close time ns, bar timestamp, open, high, low, close) per bar"""
+        close_times = _index_ns(bars.index) + duration.value
+        yield from zip(
+            close_times.tolist(),
+            bars.index,
+            bars['open'].to_numpy(dtype=float).tolist(),
+            bars['high'].to_numpy(dtype=float).tolist(),
+            bars['low'].to_numpy(dtype=float).tolist(),
+            bars['close'].to_numpy(dtype=float).tolist()
+        )
+
+    def _on_bar_close(self, symbol: str, time_ns: int, bar: tuple, last_prices: Dict):
+        """Feed a closed bar to the symbol's strategy and act on its signal"""
+        _, timestamp, open_price, high, low, close = bar
+        last_prices[symbol] = close
+        signal = self.strategies[symbol].on_bar(timestamp, open_price, high, low, close)
+
+        if signal and not any(p['symbol'] == symbol for p in self.positions):
+            size = self.strategies[symbol].calculate_position_size(
+                self.balance,
+                signal['stop_loss_dollars']
+            )
+            self.positions.append({
+                'symbol': symbol,
+                'entry_time': _timestamp(time_ns, timestamp),
+                'entry_price': close,
+                'stop_loss': signal['stop_loss'],
+                'take_profit': signal['take_profit'],
+                'size': size,
+                'action': signal['action']
+            })
+
+        equity = self.balance + sum(
+            ((last_prices[p['symbol']] - p['entry_price']) if p['action'] == 'buy'
+             else (p['entry_price'] - last_prices[p['symbol']])) * p['size']
+            for p in self.positions
+        )
+        # One equity point per bar close time, however many symbols close then
+        if self.equity_times and self.equity_times[-1] == time_ns:
+            self.equity_curve[-1] = equity
+        else:
+            self.equity_times.append(time_ns)
+            self.equity_curve.append(equity)
+
+    def _check_exits(self, symbol: str, time_ns: int, price: float):
+        """Close the symbol's positions whose stop loss or take profit price touched"""
+        for position in self.positions[:]:
+            if position['symbol'] != symbol:
+                continue
+            buy = position['action'] == 'buy'
+            if (price <= position['stop_loss']) if buy else (price >= position['stop_loss']):
+                self._close(position, time_ns, position['stop_loss'], 'sl')
+            elif (price >= position['take_profit']) if buy else (price <= position['take_profit']):
+                self._close(position, time_ns, position['take_profit'], 'tp')
+
+    def _close(self, position: Dict, time_ns: int, exit_price: float, exit_type: str):
+        """Book a closed position as a trade"""
+        direction = 1 if position['action'] == 'buy' else -1
+        profit = (exit_price - position['entry_price']) * direction * position['size']
+        self.balance += profit
+        self.trades.append(
+            entry_time=position['entry_time'],
+            exit_time=_timestamp(time_ns, position['entry_time']),
+            entry_price=position['entry_price'],
+            exit_price=exit_price,
+            profit=profit,
+            exit_type=exit_type,
+            action=position['action'],
+            symbol=position['symbol'],
+            size=position['size']
+        )
+        self.positions.remove(position)
+
+
+def _infer_duration(bars: pd.DataFrame) -> pd.Timedelta:
+    """Most common spacing between bars"""
+    if len(bars) < 2:
+        raise ValueError("Pass bar_duration for series shorter than two bars")
+    return pd.Series(bars.index).diff().mode().iloc[0]
+
+
+def _timestamp(time_ns: int, like) -> pd.Timestamp:
+    """Timestamp for time_ns in the timezone of like"""
+    time = pd.Timestamp(time_ns, tz='UTC')
+    tz = getattr(like, 'tzinfo', None)
+    return time.tz_convert(tz) if tz is not None else time.tz_localize(None)
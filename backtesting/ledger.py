@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+# One record per closed trade. Times are nanoseconds since the epoch (UTC for
+# tz-aware data); symbol and action are blank for single-symbol backtests.
+TRADE_DTYPE = np.dtype([
+    ('symbol', 'U16'),
+    ('action', 'U4'),
+    ('type', 'U2'),
+    ('entry_time', 'i8'),
+    ('exit_time', 'i8'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('size', 'f8'),
+    ('profit', 'f8')
+])
+
+_NAT = np.iinfo(np.int64).min
+
+
+class TradeLedger:
+    """
+    Closed trades in one growable structured array.
+
+    Iterating, or indexing with an int, gives the trade dicts Backtest used
+    to keep in a list, so existing report code keeps working; vectorized
+    code can use records or to_frame() instead.
+    """
+
+    def __init__(self, capacity: int = 256, tz=None):
+        """
+        Args:
+            capacity (int): Initial number of trades before the array grows
+            tz: Timezone of the trade times, taken from the first trade when None
+        """
+        self._records = np.zeros(capacity, dtype=TRADE_DTYPE)
+        self._size = 0
+        self.tz = tz
+
+    def append(self, entry_time, exit_time, entry_price: float, exit_price: float,
+               profit: float, exit_type: str, action: str = '', symbol: str = '',
+               size: float = np.nan):
+        """Record one closed trade"""
+        if self._size == len(self._records):
+            self._records = np.resize(self._records, max(2 * len(self._records), 1))
+        if self.tz is None and isinstance(entry_time, pd.Timestamp):
+            self.tz = entry_time.tz
+        self._records[self._size] = (symbol, action, exit_type, _to_ns(entry_time), _to_ns(exit_time),
+                                     entry_price, exit_price, size, profit)
+        self._size += 1
+
+    @property
+    def records(self) -> np.ndarray:
+        """The recorded trades as a TRADE_DTYPE array view"""
+        return self._records[:self._size]
+
+    def times(self, field: str) -> pd.DatetimeIndex:
+        """entry_time or exit_time of every trade as timestamps"""
+        index = pd.DatetimeIndex(self.records[field].astype('datetime64[ns]'))
+        return index.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else index
+
+    def to_frame(self) -> pd.DataFrame:
+        """Trades as a DataFrame with timestamp columns"""
+        df = pd.DataFrame(self.records)
+        df['entry_time'] = self.times('entry_time')
+        df['exit_time'] = self.times('exit_time')
+        return df
+
+    def to_list(self) -> list:
+        """Trades as the list of dicts Backtest results have always held"""
+        return list(self)
+
+    def daily_pnl(self, by: str = 'exit_time') -> pd.Series:
+        """Profit summed per date of entry_time or exit_time"""
+        profit = pd.Series(self.records['profit'], index=self.times(by))
+        return profit.groupby(profit.index.date).sum()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: int) -> dict:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("trade index out of range")
+        record = self._records[i]
+        trade = {
+            'entry_time': self._timestamp(record['entry_time']),
+            'exit_time': self._timestamp(record['exit_time']),
+            'entry_price': float(record['entry_price']),
+            'exit_price': float(record['exit_price']),
+            'profit': float(record['profit']),
+            'type': str(record['type'])
+        }
+        if record['symbol']:
+            trade['symbol'] = str(record['symbol'])
+        if record['action']:
+            trade['action'] = str(record['action'])
+        return trade
+
+    def __iter__(self):
+        return (self[i] for i in range(self._size))
+
+    def _timestamp(self, value: int):
+        if value == _NAT:
+            return None
+        time = pd.Timestamp(value)
+        return time.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else time
+
+
+class EquityBuffer:
+    """Equity per bar in a preallocated float64 array that grows when full"""
+
+    def __init__(self, capacity: int = 1024):
+        self._values = np.empty(max(capacity, 1))
+        self._size = 0
+
+    def append(self, value: float):
+        if self._size == len(self._values):
+            self._values = np.resize(self._values, 2 * len(self._values))
+        self._values[self._size] = value
+        self._size += 1
+
+    @property
+    def values(self) -> np.ndarray:
+        """The recorded equity as an array view"""
+        return self._values[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def __setitem__(self, i, value: float):
+        self.values[i] = value
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+def max_drawdown(equity: np.ndarray, initial_balance: float) -> float:
+    """Largest fall from a running peak, as a fraction of that peak"""
+    if len(equity) == 0:
+        return 0.0
+    peak = np.maximum.accumulate(np.maximum(equity, initial_balance))
+    return float(np.max((peak - equity) / peak))
+
+
+def sharpe_ratio(equity: np.ndarray, risk_free: float = 0.02, periods: int = 252) -> float:
+    """Sharpe ratio of the per-bar returns of an equity curve"""
+    returns = equity[1:] / equity[:-1] - 1
+    if len(returns) == 0:
+        return 0
+    if len(returns) == 1:
+        return np.nan
+    return np.sqrt(periods) * (returns.mean() - risk_free) / returns.std(ddof=1)
+
+
+def trade_metrics(profits: np.ndarray) -> dict:
+    """Win/loss counts, win rate and profit factor of closed trade profits"""
+    wins = profits > 0
+    total_profit = profits[wins].sum()
+    total_loss = abs(profits[~wins].sum())
+    return {
+        'total_trades': len(profits),
+        'winning_trades': int(wins.sum()),
+        'losing_trades': int((~wins).sum()),
+        'win_rate': wins.mean() * 100 if len(profits) else 0,
+        'profit_factor': total_profit / total_loss if total_loss > 0 else float('inf')
+    }
+
+
+def _to_ns(value) -> int:
+    """Nanoseconds since the epoch of a timestamp, NaT for None"""
+    if value is None:
+        return _NAT
+    return pd.Timestamp(value).value
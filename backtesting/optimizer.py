@@ -0,0 +1,278 @@
+import csv
+import itertools
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+from backtesting.backtest import Backtest
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+# Summary statistics each backtest reports back
+RESULT_COLUMNS = ['total_trades', 'winning_trades', 'losing_trades', 'win_rate', 'profit_factor',
+                  'max_drawdown', 'final_balance', 'total_return', 'sharpe_ratio']
+
+# Set in every worker process by _attach_worker
+_worker = {}
+
+
+def _attach_worker(shm_name: str, bars: int, tz, symbol: str, timeframe: str,
+                   initial_balance: float):
+    """Map the shared price block into this worker and wrap it in a DataFrame"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    prices = np.ndarray((bars, len(PRICE_COLUMNS)), dtype=np.float64, buffer=shm.buf)
+    times = np.ndarray(bars, dtype=np.int64, buffer=shm.buf,
+                       offset=prices.nbytes).view('datetime64[ns]')
+    index = pd.DatetimeIndex(times)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+
+    _worker.update({
+        'shm': shm,  # Keeps the mapping alive for the life of the worker
+        'data': pd.DataFrame(prices, index=index, columns=PRICE_COLUMNS, copy=False),
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'initial_balance': initial_balance
+    })
+
+
+def _run_config(params: Dict, start: int, stop: int) -> Dict:
+    """Backtest one parameter set on bars [start, stop) of the shared data"""
+    strategy = ICTCombinedStrategy(_worker['symbol'], _worker['timeframe'])
+    for name, value in params.items():
+        if not hasattr(strategy, name):
+            raise ValueError(f"Unknown strategy parameter: {name}")
+        setattr(strategy, name, value)
+
+    backtest = Backtest(strategy, initial_balance=_worker['initial_balance'])
+    results = backtest.run(_worker['data'].iloc[start:stop], mode='vectorized')
+    # Only the summary statistics travel back to the parent
+    results.pop('trades')
+    results.pop('equity_curve')
+    return results
+
+
+class Optimizer:
+    """
+    Parameter search for ICTCombinedStrategy over all CPU cores.
+
+    The OHLC data is copied once into a shared memory block that every worker
+    maps on start-up, so each job only ships its parameters and bar range.
+    Results are appended to results_path as each backtest finishes, so a long
+    search can be followed, or salvaged, while it runs.
+    """
+
+    def __init__(self, data: pd.DataFrame, symbol: str, timeframe: str,
+                 initial_balance: float = 10000, results_path: str = None,
+                 max_workers: int = None, objective: str = 'total_return',
+                 maximize: bool = True):
+        """
+        Args:
+            data (pd.DataFrame): OHLC data with a DatetimeIndex
+            symbol (str): Symbol passed to the strategy
+            timeframe (str): Timeframe passed to the strategy
+            initial_balance (float): Starting balance of every backtest
+            results_path (str): CSV file results are appended to, if any. Its
+                header holds the searched parameters, so appending a search
+                over other parameters raises ValueError; use one file each.
+            max_workers (int): Worker processes, defaults to the CPU count
+            objective (str): Backtest result used to rank parameter sets
+            maximize (bool): Rank higher objective values first
+        """
+        self.index = data.index
+        self.results_path = results_path
+        self.objective = objective
+        self.maximize = maximize
+
+        prices = data[PRICE_COLUMNS].to_numpy(dtype=np.float64)
+        index = data.index
+        tz = index.tz
+        if tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        times = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes + times.nbytes, 1))
+        np.ndarray(prices.shape, dtype=np.float64, buffer=self._shm.buf)[:] = prices
+        np.ndarray(times.shape, dtype=np.int64, buffer=self._shm.buf, offset=prices.nbytes)[:] = times
+
+        self.pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_worker,
+            initargs=(self._shm.name, len(data), tz, symbol, timeframe, initial_balance)
+        )
+
+    def grid_search(self, param_grid: Dict[str, List]) -> pd.DataFrame:
+        """
+        Backtest every combination of the given parameter values
+
+        Args:
+            param_grid (Dict[str, List]): Candidate values per strategy attribute,
+                e.g. {'min_risk_reward': [1.5, 2.0], 'max_daily_trades': [4, 8]}
+
+        Returns:
+            pd.DataFrame: One row per parameter set, best objective first
+        """
+        return self._search(self._grid(param_grid), 0, len(self.index))
+
+    def random_search(self, param_space: Dict, n_iter: int, seed: int = None) -> pd.DataFrame:
+        """
+        Backtest n_iter parameter sets drawn at random
+
+        Args:
+            param_space (Dict): Per strategy attribute a list of choices or a
+                (low, high) tuple; int bounds draw ints, float bounds floats
+            n_iter (int): Number of parameter sets
+            seed (int): Seed for reproducible draws
+
+        Returns:
+            pd.DataFrame: One row per parameter set, best objective first
+        """
+        rng = random.Random(seed)
+        configs = []
+        for _ in range(n_iter):
+            params = {}
+            for name, space in param_space.items():
+                if isinstance(space, tuple):
+                    low, high = space
+                    if isinstance(low, int) and isinstance(high, int):
+                        params[name] = rng.randint(low, high)
+                    else:
+                        params[name] = rng.uniform(low, high)
+                else:
+                    params[name] = rng.choice(space)
+            configs.append(params)
+        return self._search(configs, 0, len(self.index))
+
+    def walk_forward(self, param_grid: Dict[str, List], train_bars: int,
+                     test_bars: int) -> pd.DataFrame:
+        """
+        Walk-forward optimisation: grid search each training window and
+        backtest its best parameters on the bars that follow it.
+
+        Windows advance by test_bars, so the test periods tile the data.
+
+        Args:
+            param_grid (Dict[str, List]): Candidate values per strategy attribute
+            train_bars (int): Bars in each training window
+            test_bars (int): Bars in each out-of-sample window
+
+        Returns:
+            pd.DataFrame: One out-of-sample row per fold with the chosen
+                parameters. Folds whose training runs all failed are skipped.
+        """
+        configs = self._grid(param_grid)
+        folds = []
+        for start in range(0, len(self.index) - train_bars - test_bars + 1, test_bars):
+            folds.append((start, start + train_bars, start + train_bars + test_bars))
+        if not folds:
+            raise ValueError("Not enough data for one training and test window")
+
+        # Every training run of every fold goes into the pool together
+        jobs = [(params, start, split, {'phase': 'train', 'fold': fold})
+                for fold, (start, split, _) in enumerate(folds)
+                for params in configs]
+        train = self._run_jobs(jobs)
+
+        jobs = []
+        for fold, (_, split, stop) in enumerate(folds):
+            fold_results = train[train['fold'] == fold]
+            if fold_results.empty:
+                logging.error(f"Skipping fold {fold}: no training backtest succeeded")
+                continue
+            best = self._rank(fold_results).iloc[0]
+            params = {name: best[name] for name in param_grid}
+            jobs.append((params, split, stop, {'phase': 'test', 'fold': fold}))
+        return self._run_jobs(jobs).sort_values('fold').reset_index(drop=True)
+
+    def _grid(self, param_grid: Dict[str, List]) -> List[Dict]:
+        """Expand a parameter grid into a list of parameter sets"""
+        names = list(param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+    def _search(self, configs: List[Dict], start: int, stop: int) -> pd.DataFrame:
+        """Backtest each parameter set on one bar range and rank the results"""
+        return self._rank(self._run_jobs([(params, start, stop, {'phase': 'search', 'fold': None})
+                                          for params in configs]))
+
+    def _rank(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Sort results by the objective, best first"""
+        return results.sort_values(self.objective, ascending=not self.maximize).reset_index(drop=True)
+
+    def _run_jobs(self, jobs: List[tuple]) -> pd.DataFrame:
+        """Run (params, start, stop, labels) jobs in the pool and record each result"""
+        param_names = list(dict.fromkeys(name for params, _, _, _ in jobs for name in params))
+        columns = ['phase', 'fold', 'start', 'end'] + param_names
+        self._open_results(columns)
+        futures = {self.pool.submit(_run_config, params, start, stop): (params, start, stop, labels)
+                   for params, start, stop, labels in jobs}
+        rows = []
+        for future in as_completed(futures):
+            params, start, stop, labels = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                logging.error(f"Error backtesting {params}: {str(e)}")
+                continue
+            row = {
+                **labels,
+                'start': self.index[start],
+                'end': self.index[stop - 1],
+                **params,
+                **results
+            }
+            self._record(row)
+            rows.append(row)
+        if not rows:
+            # Keep the columns so ranking and filtering still work
+            return pd.DataFrame(columns=columns + RESULT_COLUMNS)
+        return pd.DataFrame(rows)
+
+    def _open_results(self, columns: List[str]):
+        """
+        Fix the results file columns for one search: columns, then the
+        backtest statistics
+
+        Raises:
+            ValueError: If the file already holds results of other parameters
+        """
+        self._fieldnames = None
+        if not self.results_path:
+            return
+        if os.path.exists(self.results_path) and os.path.getsize(self.results_path) > 0:
+            with open(self.results_path, newline='') as f:
+                header = next(csv.reader(f), [])
+            if set(header[:len(columns)]) != set(columns):
+                raise ValueError(f"{self.results_path} holds results for columns {header}, "
+                                 f"not {columns}; use one results file per set of parameters")
+            self._fieldnames = header
+        self._columns = columns
+
+    def _record(self, row: Dict):
+        """Append one result row to the results file"""
+        if not self.results_path:
+            return
+        new_file = self._fieldnames is None
+        if new_file:
+            # Searched columns first, then every statistic the backtest returns
+            self._fieldnames = self._columns + [name for name in row if name not in self._columns]
+        with open(self.results_path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self._fieldnames)
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def close(self):
+        """Stop the workers and release the shared price block"""
+        self.pool.shutdown()
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
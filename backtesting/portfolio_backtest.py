@@ -0,0 +1,143 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+from strategies.base_strategy import BaseStrategy
+from backtesting.backtest import Backtest
+from backtesting.ledger import TradeLedger, EquityBuffer
+
+
+class PortfolioBacktest(Backtest):
+    """
+    Backtest many symbols, each with its own strategy, in one pass over the
+    union of their bar times against one shared account.
+
+    Open positions live in per-symbol arrays, so exits, margin and equity are
+    computed for all symbols at once on every bar. As in Backtest.run each
+    symbol holds at most one position, entered at the close of the signal
+    bar and exited at the first close beyond its stop loss or take profit.
+    """
+
+    def __init__(self, strategies: Dict[str, BaseStrategy], initial_balance: float = 10000,
+                 leverage: float = 100, contract_sizes: Dict[str, float] = None,
+                 max_open_positions: int = None):
+        """
+        Args:
+            strategies (Dict[str, BaseStrategy]): Strategy per symbol
+            initial_balance (float): Starting balance shared by all symbols
+            leverage (float): Account leverage used for the margin check
+            contract_sizes (Dict[str, float]): Units per position size unit,
+                1 for symbols not listed
+            max_open_positions (int): Positions open at once across all
+                symbols, unlimited when None
+        """
+        super().__init__(None, initial_balance)
+        self.strategies = strategies
+        self.symbols = list(strategies)
+        self.leverage = leverage
+        contract_sizes = contract_sizes or {}
+        self.contract_sizes = np.array([contract_sizes.get(s, 1.0) for s in self.symbols])
+        self.max_open_positions = max_open_positions or len(self.symbols)
+
+    def run(self, data: Dict[str, pd.DataFrame]) -> Dict:
+        """
+        Run the backtest.
+
+        Args:
+            data (Dict[str, pd.DataFrame]): OHLC bars per symbol
+
+        Returns:
+            Dict: Backtest results on the merged time index; trades also
+                carry their symbol and action
+        """
+        index = pd.DatetimeIndex(sorted(set().union(*(data[s].index for s in self.symbols))))
+        # Closes carried forward over the merged index; NaN before a symbol's first bar
+        closes = np.column_stack([
+            data[s]['close'].reindex(index).ffill().to_numpy(dtype=float) for s in self.symbols
+        ])
+        signals = np.column_stack([
+            self._signals(self.strategies[s], data[s]).reindex(index).to_numpy(dtype=object)
+            for s in self.symbols
+        ])
+
+        count = len(self.symbols)
+        direction = np.zeros(count)  # 1 long, -1 short, 0 flat
+        size = np.zeros(count)
+        entry_price = np.zeros(count)
+        stop_loss = np.zeros(count)
+        take_profit = np.zeros(count)
+        entry_time = np.empty(count, dtype=object)
+
+        self.balance = self.initial_balance
+        self.trades = TradeLedger(tz=index.tz)
+        self.equity_curve = EquityBuffer(capacity=len(index))
+        self.margin_curve = []
+
+        for t, time in enumerate(index):
+            price = closes[t]
+
+            # Exits: take profit first, as in Backtest._update_positions, so a
+            # close beyond both levels (a stop on the wrong side) exits the same way
+            long, short = direction > 0, direction < 0
+            hit_tp = (long & (price >= take_profit)) | (short & (price <= take_profit))
+            hit_sl = ~hit_tp & ((long & (price <= stop_loss)) | (short & (price >= stop_loss)))
+            for i in np.flatnonzero(hit_sl | hit_tp):
+                exit_price = stop_loss[i] if hit_sl[i] else take_profit[i]
+                profit = (exit_price - entry_price[i]) * direction[i] * size[i] * self.contract_sizes[i]
+                self.balance += profit
+                self.trades.append(
+                    entry_time=entry_time[i],
+                    exit_time=time,
+                    entry_price=entry_price[i],
+                    exit_price=exit_price,
+                    profit=profit,
+                    exit_type='sl' if hit_sl[i] else 'tp',
+                    action='buy' if direction[i] > 0 else 'sell',
+                    symbol=self.symbols[i],
+                    size=size[i]
+                )
+                direction[i] = 0
+
+            # Entries, in symbol order, while positions and margin allow
+            for i in np.flatnonzero(direction == 0):
+                signal = signals[t, i]
+                if not isinstance(signal, dict) or signal.get('action') not in ('buy', 'sell'):
+                    continue
+                if np.count_nonzero(direction) >= self.max_open_positions:
+                    break
+                stop_distance = signal.get('stop_loss_dollars', abs(price[i] - signal['stop_loss']))
+                position_size = self.strategies[self.symbols[i]].calculate_position_size(
+                    self.balance, stop_distance
+                )
+                if not position_size:
+                    continue
+                margin = np.nansum(np.abs(direction) * size * price * self.contract_sizes) / self.leverage
+                required = position_size * price[i] * self.contract_sizes[i] / self.leverage
+                if margin + required > self._equity(price, direction, size, entry_price):
+                    continue
+                direction[i] = 1 if signal['action'] == 'buy' else -1
+                size[i] = position_size
+                entry_price[i] = price[i]
+                stop_loss[i] = signal['stop_loss']
+                take_profit[i] = signal['take_profit']
+                entry_time[i] = time
+
+            self.equity_curve.append(self._equity(price, direction, size, entry_price))
+            self.margin_curve.append(
+                np.nansum(np.abs(direction) * size * price * self.contract_sizes) / self.leverage
+            )
+
+        self.index = index
+        return self._generate_results()
+
+    def _equity(self, price: np.ndarray, direction: np.ndarray, size: np.ndarray,
+                entry_price: np.ndarray) -> float:
+        """Balance plus the open profit of every position"""
+        open_profit = direction * (price - entry_price) * size * self.contract_sizes
+        return self.balance + np.nansum(open_profit)
+
+    def _signals(self, strategy: BaseStrategy, data: pd.DataFrame) -> pd.Series:
+        """Signal (or None) per bar, vectorized when the strategy supports it"""
+        if hasattr(strategy, 'analyze_batch'):
+            return strategy.analyze_batch(data)
+        signals = [strategy.analyze(data.iloc[:i + 1]) for i in range(len(data))]
+        return pd.Series(signals, index=data.index, dtype=object)
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+import math
+
+
+class Indicator(ABC):
+    """
+    Stateful indicator that costs O(1) per update.
+
+    Seed it with history once, then feed it one bar at a time. value is NaN
+    until enough bars have been seen.
+    """
+
+    def __init__(self):
+        self.value = math.nan
+
+    @abstractmethod
+    def update(self, *bar) -> float:
+        """Add one bar and return the new indicator value"""
+        pass
+
+    @property
+    def ready(self) -> bool:
+        """True once the indicator has a value"""
+        return not math.isnan(self.value)
+
+    def seed(self, *columns):
+        """
+        Feed historical bars, oldest first.
+
+        Args:
+            *columns: One sequence per update() argument, e.g. seed(closes) or
+                seed(highs, lows, closes)
+
+        Returns:
+            Indicator: self, so seeding can be chained onto the constructor
+        """
+        for bar in zip(*columns):
+            self.update(*bar)
+        return self
@@ -0,0 +1,63 @@
+import math
+from abc import abstractmethod
+from collections import deque
+from .base import Indicator
+
+
+class _RollingExtreme(Indicator):
+    """Rolling max or min over a monotonic deque, amortized O(1) per bar"""
+
+    def __init__(self, window: int, min_periods: int = None):
+        """
+        Args:
+            window (int): Number of bars in the window
+            min_periods (int): Observations needed for a value, defaults to window
+        """
+        super().__init__()
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.nobs = 0
+        self._count = 0
+        # (bar number, value), values kept monotonic from the front
+        self._candidates = deque()
+        self._observed = deque()
+
+    @abstractmethod
+    def _dominates(self, new: float, old: float) -> bool:
+        """True when new makes old useless as a future extreme"""
+        pass
+
+    def update(self, x: float) -> float:
+        observed = x == x
+        self._observed.append(observed)
+        self.nobs += observed
+        if len(self._observed) > self.window:
+            self.nobs -= self._observed.popleft()
+
+        if observed:
+            while self._candidates and self._dominates(x, self._candidates[-1][1]):
+                self._candidates.pop()
+            self._candidates.append((self._count, x))
+        while self._candidates and self._candidates[0][0] <= self._count - self.window:
+            self._candidates.popleft()
+        self._count += 1
+
+        if self.nobs >= max(self.min_periods, 1) and self._candidates:
+            self.value = self._candidates[0][1]
+        else:
+            self.value = math.nan
+        return self.value
+
+
+class RollingMax(_RollingExtreme):
+    """Highest value of the last window bars, equal to rolling(window).max()"""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+
+class RollingMin(_RollingExtreme):
+    """Lowest value of the last window bars, equal to rolling(window).min()"""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
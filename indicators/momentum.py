@@ -0,0 +1,30 @@
+import math
+from .base import Indicator
+from .trend import EMA
+
+
+class RSI(Indicator):
+    """
+    Relative Strength Index with Wilder smoothing, equal to
+    ta.momentum.RSIIndicator(close, window).rsi()
+    """
+
+    def __init__(self, window: int = 14):
+        super().__init__()
+        self.window = window
+        self._prev_close = math.nan
+        self._avg_gain = EMA(alpha=1.0 / window, min_periods=window)
+        self._avg_loss = EMA(alpha=1.0 / window, min_periods=window)
+
+    def update(self, close: float) -> float:
+        # The first bar has no change and counts as a zero move, as in ta
+        diff = close - self._prev_close
+        self._prev_close = close
+        avg_gain = self._avg_gain.update(diff if diff > 0 else 0.0)
+        avg_loss = self._avg_loss.update(-diff if diff < 0 else 0.0)
+
+        if avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - (100 / (1 + avg_gain / avg_loss))
+        return self.value
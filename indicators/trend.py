@@ -0,0 +1,117 @@
+import math
+from collections import deque
+from .base import Indicator
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average, equal to pandas' ewm(adjust=False).mean().
+
+    Like pandas (ignore_na=False), a missing value still decays the weight of
+    the running average, so the next observation counts for more.
+    """
+
+    def __init__(self, span: float = None, alpha: float = None, min_periods: int = 0):
+        """
+        Args:
+            span (float): Decay as a span, like ewm(span=...)
+            alpha (float): Smoothing factor, like ewm(alpha=...), used instead of span
+            min_periods (int): Observations needed before a value is reported
+        """
+        super().__init__()
+        if alpha is None:
+            if span is None:
+                raise ValueError("EMA needs a span or an alpha")
+            # Same derivation as pandas, which goes through the center of mass
+            alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        self.alpha = alpha
+        self.min_periods = max(min_periods, 1)
+        self.nobs = 0
+        self._weighted = math.nan
+        self._old_weight = 1.0
+
+    def update(self, x: float) -> float:
+        observed = x == x
+        self.nobs += observed
+        if self._weighted == self._weighted:
+            # Every bar decays the average, NaN or not
+            self._old_weight *= 1.0 - self.alpha
+            if observed:
+                if self._weighted != x:
+                    self._weighted = ((self._old_weight * self._weighted + self.alpha * x)
+                                      / (self._old_weight + self.alpha))
+                self._old_weight = 1.0
+        elif observed:
+            self._weighted = x
+        self.value = self._weighted if self.nobs >= self.min_periods else math.nan
+        return self.value
+
+
+class SMA(Indicator):
+    """
+    Simple moving average, equal to pandas' rolling(window).mean().
+
+    Keeps a compensated running sum the way pandas does, so long streams don't
+    drift from the batch result.
+    """
+
+    def __init__(self, window: int, min_periods: int = None):
+        """
+        Args:
+            window (int): Number of bars averaged
+            min_periods (int): Observations needed for a value, defaults to window
+        """
+        super().__init__()
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.nobs = 0
+        self._values = deque()
+        self._sum = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._negatives = 0
+        self._same_run = 0
+        self._prev = math.nan
+
+    def update(self, x: float) -> float:
+        self._values.append(x)
+        if len(self._values) > self.window:
+            self._remove(self._values.popleft())
+        self._add(x)
+
+        if self.nobs >= self.min_periods and self.nobs > 0:
+            mean = self._sum / self.nobs
+            if self._same_run >= self.nobs:
+                mean = self._prev
+            elif self._negatives == 0 and mean < 0:
+                mean = 0.0
+            elif self._negatives == self.nobs and mean > 0:
+                mean = 0.0
+            self.value = mean
+        else:
+            self.value = math.nan
+        return self.value
+
+    def _add(self, x: float):
+        if x != x:
+            return
+        self.nobs += 1
+        y = x - self._add_compensation
+        t = self._sum + y
+        self._add_compensation = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._negatives += 1
+        self._same_run = self._same_run + 1 if x == self._prev else 1
+        self._prev = x
+
+    def _remove(self, x: float):
+        if x != x:
+            return
+        self.nobs -= 1
+        y = -x - self._remove_compensation
+        t = self._sum + y
+        self._remove_compensation = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._negatives -= 1
@@ -0,0 +1,81 @@
+import math
+from collections import deque
+from .base import Indicator
+from .trend import SMA
+
+
+class ATR(Indicator):
+    """
+    Average True Range as the strategies compute it: a simple rolling mean of
+    the true range, not Wilder's smoothing
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._prev_close = math.nan
+        self._mean = SMA(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._prev_close != self._prev_close:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = self._mean.update(true_range)
+        return self.value
+
+
+class ReturnVolatility(Indicator):
+    """
+    Annualized standard deviation of close-to-close returns.
+
+    With window=None it covers every return seen so far, like
+    close.pct_change().std() over the whole history; otherwise the last
+    window returns, like pct_change().rolling(window).std().
+    """
+
+    def __init__(self, window: int = None, periods_per_year: int = 252, ddof: int = 1):
+        super().__init__()
+        self.window = window
+        self.ddof = ddof
+        self.scale = math.sqrt(periods_per_year)
+        self.nobs = 0
+        self._prev_close = math.nan
+        self._returns = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, close: float) -> float:
+        ret = close / self._prev_close - 1
+        self._prev_close = close
+        if ret == ret:
+            self._add(ret)
+            if self.window is not None:
+                self._returns.append(ret)
+                if len(self._returns) > self.window:
+                    self._remove(self._returns.popleft())
+
+        min_periods = self.window if self.window is not None else 1
+        if self.nobs > self.ddof and self.nobs >= min_periods:
+            self.value = math.sqrt(max(self._m2, 0.0) / (self.nobs - self.ddof)) * self.scale
+        else:
+            self.value = math.nan
+        return self.value
+
+    def _add(self, x: float):
+        # Welford's update
+        self.nobs += 1
+        delta = x - self._mean
+        self._mean += delta / self.nobs
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x: float):
+        self.nobs -= 1
+        if self.nobs == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self.nobs
+        self._m2 -= delta * (x - self._mean)
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from .sources import DataSource
+from .store import to_records, to_frame, BAR_DTYPE
+
+
+class ChunkedFetcher:
+    """
+    Download a long date range as windows fetched concurrently.
+
+    Each window is saved to a checkpoint directory as soon as it arrives, so
+    an interrupted download resumes with only the missing windows. The
+    windows are concatenated once at the end and duplicate bars removed.
+    """
+
+    def __init__(self, source: DataSource, max_workers: int = 4, window=None,
+                 checkpoint_dir: str = None):
+        """
+        Args:
+            source (DataSource): Where the bars come from
+            max_workers (int): Windows fetched at the same time
+            window: Length of each window, defaults to source.max_window
+            checkpoint_dir (str): Directory for finished windows, None to
+                keep them in memory only
+        """
+        self.source = source
+        self.max_workers = max_workers
+        self.window = pd.Timedelta(window) if window is not None else source.max_window
+        self.checkpoint_dir = checkpoint_dir
+
+    def windows(self, start, end) -> list:
+        """Split [start, end) into (window start, window end) pairs"""
+        bounds = list(pd.date_range(start, end, freq=self.window))
+        if not bounds or bounds[-1] < pd.Timestamp(end):
+            bounds.append(pd.Timestamp(end))
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def fetch(self, symbol: str, timeframe: str, start, end, tz: str = None) -> pd.DataFrame:
+        """
+        Fetch all bars with start <= time < end.
+
+        Args:
+            symbol (str): Trading symbol
+            timeframe (str): Timeframe, e.g. '1m'
+            start: Range start
+            end: Range end
+            tz (str): Timezone of the returned index, defaults to that of
+                start, or naive UTC when start is naive
+
+        Returns:
+            pd.DataFrame: open, high, low, close and volume sorted by time
+
+        Raises:
+            RuntimeError: If any window failed; the finished ones stay
+                checkpointed, so calling again fetches only the rest
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if tz is None and start.tzinfo is not None:
+            tz = str(start.tzinfo)
+
+        checkpoint = self._checkpoint_path(symbol, timeframe, start, end)
+        chunks = self._load_checkpoint(checkpoint)
+        pending = [w for w in self.windows(start, end) if _window_key(w) not in chunks]
+        if chunks:
+            logging.info(f"Resuming {symbol} {timeframe} download, "
+                         f"{len(chunks)} windows done, {len(pending)} to go")
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch') as pool:
+            futures = {pool.submit(self.source.fetch, symbol, timeframe, *w): w for w in pending}
+            for future in as_completed(futures):
+                window = futures[future]
+                try:
+                    bars = to_records(future.result())
+                except Exception as e:
+                    logging.error(f"Error fetching {symbol} {window[0]} - {window[1]}: {str(e)}")
+                    failed += 1
+                    continue
+                chunks[_window_key(window)] = bars
+                self._save_window(checkpoint, window, bars)
+
+        if failed:
+            raise RuntimeError(f"{failed} of {len(pending)} windows of {symbol} {timeframe} failed")
+        if checkpoint:
+            # Complete, so the next call starts from scratch
+            shutil.rmtree(checkpoint, ignore_errors=True)
+        return to_frame(merge_bars(list(chunks.values())), tz)
+
+    def _checkpoint_path(self, symbol: str, timeframe: str, start, end) -> str:
+        if not self.checkpoint_dir:
+            return None
+        name = f"{symbol}_{timeframe}_{_stamp(start)}_{_stamp(end)}".replace('/', '_')
+        return os.path.join(self.checkpoint_dir, name)
+
+    def _load_checkpoint(self, checkpoint: str) -> dict:
+        """Return the finished windows saved under checkpoint, by window key"""
+        manifest = os.path.join(checkpoint, 'manifest.json') if checkpoint else None
+        if not manifest or not os.path.exists(manifest):
+            return {}
+        with open(manifest) as f:
+            done = json.load(f)
+        return {key: np.load(os.path.join(checkpoint, f"{key}.npy")) for key in done}
+
+    def _save_window(self, checkpoint: str, window: tuple, bars: np.ndarray):
+        """Save one finished window and record it in the manifest"""
+        if not checkpoint:
+            return
+        os.makedirs(checkpoint, exist_ok=True)
+        key = _window_key(window)
+        np.save(os.path.join(checkpoint, f"{key}.npy"), bars)
+
+        # Windows finish on several threads but only this one writes the manifest
+        manifest = os.path.join(checkpoint, 'manifest.json')
+        done = []
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                done = json.load(f)
+        with open(manifest + '.tmp', 'w') as f:
+            json.dump(done + [key], f)
+        os.replace(manifest + '.tmp', manifest)
+
+
+def merge_bars(chunks: list) -> np.ndarray:
+    """
+    Combine BAR_DTYPE chunks into one time-sorted array without duplicates.
+
+    Chunks are already sorted, so a stable merge sort only has to interleave
+    the runs; of bars sharing a time the one from the earliest chunk is kept.
+    """
+    chunks = [c for c in chunks if len(c)]
+    if not chunks:
+        return np.empty(0, dtype=BAR_DTYPE)
+    bars = np.concatenate(chunks)
+    bars = bars[np.argsort(bars['time'], kind='stable')]
+    keep = np.ones(len(bars), dtype=bool)
+    keep[1:] = bars['time'][1:] != bars['time'][:-1]
+    return bars[keep]
+
+
+def _stamp(value) -> str:
+    return pd.Timestamp(value).strftime('%Y%m%dT%H%M%S')
+
+
+def _window_key(window: tuple) -> str:
+    return f"{_stamp(window[0])}_{_stamp(window[1])}"
@@ -0,0 +1,106 @@
+import threading
+from abc import ABC, abstractmethod
+import pandas as pd
+
+
+class DataSource(ABC):
+    """
+    Where historical bars come from.
+
+    fetch() returns bars with start <= time < end as an OHLC DataFrame with
+    lower-case open, high, low, close and volume columns and a DatetimeIndex,
+    or an empty DataFrame when there are none. Implementations must be safe to
+    call from several threads at once.
+    """
+
+    # Longest window a single fetch() call should be asked for
+    max_window = pd.Timedelta(days=7)
+
+    @abstractmethod
+    def fetch(self, symbol: str, timeframe: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Fetch the bars of one window"""
+        pass
+
+
+class YahooSource(DataSource):
+    """Bars from Yahoo Finance, which serves 1m data in windows of up to 7 days"""
+
+    max_window = pd.Timedelta(days=7)
+
+    def __init__(self):
+        import yfinance as yf
+        self.yf = yf
+
+    def fetch(self, symbol: str, timeframe: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        data = self.yf.Ticker(symbol).history(start=start, end=end, interval=timeframe)
+        return data.rename(columns={
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Volume': 'volume'
+        })
+
+
+class MT5Source(DataSource):
+    """Bars from the MetaTrader 5 terminal via copy_rates_range"""
+
+    max_window = pd.Timedelta(days=30)
+
+    def __init__(self):
+        import MetaTrader5 as mt5
+        from trading.mt5_connector import TIMEFRAMES
+        self.mt5 = mt5
+        self.timeframes = TIMEFRAMES
+
+    def fetch(self, symbol: str, timeframe: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        # MT5 takes naive UTC datetimes and includes bars at the end time
+        start = _naive_utc(start).to_pydatetime()
+        end = (_naive_utc(end) - pd.Timedelta(seconds=1)).to_pydatetime()
+        rates = self.mt5.copy_rates_range(symbol, self.timeframes[timeframe], start, end)
+        if rates is None:
+            raise RuntimeError(f"copy_rates_range failed: {self.mt5.last_error()}")
+
+        df = pd.DataFrame(rates)
+        if df.empty:
+            return pd.DataFrame()
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        df.set_index('time', inplace=True)
+        return df.rename(columns={'tick_volume': 'volume'})
+
+
+class CSVSource(DataSource):
+    """
+    Bars from local CSV files, root/<symbol>_<timeframe>.csv with a time
+    column and OHLC columns. Useful offline and as a stand-in in tests.
+    """
+
+    max_window = pd.Timedelta(days=7)
+
+    def __init__(self, root: str = '.'):
+        self.root = root
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _frame(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self._frames:
+                df = pd.read_csv(f"{self.root}/{symbol}_{timeframe}.csv", index_col='time', parse_dates=True)
+                df.columns = [column.lower() for column in df.columns]
+                self._frames[key] = df.sort_index()
+            return self._frames[key]
+
+    def fetch(self, symbol: str, timeframe: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        df = self._frame(symbol, timeframe)
+        if df.index.tz is None:
+            start, end = _naive_utc(start), _naive_utc(end)
+        lo = df.index.searchsorted(start, side='left')
+        hi = df.index.searchsorted(end, side='left')
+        return df.iloc[lo:hi]
+
+
+def _naive_utc(value) -> pd.Timestamp:
+    """Timestamp as naive UTC, naive input taken as UTC already"""
+    value = pd.Timestamp(value)
+    return value.tz_convert('UTC').tz_localize(None) if value.tzinfo else value
@@ -0,0 +1,277 @@
+import os
+import threading
+from datetime import date
+import numpy as np
+import pandas as pd
+
+# One record per bar. 'time' is the bar open time in nanoseconds since the
+# epoch, UTC.
+BAR_DTYPE = np.dtype([
+    ('time', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8')
+])
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Time ranges, in nanoseconds since the epoch, that have been downloaded:
+# start included, end excluded
+RANGE_DTYPE = np.dtype([('start', 'i8'), ('end', 'i8')])
+
+COVERAGE_FILE = 'coverage.npy'
+
+
+class OHLCStore:
+    """
+    Local OHLC history partitioned by symbol, timeframe and UTC day.
+
+    Each day is one .npy file of BAR_DTYPE records sorted by time, laid out as
+    root/symbol/timeframe/YYYY-MM-DD.npy. Reads memory-map only the day files a
+    range touches, so loading history needs no network and no parsing.
+
+    Next to the day files, coverage.npy records the time ranges downloaded so
+    far, so missing() can tell a gap never fetched from a weekend or holiday
+    that simply has no bars.
+    """
+
+    def __init__(self, root: str = 'market_data_store'):
+        """
+        Args:
+            root (str): Directory holding the store
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol: str, timeframe: str) -> str:
+        # Keep symbols like EUR/USD to one directory level
+        return os.path.join(self.root, symbol.replace('/', '_'), timeframe)
+
+    def _path(self, symbol: str, timeframe: str, day: date) -> str:
+        return os.path.join(self._dir(symbol, timeframe), f"{day.isoformat()}.npy")
+
+    def days(self, symbol: str, timeframe: str) -> list:
+        """Return the stored UTC days of a symbol and timeframe, oldest first"""
+        directory = self._dir(symbol, timeframe)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(date.fromisoformat(name[:-4]) for name in os.listdir(directory)
+                      if name.endswith('.npy') and name != COVERAGE_FILE)
+
+    def _load(self, symbol: str, timeframe: str, day: date) -> np.ndarray:
+        path = self._path(symbol, timeframe, day)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.load(path, mmap_mode='r')
+
+    def append(self, symbol: str, timeframe: str, data: pd.DataFrame) -> int:
+        """
+        Add bars to the store.
+
+        Only the day files the bars fall on are rewritten. A bar whose time is
+        already stored replaces the stored one, so re-saving the forming bar
+        or an overlapping download is safe.
+
+        Args:
+            symbol (str): Trading symbol
+            timeframe (str): Timeframe, e.g. '1m'
+            data (pd.DataFrame): OHLC data with a DatetimeIndex; naive times
+                are taken as UTC and a missing volume column as zero
+
+        Returns:
+            int: Number of bars written
+        """
+        if data is None or data.empty:
+            return 0
+
+        bars = to_records(data)
+        days = bars['time'].astype('datetime64[ns]').astype('datetime64[D]')
+        bounds = np.flatnonzero(days[1:] != days[:-1]) + 1
+
+        with self._lock:
+            os.makedirs(self._dir(symbol, timeframe), exist_ok=True)
+            for chunk in np.split(bars, bounds):
+                day = pd.Timestamp(chunk['time'][0]).date()
+                merged = np.concatenate([self._load(symbol, timeframe, day), chunk])
+                # Keep the last copy of each bar time, i.e. the new one
+                _, last = np.unique(merged['time'][::-1], return_index=True)
+                merged = merged[len(merged) - 1 - last]
+
+                path = self._path(symbol, timeframe, day)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, merged)
+                os.replace(tmp_path, path)
+        return len(bars)
+
+    def read(self, symbol: str, timeframe: str, start=None, end=None,
+             tz: str = 'UTC') -> pd.DataFrame:
+        """
+        Load stored bars with start <= time <= end.
+
+        Args:
+            symbol (str): Trading symbol
+            timeframe (str): Timeframe, e.g. '1m'
+            start: First bar time wanted, None for the start of the store
+            end: Last bar time wanted, None for the end of the store
+            tz (str): Timezone of the returned index, None for naive UTC
+
+        Returns:
+            pd.DataFrame: open, high, low, close and volume, empty when
+                nothing is stored in the range
+        """
+        start_ns = _to_ns(start) if start is not None else None
+        end_ns = _to_ns(end) if end is not None else None
+        first_day = pd.Timestamp(start_ns).date() if start_ns is not None else None
+        last_day = pd.Timestamp(end_ns).date() if end_ns is not None else None
+
+        chunks = []
+        for day in self.days(symbol, timeframe):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            bars = self._load(symbol, timeframe, day)
+            if day == first_day:
+                bars = bars[np.searchsorted(bars['time'], start_ns, side='left'):]
+            if day == last_day:
+                bars = bars[:np.searchsorted(bars['time'], end_ns, side='right')]
+            chunks.append(bars)
+
+        bars = np.concatenate(chunks) if chunks else np.empty(0, dtype=BAR_DTYPE)
+        return to_frame(bars, tz)
+
+    def coverage(self, symbol: str, timeframe: str) -> np.ndarray:
+        """
+        Return the downloaded time ranges as sorted, disjoint RANGE_DTYPE records.
+
+        A store written before coverage was recorded counts each run of
+        consecutive stored days as covered from its first bar up to its last.
+        """
+        path = os.path.join(self._dir(symbol, timeframe), COVERAGE_FILE)
+        if os.path.exists(path):
+            return np.load(path)
+
+        ranges = []
+        previous = None
+        for day in self.days(symbol, timeframe):
+            times = self._load(symbol, timeframe, day)['time']
+            if len(times) == 0:
+                continue
+            if ranges and (day - previous).days == 1:
+                ranges[-1] = (ranges[-1][0], int(times[-1]))
+            else:
+                ranges.append((int(times[0]), int(times[-1])))
+            previous = day
+        return np.array(ranges, dtype=RANGE_DTYPE)
+
+    def mark_covered(self, symbol: str, timeframe: str, start, end):
+        """
+        Record that every bar with start <= time < end has been downloaded,
+        including days that have none
+        """
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        if end_ns <= start_ns:
+            return
+        with self._lock:
+            ranges = sorted(self.coverage(symbol, timeframe).tolist() + [(start_ns, end_ns)])
+            merged = [ranges[0]]
+            for range_start, range_end in ranges[1:]:
+                # Ranges that overlap or touch become one
+                if range_start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+                else:
+                    merged.append((range_start, range_end))
+
+            os.makedirs(self._dir(symbol, timeframe), exist_ok=True)
+            path = os.path.join(self._dir(symbol, timeframe), COVERAGE_FILE)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.array(merged, dtype=RANGE_DTYPE))
+            os.replace(tmp_path, path)
+
+    def save_download(self, symbol: str, timeframe: str, start, end, data: pd.DataFrame) -> int:
+        """
+        Store the bars downloaded for start <= time < end and mark the range
+        covered. The newest bar may still have been forming, so it stays
+        uncovered and the next download that reaches it refreshes it.
+
+        Returns:
+            int: Number of bars written
+        """
+        written = self.append(symbol, timeframe, data)
+        end_ns = _to_ns(end)
+        if written:
+            end_ns = min(end_ns, int(to_records(data)['time'][-1]))
+        self.mark_covered(symbol, timeframe, start, pd.Timestamp(end_ns, tz='UTC'))
+        return written
+
+    def missing(self, symbol: str, timeframe: str, start, end) -> list:
+        """
+        Return the parts of start <= time <= end that were never downloaded
+
+        Returns:
+            list: (start, end) UTC Timestamp pairs, oldest first, each
+                covering start <= time < end; empty when nothing is missing
+        """
+        cursor, end_ns = _to_ns(start), _to_ns(end) + 1
+        gaps = []
+        for range_start, range_end in self.coverage(symbol, timeframe).tolist():
+            if range_end <= cursor:
+                continue
+            if range_start >= end_ns:
+                break
+            if range_start > cursor:
+                gaps.append((cursor, range_start))
+            cursor = range_end
+        if cursor < end_ns:
+            gaps.append((cursor, end_ns))
+        return [(pd.Timestamp(a, tz='UTC'), pd.Timestamp(b, tz='UTC')) for a, b in gaps]
+
+    def first_time(self, symbol: str, timeframe: str):
+        """Return the time of the oldest stored bar, or None"""
+        days = self.days(symbol, timeframe)
+        if not days:
+            return None
+        return pd.Timestamp(self._load(symbol, timeframe, days[0])['time'][0], tz='UTC')
+
+    def last_time(self, symbol: str, timeframe: str):
+        """Return the time of the newest stored bar, or None"""
+        days = self.days(symbol, timeframe)
+        if not days:
+            return None
+        return pd.Timestamp(self._load(symbol, timeframe, days[-1])['time'][-1], tz='UTC')
+
+
+def to_utc(value) -> pd.Timestamp:
+    """Convert a timestamp to a tz-aware UTC Timestamp, naive times taken as UTC"""
+    value = pd.Timestamp(value)
+    if value.tzinfo is None:
+        return value.tz_localize('UTC')
+    return value.tz_convert('UTC')
+
+
+def _to_ns(value) -> int:
+    """Nanoseconds since the epoch of a timestamp"""
+    return to_utc(value).value
+
+
+def to_records(data: pd.DataFrame) -> np.ndarray:
+    """Convert an OHLC DataFrame to time-sorted BAR_DTYPE records"""
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+
+    bars = np.empty(len(data), dtype=BAR_DTYPE)
+    bars['time'] = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    for column in PRICE_COLUMNS:
+        bars[column] = data[column].to_numpy(dtype=float) if column in data else 0.0
+    return bars[np.argsort(bars['time'], kind='stable')]
+
+
+def to_frame(bars: np.ndarray, tz: str = 'UTC') -> pd.DataFrame:
+    """Convert BAR_DTYPE records to an OHLC DataFrame indexed by time"""
+    index = pd.DatetimeIndex(bars['time'].astype('datetime64[ns]'), name='time')
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return pd.DataFrame({column: bars[column] for column in PRICE_COLUMNS}, index=index)
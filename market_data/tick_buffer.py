@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class TickBuffer:
+    """
+    The most recent ticks of one symbol in preallocated ring arrays.
+
+    Appending overwrites the oldest tick once the buffer is full, so memory
+    stays fixed and no per-tick objects or copies are made.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """
+        Args:
+            capacity (int): Ticks kept
+        """
+        self.capacity = capacity
+        self._time = np.zeros(capacity)
+        self._bid = np.zeros(capacity)
+        self._ask = np.zeros(capacity)
+        self._next = 0
+        self._size = 0
+
+    def append(self, time: float, bid: float, ask: float):
+        """Add a tick, time in epoch seconds"""
+        i = self._next
+        self._time[i] = time
+        self._bid[i] = bid
+        self._ask[i] = ask
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def last(self) -> tuple:
+        """(time, bid, ask) of the newest tick"""
+        if self._size == 0:
+            raise IndexError("tick buffer is empty")
+        i = self._next - 1
+        return float(self._time[i]), float(self._bid[i]), float(self._ask[i])
+
+    def _ordered(self, values: np.ndarray) -> np.ndarray:
+        if self._size < self.capacity:
+            return values[:self._size].copy()
+        return np.roll(values, -self._next)
+
+    def times(self) -> np.ndarray:
+        """Tick times, oldest first"""
+        return self._ordered(self._time)
+
+    def bids(self) -> np.ndarray:
+        """Bid prices, oldest first"""
+        return self._ordered(self._bid)
+
+    def asks(self) -> np.ndarray:
+        """Ask prices, oldest first"""
+        return self._ordered(self._ask)
+
+    def mids(self) -> np.ndarray:
+        """Mid prices, oldest first"""
+        return (self.bids() + self.asks()) / 2
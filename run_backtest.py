@@ -1,43 +1,47 @@
+import logging
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 from strategies.ict_combined_strategy import ICTCombinedStrategy
 from backtesting.backtest import Backtest
+from market_data.store import OHLCStore
+from market_data.fetcher import ChunkedFetcher
+from market_data.sources import YahooSource
 
-def download_data(symbol, timeframe, start_date, end_date):
-    """Download historical data from Yahoo Finance"""
-    ticker = yf.Ticker(symbol)
+def download_data(symbol, timeframe, start_date, end_date, store=None, tz='America/New_York',
+                  source=None):
+    """
+    Load historical data from the local store, downloading only the ranges
+    it doesn't cover yet, gaps inside the stored history included
     
-    # Download data in 7-day chunks to avoid limitations
-    all_data = pd.DataFrame()
-    current_start = start_date
-    
-    while current_start < end_date:
-        current_end = min(current_start + timedelta(days=7), end_date)
-        print(f"Downloading chunk from {current_start} to {current_end}")
-        
-        chunk = ticker.history(start=current_start, end=current_end, interval=timeframe)
-        if not chunk.empty:
-            all_data = pd.concat([all_data, chunk])
-        
-        current_start = current_end
-    
-    if all_data.empty:
-        return pd.DataFrame()
-    
-    # Remove any duplicate data points
-    all_data = all_data[~all_data.index.duplicated(keep='first')]
+    Args:
+        store (OHLCStore): Local market data store, a default one when None
+        tz (str): Timezone of the returned index
+        source (DataSource): Where missing bars come from, Yahoo Finance by default
+
+    Raises:
+        Exception: Whatever the download raised, after logging it; stored
+            data alone would leave a silent hole in the range
+    """
+    store = store or OHLCStore()
+    start_date = pd.Timestamp(start_date).tz_localize(tz)
+    end_date = pd.Timestamp(end_date).tz_localize(tz)
     
-    # Rename columns to match our strategy's expectations
-    all_data = all_data.rename(columns={
-        'Open': 'open',
-        'High': 'high',
-        'Low': 'low',
-        'Close': 'close',
-        'Volume': 'volume'
-    })
+    missing = store.missing(symbol, timeframe, start_date, end_date)
+    if missing:
+        # 7-day windows fetched concurrently; an interrupted download
+        # resumes from the windows already checkpointed
+        fetcher = ChunkedFetcher(source or YahooSource(), checkpoint_dir='.download_checkpoints')
+        for fetch_start, fetch_end in missing:
+            try:
+                print(f"Downloading {symbol} {timeframe} from {fetch_start} to {fetch_end}")
+                data = fetcher.fetch(symbol, timeframe, fetch_start, fetch_end)
+            except Exception as e:
+                logging.error(f"Error downloading {symbol} {timeframe} from {fetch_start} "
+                              f"to {fetch_end}: {str(e)}")
+                raise
+            store.save_download(symbol, timeframe, fetch_start, fetch_end, data)
     
-    return all_data
+    return store.read(symbol, timeframe, start_date, end_date, tz=tz)
 
 def main():
     # Initialize strategy
@@ -65,7 +69,7 @@ def main():
     
     # Run backtest
     print("\nRunning backtest...")
-    results = backtest.run(data)
+    results = backtest.run(data, mode='vectorized')
     
     # Plot results
     backtest.plot_results(data)
@@ -82,23 +86,19 @@ def main():
         
     # Print daily performance
     print("\nDaily Performance Analysis:")
-    daily_profits = {}
-    for trade in results['trades']:
-        date = trade['entry_time'].date()
-        if date not in daily_profits:
-            daily_profits[date] = 0
-        daily_profits[date] += trade['profit']
-    
-    for date, profit in sorted(daily_profits.items()):
+    trades = backtest.trades
+    for date, profit in trades.daily_pnl(by='entry_time').items():
         print(f"{date}: ${profit:.2f}")
         
     # Print risk metrics
+    profits = trades.records['profit']
+    durations = (trades.records['exit_time'] - trades.records['entry_time']) / 3.6e12
     print("\nRisk Analysis:")
-    print(f"Average Win: ${sum(t['profit'] for t in results['trades'] if t['profit'] > 0) / len([t for t in results['trades'] if t['profit'] > 0]):.2f}")
-    print(f"Average Loss: ${sum(t['profit'] for t in results['trades'] if t['profit'] <= 0) / len([t for t in results['trades'] if t['profit'] <= 0]):.2f}")
-    print(f"Largest Win: ${max((t['profit'] for t in results['trades']), default=0):.2f}")
-    print(f"Largest Loss: ${min((t['profit'] for t in results['trades']), default=0):.2f}")
-    print(f"Average Trade Duration: {sum((t['exit_time'] - t['entry_time']).total_seconds() / 3600 for t in results['trades']) / len(results['trades']):.2f} hours")
+    print(f"Average Win: ${profits[profits > 0].mean():.2f}")
+    print(f"Average Loss: ${profits[profits <= 0].mean():.2f}")
+    print(f"Largest Win: ${profits.max(initial=0):.2f}")
+    print(f"Largest Loss: ${profits.min(initial=0):.2f}")
+    print(f"Average Trade Duration: {durations.mean():.2f} hours")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,128 @@
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+from strategies import patterns, swings
+
+
+def make_bars(count: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLC bars shaped like MT5 rates"""
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 0.5, count))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 0.1, count)
+    return pd.DataFrame({
+        'time': 1_700_000_000 + 300 * np.arange(count),
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 0.3, count)),
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 0.3, count)),
+        'close': close,
+        'tick_volume': rng.integers(1, 100, count)
+    })
+
+
+def legacy_order_blocks(df):
+    """The row-wise M5 order block stage trading_bot.py used before"""
+    df['body_size'] = abs(df['close'] - df['open'])
+    df['upper_wick'] = df.apply(lambda x: max(x['high'] - x['close'], x['high'] - x['open']), axis=1)
+    df['lower_wick'] = df.apply(lambda x: min(x['close'] - x['low'], x['open'] - x['low']), axis=1)
+    
+    df['is_strong_bull'] = (
+        (df['close'] > df['open']) & 
+        (df['body_size'] > df['body_size'].rolling(10).mean()) &
+        (df['lower_wick'] < df['body_size'] * 0.5)
+    )
+    df['is_strong_bear'] = (
+        (df['close'] < df['open']) & 
+        (df['body_size'] > df['body_size'].rolling(10).mean()) &
+        (df['upper_wick'] < df['body_size'] * 0.5)
+    )
+    
+    df['bull_ob'] = df['is_strong_bull'].shift(1) & (df['low'].shift(1) > df['high'])
+    df['bear_ob'] = df['is_strong_bear'].shift(1) & (df['high'].shift(1) < df['low'])
+    return df
+
+
+def legacy_swing_points(data):
+    """The row-wise 5-bar fractal loop ICTStrategy and LiquidityStrategy used before"""
+    swing_highs = []
+    swing_lows = []
+    
+    for i in range(2, len(data)-2):
+        # Swing high
+        if data['high'].iloc[i] > data['high'].iloc[i-1] and \
+           data['high'].iloc[i] > data['high'].iloc[i-2] and \
+           data['high'].iloc[i] > data['high'].iloc[i+1] and \
+           data['high'].iloc[i] > data['high'].iloc[i+2]:
+            swing_highs.append((i, data['high'].iloc[i]))
+        
+        # Swing low
+        if data['low'].iloc[i] < data['low'].iloc[i-1] and \
+           data['low'].iloc[i] < data['low'].iloc[i-2] and \
+           data['low'].iloc[i] < data['low'].iloc[i+1] and \
+           data['low'].iloc[i] < data['low'].iloc[i+2]:
+            swing_lows.append((i, data['low'].iloc[i]))
+    
+    return swing_highs, swing_lows
+
+
+def track_swings(bars):
+    """Feed every bar to a SwingTracker, as a live loop would"""
+    tracker = swings.SwingTracker(left=2, right=2, history=len(bars))
+    for high, low in zip(bars['high'].to_numpy().tolist(), bars['low'].to_numpy().tolist()):
+        tracker.update(high, low)
+    return tracker
+
+
+def time_call(func, repeat: int) -> float:
+    """Best per-call time in milliseconds"""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def bench_order_blocks(sizes, repeat):
+    """M5 order block stage, row-wise apply vs vectorized detector"""
+    print("\nM5 order block stage (per symbol)")
+    print(f"{'bars':>8} {'apply ms':>10} {'vector ms':>10} {'speedup':>8}")
+    for size in sizes:
+        bars = make_bars(size)
+        before = legacy_order_blocks(bars.copy())
+        after = pd.concat([bars, patterns.strong_candle_order_blocks(bars)], axis=1)
+        for column in ('bull_ob', 'bear_ob', 'is_strong_bull', 'is_strong_bear'):
+            assert (before[column].fillna(False).astype(bool) == after[column]).all(), column
+            
+        legacy = time_call(lambda: legacy_order_blocks(bars.copy()), repeat)
+        vectorized = time_call(lambda: patterns.strong_candle_order_blocks(bars), repeat)
+        print(f"{size:>8} {legacy:>10.2f} {vectorized:>10.3f} {legacy / vectorized:>7.0f}x")
+
+
+def bench_swings(sizes, repeat):
+    """5-bar fractal swings, iloc loop vs vectorized vs one update per bar"""
+    print("\nFractal swing points (left=2, right=2)")
+    print(f"{'bars':>8} {'loop ms':>10} {'vector ms':>10} {'speedup':>8} {'us/update':>10}")
+    for size in sizes:
+        bars = make_bars(size)
+        
+        # The loop takes seconds on large inputs, so time it once there
+        legacy = time_call(lambda: legacy_swing_points(bars), repeat if size <= 10000 else 1)
+        vectorized = time_call(lambda: swings.swing_points(bars, left=2, right=2), repeat)
+        incremental = time_call(lambda: track_swings(bars), 1) * 1000 / size
+        print(f"{size:>8} {legacy:>10.2f} {vectorized:>10.3f} {legacy / vectorized:>7.0f}x {incremental:>10.2f}")
+
+
+BENCHMARKS = {
+    'order_blocks': bench_order_blocks,
+    'swings': bench_swings
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the analysis hot paths")
+    parser.add_argument('names', nargs='*', default=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help="Bar counts")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args()
+    
+    for name in args.names:
+        BENCHMARKS[name](args.sizes, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,15 @@ from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from . import features, patterns
+from .feature_cache import shared_cache
+from .zone_store import ZoneStore
 
 class BaseStrategy(ABC):
+    # Features computed from the same bars are shared through this cache;
+    # set to None on a strategy to always recompute
+    feature_cache = shared_cache
+    
     def __init__(self, symbol, timeframe, risk_percentage=1.0):
         self.symbol = symbol
         self.timeframe = timeframe
@@ -11,6 +18,7 @@ class BaseStrategy(ABC):
         self.position = None
         self.last_signal = None
         self.last_signal_time = None
+        self.zone_store = None
         
     @abstractmethod
     def analyze(self, data: pd.DataFrame) -> dict:
@@ -22,125 +30,91 @@ class BaseStrategy(ABC):
         """Calculate position size based on risk management rules"""
         pass
     
-    def get_daily_bias(self, data: pd.DataFrame) -> str:
-        """Determine daily market bias"""
-        # Create a copy of the data to avoid SettingWithCopyWarning
-        daily_data = data.copy()
-        daily_data['date'] = daily_data.index.date
-        daily_open = daily_data.groupby('date')['open'].first()
-        daily_close = daily_data.groupby('date')['close'].last()
+    def analyze_with_features(self, data: pd.DataFrame, features: dict) -> dict:
+        """
+        Analyze market data reusing features already computed for this bar
         
-        # Compare current day's open with previous day's close
-        daily_data['prev_close'] = daily_close.shift(1)
-        daily_data['bias'] = np.where(daily_data['open'] > daily_data['prev_close'], 'bullish', 'bearish')
+        Args:
+            data (pd.DataFrame): Historical price data
+            features (dict): features.compute_features(data)
+        """
+        return self.analyze(data)
+    
+    def cached_feature(self, name: str, data: pd.DataFrame, compute, *params):
+        """
+        Look up a feature of data in feature_cache, computing it on a miss
         
-        return daily_data['bias'].iloc[-1]
+        Args:
+            name (str): Feature name
+            data (pd.DataFrame): Bars the feature is computed from
+            compute: compute() -> the feature value
+            *params: Feature parameters that change its value
+        """
+        return features.cached(self.feature_cache, self.symbol, self.timeframe, name, data, compute, *params)
+    
+    def get_daily_bias(self, data: pd.DataFrame) -> str:
+        """Determine daily market bias"""
+        return self.cached_feature('daily_bias', data, lambda: features.daily_bias_series(data).iloc[-1])
+    
+    def get_daily_bias_series(self, data: pd.DataFrame) -> pd.Series:
+        """Determine the daily market bias for every bar in data"""
+        return features.daily_bias_series(data)
     
     def identify_liquidity_levels(self, data: pd.DataFrame) -> dict:
         """Identify key liquidity levels"""
-        # Create a copy of the data to avoid SettingWithCopyWarning
-        df = data.copy()
-        
-        # Identify swing highs and lows
-        df['swing_high'] = (df['high'] > df['high'].shift(1)) & (df['high'] > df['high'].shift(-1))
-        df['swing_low'] = (df['low'] < df['low'].shift(1)) & (df['low'] < df['low'].shift(-1))
-        
-        # Get recent swing points
-        recent_highs = df[df['swing_high']]['high'].tail(5).tolist()
-        recent_lows = df[df['swing_low']]['low'].tail(5).tolist()
-        
-        return {
-            'recent_highs': recent_highs,
-            'recent_lows': recent_lows
-        }
+        return self.cached_feature('liquidity_levels', data, lambda: features.liquidity_levels(data, count=5), 5)
     
-    def identify_fair_value_gaps(self, data: pd.DataFrame) -> list:
-        """Identify fair value gaps"""
-        # Create a copy of the data to avoid SettingWithCopyWarning
-        df = data.copy()
+    def identify_fair_value_gaps(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Identify fair value gaps
         
-        fvgs = []
-        for i in range(2, len(df)):
-            # Bullish FVG
-            if df['high'].iloc[i-2] > df['low'].iloc[i]:
-                fvgs.append({
-                    'type': 'bullish',
-                    'high': df['high'].iloc[i-2],
-                    'low': df['low'].iloc[i],
-                    'time': df.index[i]
-                })
-                
-            # Bearish FVG
-            if df['low'].iloc[i-2] < df['high'].iloc[i]:
-                fvgs.append({
-                    'type': 'bearish',
-                    'high': df['high'].iloc[i],
-                    'low': df['low'].iloc[i-2],
-                    'time': df.index[i]
-                })
-                
-        return fvgs
+        Returns:
+            np.ndarray: patterns.ZONE_DTYPE records (type, high, low, time, index).
+                Use patterns.iter_zone_dicts for the legacy dict format.
+        """
+        return self.cached_feature('fair_value_gaps', data, lambda: patterns.fair_value_gaps(data))
     
-    def identify_order_blocks(self, data: pd.DataFrame) -> list:
-        """Identify order blocks"""
-        # Create a copy of the data to avoid SettingWithCopyWarning
-        df = data.copy()
+    def identify_order_blocks(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Identify order blocks
         
-        order_blocks = []
-        for i in range(1, len(df)-1):  # Stop one candle before the end
-            # Bullish order block
-            if (df['close'].iloc[i] > df['open'].iloc[i] and 
-                df['close'].iloc[i+1] < df['open'].iloc[i+1]):
-                order_blocks.append({
-                    'type': 'bullish',
-                    'high': df['high'].iloc[i],
-                    'low': df['low'].iloc[i],
-                    'time': df.index[i]
-                })
-                
-            # Bearish order block
-            if (df['close'].iloc[i] < df['open'].iloc[i] and 
-                df['close'].iloc[i+1] > df['open'].iloc[i+1]):
-                order_blocks.append({
-                    'type': 'bearish',
-                    'high': df['high'].iloc[i],
-                    'low': df['low'].iloc[i],
-                    'time': df.index[i]
-                })
-                
-        return order_blocks
+        Returns:
+            np.ndarray: patterns.ZONE_DTYPE records (type, high, low, time, index).
+                Use patterns.iter_zone_dicts for the legacy dict format.
+        """
+        return self.cached_feature('order_blocks', data, lambda: patterns.order_blocks(data))
     
-    def identify_breaker_blocks(self, data: pd.DataFrame) -> list:
-        """Identify breaker blocks"""
-        # Create a copy of the data to avoid SettingWithCopyWarning
-        df = data.copy()
+    def identify_breaker_blocks(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Identify breaker blocks, one per order block that price closed through
         
-        breaker_blocks = []
-        order_blocks = self.identify_order_blocks(df)
+        Returns:
+            np.ndarray: patterns.ZONE_DTYPE records (type, high, low, time, index).
+                Use patterns.iter_zone_dicts for the legacy dict format.
+        """
+        return patterns.breaker_blocks(data, self.identify_order_blocks(data))
+
+    def create_zone_store(self) -> ZoneStore:
+        """ZoneStore with the detectors this strategy uses, made on first use"""
+        return ZoneStore()
+    
+    def live_zones(self, data: pd.DataFrame, kind: str, zone_type: str = None) -> np.ndarray:
+        """
+        Zones of a kind that price has not yet mitigated, nor left to expire
         
-        for i in range(1, len(df)):
-            for ob in order_blocks:
-                # Bullish breaker block
-                if (ob['type'] == 'bearish' and 
-                    df['close'].iloc[i] > ob['high']):
-                    breaker_blocks.append({
-                        'type': 'bullish',
-                        'high': ob['high'],
-                        'low': ob['low'],
-                        'time': df.index[i]
-                    })
-                    
-                # Bearish breaker block
-                if (ob['type'] == 'bullish' and 
-                    df['close'].iloc[i] < ob['low']):
-                    breaker_blocks.append({
-                        'type': 'bearish',
-                        'high': ob['high'],
-                        'low': ob['low'],
-                        'time': df.index[i]
-                    })
-                    
-        return breaker_blocks
+        Args:
+            data (pd.DataFrame): Historical price data; bars after the last
+                call are ingested into the strategy's zone store
+            kind (str): Zone kind, e.g. 'fvg', 'order_block' or 'breaker'
+            zone_type (str): 'bullish' or 'bearish', both when None
+            
+        Returns:
+            np.ndarray: patterns.ZONE_DTYPE records, oldest first
+        """
+        if self.zone_store is None:
+            self.zone_store = self.create_zone_store()
+        self.zone_store.update(data)
+        return self.zone_store.live(kind, zone_type)
 
     def update_position(self, current_price: float):
         """
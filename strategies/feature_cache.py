@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import pandas as pd
+
+
+def bar_key(data: pd.DataFrame) -> tuple:
+    """
+    Identify the bars of data for caching: length, first and last bar time,
+    and the last bar's high, low and close, so a bar still forming (same
+    time, new prices) is not served stale features.
+    """
+    if len(data) == 0:
+        return (0,)
+    return (len(data), data.index[0], data.index[-1],
+            data['high'].iat[-1], data['low'].iat[-1], data['close'].iat[-1])
+
+
+class FeatureCache:
+    """
+    Bounded LRU cache of features computed from a price frame.
+
+    Entries are keyed by symbol, timeframe, feature name, feature parameters
+    and bar_key(data), so every strategy analysing the same bars shares one
+    computation; a thread asking for a feature another thread is computing
+    waits for that result. Cached values are shared too: treat them as
+    read-only.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Args:
+            maxsize (int): Entries kept before the least recently used is dropped
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, timeframe: str, name: str, data: pd.DataFrame, compute, *params):
+        """
+        Return a cached feature, computing and storing it on a miss
+
+        Args:
+            symbol (str): Symbol of data
+            timeframe (str): Timeframe of data
+            name (str): Feature name
+            data (pd.DataFrame): Bars the feature is computed from
+            compute: compute() -> the feature value
+            *params: Feature parameters that change its value
+
+        Returns:
+            The feature value
+        """
+        key = (symbol, timeframe, name, params, bar_key(data))
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if not owner:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                # Other threads asking for the same feature wait on this entry
+                self.misses += 1
+                entry = self._entries[key] = Future()
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        if not owner:
+            return entry.result()
+
+        try:
+            value = compute()
+        except Exception as e:
+            entry.set_exception(e)
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        entry.set_result(value)
+        return value
+
+    def stats(self) -> dict:
+        """Hit and miss counts, hit rate and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries)
+        }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache used by strategies and StrategyManager unless given another one
+shared_cache = FeatureCache()
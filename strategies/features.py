@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from . import swings
+
+
+def daily_bias_series(data: pd.DataFrame) -> pd.Series:
+    """Daily market bias for every bar: bullish when the bar opens above the previous day's close"""
+    # Create a copy of the data to avoid SettingWithCopyWarning
+    daily_data = data.copy()
+    daily_data['date'] = daily_data.index.date
+    daily_close = daily_data.groupby('date')['close'].last()
+
+    # Compare current day's open with previous day's close
+    daily_data['prev_close'] = daily_close.shift(1)
+    daily_data['bias'] = np.where(daily_data['open'] > daily_data['prev_close'], 'bullish', 'bearish')
+
+    return daily_data['bias']
+
+
+def swing_points(data: pd.DataFrame) -> tuple:
+    """
+    Bars whose high (low) is above (below) both neighbours
+
+    Returns:
+        tuple: (swing_high, swing_low) boolean arrays, False at the first and last bar
+    """
+    return swings.fractals(data['high'].to_numpy(), data['low'].to_numpy(), left=1, right=1)
+
+
+def liquidity_levels(data: pd.DataFrame, swings: tuple = None, count: int = 5) -> dict:
+    """
+    Prices of the most recent swing highs and lows
+
+    Args:
+        data (pd.DataFrame): OHLC data
+        swings (tuple): swing_points(data), computed when None
+        count (int): Levels kept per side
+
+    Returns:
+        dict: recent_highs and recent_lows lists, oldest first
+    """
+    swing_high, swing_low = swings if swings is not None else swing_points(data)
+    return {
+        'recent_highs': data['high'].to_numpy()[swing_high][-count:].tolist(),
+        'recent_lows': data['low'].to_numpy()[swing_low][-count:].tolist()
+    }
+
+
+def atr(data: pd.DataFrame, period: int = 14) -> float:
+    """Average True Range of the last bar, a simple mean of the true range"""
+    high = data['high']
+    low = data['low']
+    close = data['close']
+
+    tr1 = high - low
+    tr2 = abs(high - close.shift())
+    tr3 = abs(low - close.shift())
+
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    return tr.rolling(window=period).mean().iloc[-1]
+
+
+def volatility(data: pd.DataFrame) -> float:
+    """Annualized standard deviation of the close-to-close returns"""
+    returns = data['close'].pct_change()
+    return returns.std() * np.sqrt(252)
+
+
+def cached(cache, symbol: str, timeframe: str, name: str, data: pd.DataFrame, compute, *params):
+    """compute() through a FeatureCache, or directly when cache is None"""
+    if cache is None:
+        return compute()
+    return cache.get(symbol, timeframe, name, data, compute, *params)
+
+
+def compute_features(data: pd.DataFrame, atr_period: int = 14, cache=None,
+                     symbol: str = '', timeframe: str = '') -> dict:
+    """
+    Compute the market features several strategies and the strategy manager
+    look at, once per bar.
+
+    Args:
+        data (pd.DataFrame): OHLC data, the last row being the current bar
+        atr_period (int): Bars in the ATR
+        cache (FeatureCache): Cache to read and fill, None to always compute
+        symbol (str): Symbol of data, for the cache key
+        timeframe (str): Timeframe of data, for the cache key
+
+    Returns:
+        dict: daily_bias, atr, volatility, swing_high, swing_low and
+            liquidity_levels
+    """
+    def feature(name, compute, *params):
+        return cached(cache, symbol, timeframe, name, data, compute, *params)
+
+    swings = feature('swing_points', lambda: swing_points(data))
+    return {
+        'daily_bias': feature('daily_bias', lambda: daily_bias_series(data).iloc[-1]),
+        'atr': feature('atr', lambda: atr(data, atr_period), atr_period),
+        'volatility': feature('volatility', lambda: volatility(data)),
+        'swing_high': swings[0],
+        'swing_low': swings[1],
+        'liquidity_levels': feature('liquidity_levels', lambda: liquidity_levels(data, swings, 5), 5)
+    }
@@ -1,7 +1,12 @@
 from .base_strategy import BaseStrategy
+from . import features, patterns
+from indicators.trend import EMA, SMA
+from indicators.extrema import RollingMax, RollingMin
+from indicators.volatility import ATR, ReturnVolatility
+from market_data.tick_buffer import TickBuffer
 import pandas as pd
 import numpy as np
-from datetime import datetime
+import time
 
 class ICTCombinedStrategy(BaseStrategy):
     def __init__(self, symbol: str, timeframe: str, risk_percentage: float = 1.0):
@@ -9,30 +14,27 @@ class ICTCombinedStrategy(BaseStrategy):
         self.min_score_threshold = 65  # Lower threshold for gold's higher volatility
         self.min_risk_reward = 1.5  # Higher risk-reward for gold's larger moves
         self.max_daily_trades = 8  # Moderate number of trades for gold
+        self.max_volatility = 0.30  # Higher volatility threshold for gold
+        self.trend_atr_multiplier = 2.0  # Stop distance in ATRs for trend trades
+        self.reversal_atr_multiplier = 1.5  # Stop distance in ATRs for liquidity pool and MSS trades
         self.trades_today = 0
         self.last_trade_time = None
-        self.price_data = []
         self.current_price = None
+        # Tick path used by update(): last 100 quotes plus running indicators
+        self.ticks = TickBuffer(100)
+        self._tick_sma = SMA(20)
+        self._tick_high = RollingMax(5)
+        self._tick_low = RollingMin(5)
+        self._last_tick = None
+        self._prev_tick = None
         
     def calculate_volatility(self, data: pd.DataFrame) -> float:
         """Calculate current market volatility"""
-        returns = data['close'].pct_change()
-        return returns.std() * np.sqrt(252)  # Annualized volatility
+        return self.cached_feature('volatility', data, lambda: features.volatility(data))  # Annualized volatility
         
     def calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
         """Calculate Average True Range"""
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        
-        return atr.iloc[-1]
+        return self.cached_feature('atr', data, lambda: features.atr(data, period), period)
         
     def identify_strong_trend(self, data: pd.DataFrame) -> str:
         """Identify strong trend using multiple timeframes"""
@@ -57,37 +59,17 @@ class ICTCombinedStrategy(BaseStrategy):
         return 'neutral'
         
     def identify_mitigation_blocks(self, data: pd.DataFrame) -> list:
-        """Identify Mitigation Blocks (Reversal Patterns)"""
-        # Create a copy of the data to avoid SettingWithCopyWarning
-        df = data.copy()
-        
-        mitigation_blocks = []
-        
-        for i in range(2, len(df)-1):
-            # Bearish Mitigation Block
-            if (df['high'].iloc[i] < df['high'].iloc[i-1] and  # Failed to make higher high
-                df['low'].iloc[i] < df['low'].iloc[i-2]):  # Broke previous higher low
-                mitigation_blocks.append({
-                    'type': 'bearish',
-                    'high': df['high'].iloc[i],
-                    'low': df['low'].iloc[i],
-                    'time': df.index[i]
-                })
-            
-            # Bullish Mitigation Block
-            if (df['low'].iloc[i] > df['low'].iloc[i-1] and  # Failed to make lower low
-                df['high'].iloc[i] > df['high'].iloc[i-2]):  # Broke previous lower high
-                mitigation_blocks.append({
-                    'type': 'bullish',
-                    'high': df['high'].iloc[i],
-                    'low': df['low'].iloc[i],
-                    'time': df.index[i]
-                })
-        
-        return mitigation_blocks
+        """Identify live Mitigation Blocks (Reversal Patterns), oldest first"""
+        zones = self.live_zones(data, 'mitigation_block')
+        tz = getattr(data.index, 'tz', None)
+        return list(patterns.iter_zone_dicts(zones, tz))
     
     def identify_market_structure_shift(self, data: pd.DataFrame) -> list:
         """Identify Market Structure Shift (MSS)"""
+        return self.cached_feature('ict_combined.market_structure_shift', data,
+                                   lambda: self._find_market_structure_shifts(data))
+    
+    def _find_market_structure_shifts(self, data: pd.DataFrame) -> list:
         # Create a copy of the data to avoid SettingWithCopyWarning
         df = data.copy()
         
@@ -116,26 +98,31 @@ class ICTCombinedStrategy(BaseStrategy):
         
         return mss_signals
     
-    def analyze(self, data: pd.DataFrame) -> dict:
+    def analyze(self, data: pd.DataFrame, shared: dict = None) -> dict:
         """
         Analyze market data using multiple ICT concepts and generate trading signals.
+        
+        Args:
+            data (pd.DataFrame): Historical price data
+            shared (dict): features.compute_features(data), to reuse the daily
+                bias, volatility and ATR instead of recomputing them
         """
         # Get current time and check trade frequency
         current_time = data.index[-1]
-        if self.last_trade_time:
-            if (current_time.date() != self.last_trade_time.date()):
-                self.trades_today = 0
-            if self.trades_today >= self.max_daily_trades:
-                return None
+        if self._daily_limit_reached(current_time):
+            return None
                 
         # Get market conditions
-        daily_bias = self.get_daily_bias(data)
+        if shared is not None:
+            daily_bias, volatility, atr = shared['daily_bias'], shared['volatility'], shared['atr']
+        else:
+            daily_bias = self.get_daily_bias(data)
+            volatility = self.calculate_volatility(data)
+            atr = self.calculate_atr(data)
         trend = self.identify_strong_trend(data)
-        volatility = self.calculate_volatility(data)
-        atr = self.calculate_atr(data)
         
         # Skip trading if volatility is too high
-        if volatility > 0.30:  # Higher volatility threshold for gold
+        if volatility > self.max_volatility:
             return None
             
         # Get current price and recent price action
@@ -144,15 +131,33 @@ class ICTCombinedStrategy(BaseStrategy):
         recent_low = data['low'].iloc[-5:].min()
         
         # Identify patterns
-        liquidity_levels = self.identify_liquidity_levels(data)
         mss_signals = self.identify_market_structure_shift(data)
+        mss_types = [mss['type'] for mss in mss_signals if mss['time'] == current_time]
         
+        return self._select_signal(current_time, current_price, daily_bias, trend,
+                                   atr, recent_high, recent_low, mss_types)
+    
+    def analyze_with_features(self, data: pd.DataFrame, features: dict) -> dict:
+        return self.analyze(data, features)
+    
+    def _daily_limit_reached(self, current_time) -> bool:
+        """Reset the daily trade counter on a new day and check the daily limit"""
+        if self.last_trade_time:
+            if (current_time.date() != self.last_trade_time.date()):
+                self.trades_today = 0
+            if self.trades_today >= self.max_daily_trades:
+                return True
+        return False
+    
+    def _select_signal(self, current_time, current_price: float, daily_bias: str, trend: str,
+                       atr: float, recent_high: float, recent_low: float, mss_types: list) -> dict:
+        """Build candidate signals from the market conditions and return the best one"""
         # Calculate potential signals with improved risk management
         signals = []
         
         # 1. Strong Trend Following (highest priority)
         if trend == 'strong_bullish' and daily_bias == 'bullish':
-            stop_loss_dollars = 2.0 * atr  # $20-30 typical range for gold
+            stop_loss_dollars = self.trend_atr_multiplier * atr  # $20-30 typical range for gold
             stop_loss = current_price - stop_loss_dollars
             take_profit = current_price + (stop_loss_dollars * 2)  # 2:1 risk-reward ratio
             signals.append({
@@ -167,7 +172,7 @@ class ICTCombinedStrategy(BaseStrategy):
             })
             
         elif trend == 'strong_bearish' and daily_bias == 'bearish':
-            stop_loss_dollars = 2.0 * atr
+            stop_loss_dollars = self.trend_atr_multiplier * atr
             stop_loss = current_price + stop_loss_dollars
             take_profit = current_price - (stop_loss_dollars * 2)
             signals.append({
@@ -183,7 +188,7 @@ class ICTCombinedStrategy(BaseStrategy):
             
         # 2. Liquidity Pool Strategy (with trend confirmation)
         if current_price < recent_low and trend in ['strong_bullish', 'bullish', 'neutral']:
-            stop_loss_dollars = 1.5 * atr  # $15-25 typical range for gold
+            stop_loss_dollars = self.reversal_atr_multiplier * atr  # $15-25 typical range for gold
             stop_loss = current_price - stop_loss_dollars
             take_profit = current_price + (stop_loss_dollars * 2)
             signals.append({
@@ -198,7 +203,7 @@ class ICTCombinedStrategy(BaseStrategy):
             })
             
         if current_price > recent_high and trend in ['strong_bearish', 'bearish', 'neutral']:
-            stop_loss_dollars = 1.5 * atr
+            stop_loss_dollars = self.reversal_atr_multiplier * atr
             stop_loss = current_price + stop_loss_dollars
             take_profit = current_price - (stop_loss_dollars * 2)
             signals.append({
@@ -213,36 +218,35 @@ class ICTCombinedStrategy(BaseStrategy):
             })
             
         # 3. Market Structure Shift (with trend confirmation)
-        for mss in mss_signals:
-            if mss['time'] == current_time:
-                if mss['type'] == 'bullish' and trend in ['strong_bullish', 'bullish', 'neutral']:
-                    stop_loss_dollars = 1.5 * atr
-                    stop_loss = current_price - stop_loss_dollars
-                    take_profit = current_price + (stop_loss_dollars * 2)
-                    signals.append({
-                        'action': 'buy',
-                        'price': current_price,
-                        'stop_loss': stop_loss,
-                        'take_profit': take_profit,
-                        'stop_loss_dollars': stop_loss_dollars,
-                        'reason': 'Market Structure Shift - Bullish',
-                        'score': 85,
-                        'time': current_time
-                    })
-                elif mss['type'] == 'bearish' and trend in ['strong_bearish', 'bearish', 'neutral']:
-                    stop_loss_dollars = 1.5 * atr
-                    stop_loss = current_price + stop_loss_dollars
-                    take_profit = current_price - (stop_loss_dollars * 2)
-                    signals.append({
-                        'action': 'sell',
-                        'price': current_price,
-                        'stop_loss': stop_loss,
-                        'take_profit': take_profit,
-                        'stop_loss_dollars': stop_loss_dollars,
-                        'reason': 'Market Structure Shift - Bearish',
-                        'score': 85,
-                        'time': current_time
-                    })
+        for mss_type in mss_types:
+            if mss_type == 'bullish' and trend in ['strong_bullish', 'bullish', 'neutral']:
+                stop_loss_dollars = self.reversal_atr_multiplier * atr
+                stop_loss = current_price - stop_loss_dollars
+                take_profit = current_price + (stop_loss_dollars * 2)
+                signals.append({
+                    'action': 'buy',
+                    'price': current_price,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'stop_loss_dollars': stop_loss_dollars,
+                    'reason': 'Market Structure Shift - Bullish',
+                    'score': 85,
+                    'time': current_time
+                })
+            elif mss_type == 'bearish' and trend in ['strong_bearish', 'bearish', 'neutral']:
+                stop_loss_dollars = self.reversal_atr_multiplier * atr
+                stop_loss = current_price + stop_loss_dollars
+                take_profit = current_price - (stop_loss_dollars * 2)
+                signals.append({
+                    'action': 'sell',
+                    'price': current_price,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'stop_loss_dollars': stop_loss_dollars,
+                    'reason': 'Market Structure Shift - Bearish',
+                    'score': 85,
+                    'time': current_time
+                })
         
         # Select best signal
         if signals:
@@ -257,6 +261,219 @@ class ICTCombinedStrategy(BaseStrategy):
                     return best_signal
         
         return None
+    
+    def reset_incremental_state(self):
+        """Clear the indicator state used by on_bar before streaming a new series"""
+        self._emas = {span: EMA(span) for span in (20, 50, 100)}
+        self._atr = ATR(14)
+        self._volatility = ReturnVolatility()
+        self._recent_high = RollingMax(5, min_periods=1)
+        self._recent_low = RollingMin(5, min_periods=1)
+        self._bias_date = None
+        self._bias_day_close = np.nan
+        self._bias_prev_close = np.nan
+        
+    def on_bar(self, timestamp: pd.Timestamp, open_price: float, high: float,
+               low: float, close: float) -> dict:
+        """
+        Stream one bar into the incremental indicator state and evaluate it.
+        
+        Returns the same decision analyze() would return for the history seen
+        so far, but every call costs O(1) instead of recomputing the indicators
+        over the whole history.
+        
+        Args:
+            timestamp (pd.Timestamp): Bar open time
+            open_price (float): Bar open
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+            
+        Returns:
+            dict: Trading signal or None
+        """
+        if not hasattr(self, '_emas'):
+            self.reset_incremental_state()
+            
+        ema20, ema50, ema100 = (self._emas[span].update(close) for span in (20, 50, 100))
+        atr = self._atr.update(high, low, close)
+        volatility = self._volatility.update(close)
+        recent_high = self._recent_high.update(high)
+        recent_low = self._recent_low.update(low)
+        
+        # Daily bias. get_daily_bias aligns the previous day's close on the
+        # date index, so only a bar stamped exactly at midnight picks it up.
+        if timestamp.date() != self._bias_date:
+            if self._bias_date is not None:
+                self._bias_prev_close = self._bias_day_close
+            self._bias_date = timestamp.date()
+        self._bias_day_close = close
+        prev_close = np.nan
+        if timestamp == timestamp.normalize():
+            prev_close = pd.Series([self._bias_prev_close], index=[self._bias_date]).reindex(
+                pd.DatetimeIndex([timestamp])).iloc[0]
+        daily_bias = 'bullish' if open_price > prev_close else 'bearish'
+        
+        if self._daily_limit_reached(timestamp):
+            return None
+            
+        if close > ema20 > ema50 > ema100:
+            trend = 'strong_bullish'
+        elif close < ema20 < ema50 < ema100:
+            trend = 'strong_bearish'
+        else:
+            trend = 'neutral'
+            
+        if volatility > self.max_volatility:
+            return None
+            
+        # identify_market_structure_shift stops one bar short of the end, so
+        # the bar being evaluated never carries an MSS of its own
+        return self._select_signal(timestamp, close, daily_bias, trend, atr,
+                                   recent_high, recent_low, [])
+        
+    def compute_batch_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute every market condition analyze() looks at, for all bars at once.
+        
+        Each row holds the values analyze() would see if it were called with
+        the history up to and including that bar.
+        
+        Args:
+            data (pd.DataFrame): Historical OHLC data
+            
+        Returns:
+            pd.DataFrame: One row of features per bar
+        """
+        close = data['close'].to_numpy(dtype=float)
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        close_series = pd.Series(close)
+        
+        ema20 = close_series.ewm(span=20, adjust=False).mean().to_numpy()
+        ema50 = close_series.ewm(span=50, adjust=False).mean().to_numpy()
+        ema100 = close_series.ewm(span=100, adjust=False).mean().to_numpy()
+        trend = np.select(
+            [(close > ema20) & (ema20 > ema50) & (ema50 > ema100),
+             (close < ema20) & (ema20 < ema50) & (ema50 < ema100)],
+            ['strong_bullish', 'strong_bearish'],
+            default='neutral'
+        )
+        
+        prev_close = np.r_[np.nan, close[:-1]]
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = pd.Series(true_range).rolling(window=14).mean().to_numpy()
+        
+        volatility = (close_series.pct_change().expanding().std() * np.sqrt(252)).to_numpy()
+        recent_high = pd.Series(high).rolling(window=5, min_periods=1).max().to_numpy()
+        recent_low = pd.Series(low).rolling(window=5, min_periods=1).min().to_numpy()
+        
+        # Market structure shift on each bar, judged against the two bars before it
+        low_1, low_2 = np.r_[np.nan, low[:-1]], np.r_[np.nan, np.nan, low[:-2]]
+        high_1, high_2 = np.r_[np.nan, high[:-1]], np.r_[np.nan, np.nan, high[:-2]]
+        mss_bullish = (low > low_1) & (low > low_2) & (close > high_1)
+        mss_bearish = (high < high_1) & (high < high_2) & (close < low_1)
+        
+        return pd.DataFrame({
+            'close': close,
+            'daily_bias': self.get_daily_bias_series(data).to_numpy(),
+            'trend': trend,
+            'ema20': ema20,
+            'ema50': ema50,
+            'ema100': ema100,
+            'atr': atr,
+            'volatility': volatility,
+            'recent_high': recent_high,
+            'recent_low': recent_low,
+            'liquidity_buy': close < recent_low,
+            'liquidity_sell': close > recent_high,
+            'mss_bullish': mss_bullish,
+            'mss_bearish': mss_bearish
+        }, index=data.index)
+        
+    def analyze_batch(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Generate the signal analyze() would return for every bar in one pass.
+        
+        Agrees bar for bar with calling analyze() on data.iloc[:i+1] for each i,
+        including the min_score_threshold, min_risk_reward and
+        max_daily_trades gating, and leaves the daily trade counter in the
+        same state.
+        
+        Args:
+            data (pd.DataFrame): Historical OHLC data
+            
+        Returns:
+            pd.Series: Signal dict for bars that trade, None elsewhere
+        """
+        features = self.compute_batch_features(data)
+        close = features['close'].to_numpy()
+        trend = features['trend'].to_numpy()
+        daily_bias = features['daily_bias'].to_numpy()
+        atr = features['atr'].to_numpy()
+        
+        # Candidates in analyze() order. Trend signals score 90 and beat the
+        # liquidity pool signals (85); the buy side is listed first on a tie.
+        # identify_market_structure_shift stops one bar short of the end, so a
+        # bar's own MSS is never visible to analyze() and adds no candidates.
+        trend_buy = (trend == 'strong_bullish') & (daily_bias == 'bullish')
+        trend_sell = (trend == 'strong_bearish') & (daily_bias == 'bearish')
+        liquidity_buy = features['liquidity_buy'].to_numpy() & (trend != 'strong_bearish')
+        liquidity_sell = features['liquidity_sell'].to_numpy() & (trend != 'strong_bullish')
+        conditions = [trend_buy, trend_sell, liquidity_buy, liquidity_sell]
+        
+        action = np.select(conditions, ['buy', 'sell', 'buy', 'sell'], default='')
+        reason = np.select(conditions, ['Strong Bullish Trend', 'Strong Bearish Trend',
+                                        'Liquidity Pool - Buy at discount',
+                                        'Liquidity Pool - Sell at premium'], default='')
+        score = np.select(conditions, [90, 90, 85, 85], default=0)
+        trend_stop = self.trend_atr_multiplier * atr
+        reversal_stop = self.reversal_atr_multiplier * atr
+        stop_loss_dollars = np.select(conditions, [trend_stop, trend_stop, reversal_stop, reversal_stop],
+                                      default=np.nan)
+        stop_loss = np.where(action == 'buy', close - stop_loss_dollars, close + stop_loss_dollars)
+        take_profit = np.where(action == 'buy', close + (stop_loss_dollars * 2),
+                               close - (stop_loss_dollars * 2))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            risk_reward = np.abs(take_profit - close) / stop_loss_dollars
+            
+        candidate = ((action != '') &
+                     (score >= self.min_score_threshold) &
+                     (risk_reward >= self.min_risk_reward) &
+                     ~(features['volatility'].to_numpy() > self.max_volatility))
+        
+        # Apply max_daily_trades the way analyze() does: the counter carries
+        # over from earlier calls on the same day and resets on a new day.
+        dates = np.asarray(data.index.date)
+        carried = 0
+        if self.last_trade_time and len(dates) and self.last_trade_time.date() == dates[0]:
+            carried = self.trades_today
+        taken_before = pd.Series(candidate).groupby(dates).cumsum().to_numpy() - candidate
+        taken_before = taken_before + np.where(dates == dates[0], carried, 0)
+        accepted = candidate & (taken_before < self.max_daily_trades)
+        
+        signals = [None] * len(data)
+        for i in np.flatnonzero(accepted):
+            signals[i] = {
+                'action': action[i],
+                'price': close[i],
+                'stop_loss': stop_loss[i],
+                'take_profit': take_profit[i],
+                'stop_loss_dollars': stop_loss_dollars[i],
+                'reason': reason[i],
+                'score': int(score[i]),
+                'time': data.index[i]
+            }
+        
+        # Leave the daily counter as the last per-bar analyze() call would
+        if accepted.any():
+            last = np.flatnonzero(accepted)[-1]
+            self.last_trade_time = data.index[last]
+            self.trades_today = int(taken_before[last]) + 1
+        if self.last_trade_time and len(dates) and self.last_trade_time.date() != dates[-1]:
+            self.trades_today = 0
+        
+        return pd.Series(signals, index=data.index, dtype=object, name='signal')
         
     def calculate_position_size(self, account_balance: float, stop_loss_pips: float) -> float:
         """
@@ -270,62 +487,50 @@ class ICTCombinedStrategy(BaseStrategy):
     def update(self, price_info):
         """Update strategy with new price information"""
         self.current_price = price_info
-        
-        # Add price to historical data
-        self.price_data.append({
-            'timestamp': datetime.now(),
-            'bid': price_info['bid'],
-            'ask': price_info['ask']
-        })
-        
-        # Keep only last 100 price points
-        if len(self.price_data) > 100:
-            self.price_data = self.price_data[-100:]
-            
+        bid, ask = price_info['bid'], price_info['ask']
+        self.ticks.append(price_info.get('time', time.time()), bid, ask)
+
+        # Indicators of the mid price advance one tick at a time
+        self._prev_tick = self._last_tick
+        mid = (bid + ask) / 2
+        self._last_tick = (mid, self._tick_sma.update(mid),
+                           self._tick_high.update(mid), self._tick_low.update(mid))
+
         return self.generate_signals()
         
     def generate_signals(self):
         """Generate trading signals based on ICT concepts"""
         signals = []
         
-        if len(self.price_data) < 20:  # Need minimum data points
+        if len(self.ticks) < 20:  # Need minimum data points
             return signals
             
-        # Convert price data to DataFrame
-        df = pd.DataFrame(self.price_data)
-        
-        # Calculate basic indicators
-        df['mid'] = (df['bid'] + df['ask']) / 2
-        df['sma20'] = df['mid'].rolling(window=20).mean()
-        df['high'] = df['mid'].rolling(window=5).max()
-        df['low'] = df['mid'].rolling(window=5).min()
-        
-        # Get latest data point
-        latest = df.iloc[-1]
-        prev = df.iloc[-2]
+        # Latest and previous (mid, sma20, high, low)
+        mid, sma20, high, low = self._last_tick
+        prev_mid, prev_sma20 = self._prev_tick[:2]
         
         # Simple ICT-based rules
         # 1. Price above/below SMA20
         # 2. Price at significant high/low
         
-        if latest['mid'] > latest['sma20'] and prev['mid'] <= prev['sma20']:
+        if mid > sma20 and prev_mid <= prev_sma20:
             signals.append({
                 'symbol': self.symbol,
                 'action': 'BUY',
                 'price': self.current_price['ask'],
                 'volume': self.calculate_position_size(self.risk_percentage, 100),
-                'stop_loss': latest['low'],
-                'take_profit': latest['high'] + (latest['high'] - latest['low'])
+                'stop_loss': low,
+                'take_profit': high + (high - low)
             })
             
-        elif latest['mid'] < latest['sma20'] and prev['mid'] >= prev['sma20']:
+        elif mid < sma20 and prev_mid >= prev_sma20:
             signals.append({
                 'symbol': self.symbol,
                 'action': 'SELL',
                 'price': self.current_price['bid'],
                 'volume': self.calculate_position_size(self.risk_percentage, 100),
-                'stop_loss': latest['high'],
-                'take_profit': latest['low'] - (latest['high'] - latest['low'])
+                'stop_loss': high,
+                'take_profit': low - (high - low)
             })
             
-        return signals 
\ No newline at end of file
+        return signals
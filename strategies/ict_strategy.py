@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, time
 from .base_strategy import BaseStrategy
+from . import patterns, swings
+from .zone_store import ZoneStore
 
 class ICTStrategy(BaseStrategy):
     def __init__(self, symbol, timeframe, risk_percentage=1.0):
@@ -65,23 +67,7 @@ class ICTStrategy(BaseStrategy):
         recent_data = data.tail(20)
         
         # Calculate swing highs and lows
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(2, len(recent_data)-2):
-            # Swing high
-            if recent_data['high'].iloc[i] > recent_data['high'].iloc[i-1] and \
-               recent_data['high'].iloc[i] > recent_data['high'].iloc[i-2] and \
-               recent_data['high'].iloc[i] > recent_data['high'].iloc[i+1] and \
-               recent_data['high'].iloc[i] > recent_data['high'].iloc[i+2]:
-                swing_highs.append((i, recent_data['high'].iloc[i]))
-            
-            # Swing low
-            if recent_data['low'].iloc[i] < recent_data['low'].iloc[i-1] and \
-               recent_data['low'].iloc[i] < recent_data['low'].iloc[i-2] and \
-               recent_data['low'].iloc[i] < recent_data['low'].iloc[i+1] and \
-               recent_data['low'].iloc[i] < recent_data['low'].iloc[i+2]:
-                swing_lows.append((i, recent_data['low'].iloc[i]))
+        swing_highs, swing_lows = swings.swing_points(recent_data, left=2, right=2)
         
         # Check for structure shift
         if len(swing_highs) >= 2 and len(swing_lows) >= 2:
@@ -95,59 +81,26 @@ class ICTStrategy(BaseStrategy):
         return None
 
     def identify_pd_array(self, data: pd.DataFrame, structure_shift: dict) -> dict:
-        """Identify Premium/Discount array (Order Blocks, FVGs, etc.)"""
+        """
+        Identify Premium/Discount array (Order Blocks, FVGs, etc.)
+        
+        Returns:
+            dict: live order_blocks and fvgs as patterns.ZONE_DTYPE records
+                of the structure shift's direction, a ZoneIndex over each for
+                price queries, and current_price; None without a structure shift
+        """
         if not structure_shift:
             return None
             
         current_price = data['close'].iloc[-1]
+        kind = structure_shift['type']
         
-        # Look for order blocks
-        order_blocks = []
-        for i in range(1, len(data)-1):
-            if structure_shift['type'] == 'bullish':
-                # Bullish order block
-                if data['close'].iloc[i] > data['open'].iloc[i] and \
-                   data['low'].iloc[i] < data['low'].iloc[i-1] and \
-                   data['low'].iloc[i] < data['low'].iloc[i+1]:
-                    order_blocks.append({
-                        'type': 'bullish',
-                        'high': data['high'].iloc[i],
-                        'low': data['low'].iloc[i]
-                    })
-            else:
-                # Bearish order block
-                if data['close'].iloc[i] < data['open'].iloc[i] and \
-                   data['high'].iloc[i] > data['high'].iloc[i-1] and \
-                   data['high'].iloc[i] > data['high'].iloc[i+1]:
-                    order_blocks.append({
-                        'type': 'bearish',
-                        'high': data['high'].iloc[i],
-                        'low': data['low'].iloc[i]
-                    })
-        
-        # Look for Fair Value Gaps
-        fvgs = []
-        for i in range(1, len(data)-1):
-            if structure_shift['type'] == 'bullish':
-                # Bullish FVG
-                if data['low'].iloc[i+1] > data['high'].iloc[i]:
-                    fvgs.append({
-                        'type': 'bullish',
-                        'high': data['high'].iloc[i],
-                        'low': data['low'].iloc[i+1]
-                    })
-            else:
-                # Bearish FVG
-                if data['high'].iloc[i+1] < data['low'].iloc[i]:
-                    fvgs.append({
-                        'type': 'bearish',
-                        'high': data['low'].iloc[i],
-                        'low': data['high'].iloc[i+1]
-                    })
-        
+        # Only zones price has not traded through yet
         return {
-            'order_blocks': order_blocks,
-            'fvgs': fvgs,
+            'order_blocks': self.live_zones(data, 'order_block', kind),
+            'fvgs': self.live_zones(data, 'fvg', kind),
+            'order_block_index': self.zone_store.index('order_block', kind),
+            'fvg_index': self.zone_store.index('fvg', kind),
             'current_price': current_price
         }
 
@@ -175,40 +128,38 @@ class ICTStrategy(BaseStrategy):
                     
                     # Check for trade setup
                     if structure_shift['type'] == 'bullish':
-                        # Look for bullish setup
-                        for ob in pd_array['order_blocks']:
-                            if ob['type'] == 'bullish' and current_price > ob['high']:
-                                stop_loss = structure_shift['low']
-                                take_profit = current_price + (current_price - stop_loss) * 3  # 1:3 RR ratio
-                                
-                                print("\nSignal: BULLISH SETUP DETECTED!")
-                                print(f"Price above bullish order block")
-                                
-                                return {
-                                    'action': 'buy',
-                                    'price': current_price,
-                                    'stop_loss': stop_loss,
-                                    'take_profit': take_profit,
-                                    'reason': 'ICT Bullish Setup'
-                                }
+                        # Look for bullish setup: any bullish order block below price
+                        if pd_array['order_block_index'].any_below(current_price):
+                            stop_loss = structure_shift['low']
+                            take_profit = current_price + (current_price - stop_loss) * 3  # 1:3 RR ratio
+                            
+                            print("\nSignal: BULLISH SETUP DETECTED!")
+                            print(f"Price above bullish order block")
+                            
+                            return {
+                                'action': 'buy',
+                                'price': current_price,
+                                'stop_loss': stop_loss,
+                                'take_profit': take_profit,
+                                'reason': 'ICT Bullish Setup'
+                            }
                     
                     else:
-                        # Look for bearish setup
-                        for ob in pd_array['order_blocks']:
-                            if ob['type'] == 'bearish' and current_price < ob['low']:
-                                stop_loss = structure_shift['high']
-                                take_profit = current_price - (stop_loss - current_price) * 3  # 1:3 RR ratio
-                                
-                                print("\nSignal: BEARISH SETUP DETECTED!")
-                                print(f"Price below bearish order block")
-                                
-                                return {
-                                    'action': 'sell',
-                                    'price': current_price,
-                                    'stop_loss': stop_loss,
-                                    'take_profit': take_profit,
-                                    'reason': 'ICT Bearish Setup'
-                                }
+                        # Look for bearish setup: any bearish order block above price
+                        if pd_array['order_block_index'].any_above(current_price):
+                            stop_loss = structure_shift['high']
+                            take_profit = current_price - (stop_loss - current_price) * 3  # 1:3 RR ratio
+                            
+                            print("\nSignal: BEARISH SETUP DETECTED!")
+                            print(f"Price below bearish order block")
+                            
+                            return {
+                                'action': 'sell',
+                                'price': current_price,
+                                'stop_loss': stop_loss,
+                                'take_profit': take_profit,
+                                'reason': 'ICT Bearish Setup'
+                            }
         
         print("\nNo trading signals detected")
         return {
@@ -219,6 +170,10 @@ class ICTStrategy(BaseStrategy):
             'reason': 'No signal'
         }
 
+    def create_zone_store(self) -> ZoneStore:
+        return ZoneStore({'order_block': patterns.swing_order_blocks,
+                          'fvg': patterns.adjacent_fair_value_gaps})
+
     def calculate_position_size(self, account_balance: float, stop_loss: float) -> float:
         """Calculate position size based on risk management rules"""
         risk_amount = account_balance * (self.risk_percentage / 100)
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from .base_strategy import BaseStrategy
+from . import patterns, swings
+from .zone_store import ZoneStore
 
 class LiquidityStrategy(BaseStrategy):
     def __init__(self, symbol, timeframe, risk_percentage=1.0):
@@ -19,32 +21,12 @@ class LiquidityStrategy(BaseStrategy):
         Returns:
             list: List of liquidity levels
         """
-        # Get previous highs and lows
-        highs = data['high'].rolling(window=20).max()
-        lows = data['low'].rolling(window=20).min()
-        
         # Identify swing highs and lows
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(2, len(data)-2):
-            # Swing high
-            if data['high'].iloc[i] > data['high'].iloc[i-1] and \
-               data['high'].iloc[i] > data['high'].iloc[i-2] and \
-               data['high'].iloc[i] > data['high'].iloc[i+1] and \
-               data['high'].iloc[i] > data['high'].iloc[i+2]:
-                swing_highs.append((i, data['high'].iloc[i]))
-            
-            # Swing low
-            if data['low'].iloc[i] < data['low'].iloc[i-1] and \
-               data['low'].iloc[i] < data['low'].iloc[i-2] and \
-               data['low'].iloc[i] < data['low'].iloc[i+1] and \
-               data['low'].iloc[i] < data['low'].iloc[i+2]:
-                swing_lows.append((i, data['low'].iloc[i]))
+        swing_highs, swing_lows = swings.swing_points(data, left=2, right=2)
         
         return swing_highs, swing_lows
 
-    def identify_order_blocks(self, data: pd.DataFrame) -> list:
+    def identify_order_blocks(self, data: pd.DataFrame) -> np.ndarray:
         """
         Identify potential order blocks
         
@@ -52,38 +34,11 @@ class LiquidityStrategy(BaseStrategy):
             data (pd.DataFrame): Historical price data
             
         Returns:
-            list: List of order blocks
+            np.ndarray: Live order blocks as patterns.ZONE_DTYPE records
         """
-        order_blocks = []
-        
-        for i in range(1, len(data)-1):
-            # Bullish order block
-            if data['close'].iloc[i] > data['open'].iloc[i] and \
-               data['low'].iloc[i] < data['low'].iloc[i-1] and \
-               data['low'].iloc[i] < data['low'].iloc[i+1]:
-                order_blocks.append({
-                    'type': 'bullish',
-                    'index': i,
-                    'high': data['high'].iloc[i],
-                    'low': data['low'].iloc[i],
-                    'close': data['close'].iloc[i]
-                })
-            
-            # Bearish order block
-            if data['close'].iloc[i] < data['open'].iloc[i] and \
-               data['high'].iloc[i] > data['high'].iloc[i-1] and \
-               data['high'].iloc[i] > data['high'].iloc[i+1]:
-                order_blocks.append({
-                    'type': 'bearish',
-                    'index': i,
-                    'high': data['high'].iloc[i],
-                    'low': data['low'].iloc[i],
-                    'close': data['close'].iloc[i]
-                })
-        
-        return order_blocks
+        return self.live_zones(data, 'order_block')
 
-    def identify_fair_value_gaps(self, data: pd.DataFrame) -> list:
+    def identify_fair_value_gaps(self, data: pd.DataFrame) -> np.ndarray:
         """
         Identify Fair Value Gaps (FVG)
         
@@ -91,30 +46,13 @@ class LiquidityStrategy(BaseStrategy):
             data (pd.DataFrame): Historical price data
             
         Returns:
-            list: List of fair value gaps
+            np.ndarray: Live fair value gaps as patterns.ZONE_DTYPE records
         """
-        fvgs = []
-        
-        for i in range(1, len(data)-1):
-            # Bullish FVG
-            if data['low'].iloc[i+1] > data['high'].iloc[i]:
-                fvgs.append({
-                    'type': 'bullish',
-                    'index': i,
-                    'high': data['high'].iloc[i],
-                    'low': data['low'].iloc[i+1]
-                })
-            
-            # Bearish FVG
-            if data['high'].iloc[i+1] < data['low'].iloc[i]:
-                fvgs.append({
-                    'type': 'bearish',
-                    'index': i,
-                    'high': data['low'].iloc[i],
-                    'low': data['high'].iloc[i+1]
-                })
-        
-        return fvgs
+        return self.live_zones(data, 'fvg')
+
+    def create_zone_store(self) -> ZoneStore:
+        return ZoneStore({'order_block': patterns.swing_order_blocks,
+                          'fvg': patterns.adjacent_fair_value_gaps})
 
     def generate_signals(self, data: pd.DataFrame) -> dict:
         """
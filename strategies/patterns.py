@@ -0,0 +1,340 @@
+import numpy as np
+import pandas as pd
+
+# Compact record for a price zone found on a chart. 'index' is the bar
+# position in the analysed frame and 'time' its timestamp (UTC, NaT when the
+# frame has no DatetimeIndex).
+ZONE_DTYPE = np.dtype([
+    ('type', 'U7'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('time', 'datetime64[ns]'),
+    ('index', 'i8')
+])
+
+# Bullish zones come before bearish ones found on the same bar, matching the
+# order of the original row-by-row loops
+_TYPE_RANK = {'bullish': 0, 'bearish': 1}
+
+
+def bar_times(data: pd.DataFrame) -> np.ndarray:
+    """Return the bar timestamps of data as UTC datetime64[ns]"""
+    index = data.index
+    if not isinstance(index, pd.DatetimeIndex):
+        return np.full(len(data), np.datetime64('NaT'), dtype='datetime64[ns]')
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.to_numpy(dtype='datetime64[ns]')
+
+
+def make_zones(types, highs, lows, positions, times) -> np.ndarray:
+    """Pack zone columns into a ZONE_DTYPE array ordered by bar"""
+    positions = np.asarray(positions, dtype=np.int64)
+    zones = np.empty(len(positions), dtype=ZONE_DTYPE)
+    zones['type'] = types
+    zones['high'] = highs
+    zones['low'] = lows
+    zones['time'] = times[positions] if len(positions) else times[:0]
+    zones['index'] = positions
+    rank = np.where(zones['type'] == 'bullish', _TYPE_RANK['bullish'], _TYPE_RANK['bearish'])
+    return zones[np.lexsort((rank, positions))]
+
+
+def fair_value_gaps(data: pd.DataFrame) -> np.ndarray:
+    """
+    Find fair value gaps by comparing each bar with the bar two before it
+
+    Args:
+        data (pd.DataFrame): OHLC data
+
+    Returns:
+        np.ndarray: ZONE_DTYPE records stamped at the third bar of each gap
+    """
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    times = bar_times(data)
+
+    bullish = np.flatnonzero(high[:-2] > low[2:]) + 2
+    bearish = np.flatnonzero(low[:-2] < high[2:]) + 2
+
+    return make_zones(
+        np.r_[np.full(len(bullish), 'bullish'), np.full(len(bearish), 'bearish')],
+        np.r_[high[bullish - 2], high[bearish]],
+        np.r_[low[bullish], low[bearish - 2]],
+        np.r_[bullish, bearish],
+        times
+    )
+
+
+def order_blocks(data: pd.DataFrame) -> np.ndarray:
+    """
+    Find order blocks: the last candle before a candle of the opposite colour
+
+    Args:
+        data (pd.DataFrame): OHLC data
+
+    Returns:
+        np.ndarray: ZONE_DTYPE records for the order block candles
+    """
+    open_ = data['open'].to_numpy(dtype=float)
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    close = data['close'].to_numpy(dtype=float)
+    times = bar_times(data)
+
+    up = close > open_
+    down = close < open_
+    # The first bar is skipped, as in the original detector
+    up[:1] = False
+    down[:1] = False
+    bullish = np.flatnonzero(up[:-1] & down[1:])
+    bearish = np.flatnonzero(down[:-1] & up[1:])
+    positions = np.r_[bullish, bearish]
+
+    return make_zones(
+        np.r_[np.full(len(bullish), 'bullish'), np.full(len(bearish), 'bearish')],
+        high[positions],
+        low[positions],
+        positions,
+        times
+    )
+
+
+def swing_order_blocks(data: pd.DataFrame) -> np.ndarray:
+    """
+    Find order blocks as swing candles: an up candle whose low is below both
+    neighbours' lows, or a down candle whose high is above both neighbours'
+
+    Args:
+        data (pd.DataFrame): OHLC data
+
+    Returns:
+        np.ndarray: ZONE_DTYPE records for the order block candles; the last
+            bar is never one, as its next bar is unknown
+    """
+    open_ = data['open'].to_numpy(dtype=float)
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    close = data['close'].to_numpy(dtype=float)
+    times = bar_times(data)
+
+    # Candidates are bars 1 .. n-2, compared with the bars either side
+    bullish = np.flatnonzero((close[1:-1] > open_[1:-1]) &
+                             (low[1:-1] < low[:-2]) & (low[1:-1] < low[2:])) + 1
+    bearish = np.flatnonzero((close[1:-1] < open_[1:-1]) &
+                             (high[1:-1] > high[:-2]) & (high[1:-1] > high[2:])) + 1
+    positions = np.r_[bullish, bearish]
+
+    return make_zones(
+        np.r_[np.full(len(bullish), 'bullish'), np.full(len(bearish), 'bearish')],
+        high[positions],
+        low[positions],
+        positions,
+        times
+    )
+
+
+def adjacent_fair_value_gaps(data: pd.DataFrame) -> np.ndarray:
+    """
+    Find fair value gaps between a bar and the next one: the next bar's low
+    above this bar's high (bullish), or its high below this bar's low (bearish)
+
+    Args:
+        data (pd.DataFrame): OHLC data
+
+    Returns:
+        np.ndarray: ZONE_DTYPE records stamped at the first bar of each gap.
+            A bullish gap's high is that bar's high and its low the next
+            bar's low, as the original detectors reported it.
+    """
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    times = bar_times(data)
+
+    bullish = np.flatnonzero(low[2:] > high[1:-1]) + 1
+    bearish = np.flatnonzero(high[2:] < low[1:-1]) + 1
+
+    return make_zones(
+        np.r_[np.full(len(bullish), 'bullish'), np.full(len(bearish), 'bearish')],
+        np.r_[high[bullish], low[bearish]],
+        np.r_[low[bullish + 1], high[bearish + 1]],
+        np.r_[bullish, bearish],
+        times
+    )
+
+
+def mitigation_blocks(data: pd.DataFrame) -> np.ndarray:
+    """
+    Find mitigation blocks: a bar that fails to make a higher high and breaks
+    the low two bars back (bearish), or fails to make a lower low and breaks
+    the high two bars back (bullish)
+
+    Args:
+        data (pd.DataFrame): OHLC data
+
+    Returns:
+        np.ndarray: ZONE_DTYPE records for bars 2 .. n-2, the range the
+            original detector scanned
+    """
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    times = bar_times(data)
+    n = len(high)
+    if n < 4:
+        return make_zones([], [], [], [], times)
+
+    candidates = slice(2, n - 1)
+    bearish = np.flatnonzero((high[candidates] < high[1:n - 2]) & (low[candidates] < low[:n - 3])) + 2
+    bullish = np.flatnonzero((low[candidates] > low[1:n - 2]) & (high[candidates] > high[:n - 3])) + 2
+    positions = np.r_[bullish, bearish]
+
+    return make_zones(
+        np.r_[np.full(len(bullish), 'bullish'), np.full(len(bearish), 'bearish')],
+        high[positions],
+        low[positions],
+        positions,
+        times
+    )
+
+
+def _first_close_beyond(close: np.ndarray, start: np.ndarray, level: np.ndarray,
+                        above: bool) -> np.ndarray:
+    """
+    For every (start, level) pair find the first bar at or after start whose
+    close is beyond level, or len(close) when there is none.
+
+    Jumps over blocks of a sparse max (or min) table, so the whole batch costs
+    O((bars + queries) * log(bars)).
+    """
+    n = len(close)
+    values = close if above else -close
+    level = level if above else -level
+    tables = [values]
+    while (1 << len(tables)) <= n:
+        prev = tables[-1]
+        step = 1 << (len(tables) - 1)
+        tables.append(np.maximum(prev[:-step], prev[step:]))
+
+    pos = start.astype(np.int64).copy()
+    for k in range(len(tables) - 1, -1, -1):
+        table = tables[k]
+        in_range = pos < len(table)
+        jump = np.zeros(len(pos), dtype=bool)
+        jump[in_range] = table[pos[in_range]] <= level[in_range]
+        pos[jump] += 1 << k
+
+    return np.minimum(pos, n)
+
+
+def breaker_blocks(data: pd.DataFrame, blocks=None) -> np.ndarray:
+    """
+    Find breaker blocks: order blocks that price later closed through
+
+    Each order block yields at most one breaker, stamped at the first bar after
+    it whose close breaks the block.
+
+    Args:
+        data (pd.DataFrame): OHLC data
+        blocks: Order blocks as ZONE_DTYPE records or dicts with 'type',
+            'high', 'low' and 'index'. Found with order_blocks() when omitted.
+
+    Returns:
+        np.ndarray: ZONE_DTYPE records with the broken block's range
+    """
+    close = data['close'].to_numpy(dtype=float)
+    times = bar_times(data)
+    if blocks is None:
+        blocks = order_blocks(data)
+    if not isinstance(blocks, np.ndarray):
+        blocks = make_zones(
+            [ob['type'] for ob in blocks],
+            [ob['high'] for ob in blocks],
+            [ob['low'] for ob in blocks],
+            [ob['index'] for ob in blocks],
+            times
+        )
+
+    bearish = blocks[blocks['type'] == 'bearish']
+    bullish = blocks[blocks['type'] == 'bullish']
+    bullish_breaks = _first_close_beyond(close, bearish['index'] + 1, bearish['high'], above=True)
+    bearish_breaks = _first_close_beyond(close, bullish['index'] + 1, bullish['low'], above=False)
+    bearish, bullish_breaks = bearish[bullish_breaks < len(close)], bullish_breaks[bullish_breaks < len(close)]
+    bullish, bearish_breaks = bullish[bearish_breaks < len(close)], bearish_breaks[bearish_breaks < len(close)]
+
+    return make_zones(
+        np.r_[np.full(len(bearish), 'bullish'), np.full(len(bullish), 'bearish')],
+        np.r_[bearish['high'], bullish['high']],
+        np.r_[bearish['low'], bullish['low']],
+        np.r_[bullish_breaks, bearish_breaks],
+        times
+    )
+
+
+def iter_zone_dicts(zones: np.ndarray, tz=None):
+    """
+    Yield zones in the legacy dict format {'type', 'high', 'low', 'time'}
+
+    Args:
+        zones (np.ndarray): ZONE_DTYPE records
+        tz: Timezone of the source index, to restore tz-aware timestamps
+    """
+    for zone in zones:
+        time = pd.Timestamp(zone['time'])
+        if tz is not None and not pd.isna(time):
+            time = time.tz_localize('UTC').tz_convert(tz)
+        yield {
+            'type': str(zone['type']),
+            'high': float(zone['high']),
+            'low': float(zone['low']),
+            'time': time
+        }
+
+
+def strong_candle_order_blocks(data: pd.DataFrame, body_window: int = 10,
+                               wick_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Flag strong candles and the order blocks they leave behind.
+
+    A strong candle has a body larger than the average of the last body_window
+    bodies and a wick against its direction smaller than wick_ratio times the
+    body. A bullish order block is a strong bull candle whose low stays above
+    the next candle's high, flagged on that next candle; bearish mirrors it.
+
+    Args:
+        data (pd.DataFrame): OHLC data
+        body_window (int): Bars in the average body size
+        wick_ratio (float): Largest wick, relative to the body, of a strong candle
+
+    Returns:
+        pd.DataFrame: body_size, upper_wick, lower_wick, is_strong_bull,
+            is_strong_bear, bull_ob and bear_ob columns on data's index
+    """
+    open_ = data['open'].to_numpy(dtype=float)
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    close = data['close'].to_numpy(dtype=float)
+
+    body_size = np.abs(close - open_)
+    upper_wick = np.maximum(high - close, high - open_)
+    lower_wick = np.minimum(close - low, open_ - low)
+    average_body = pd.Series(body_size).rolling(body_window).mean().to_numpy()
+    large_body = body_size > average_body
+
+    is_strong_bull = (close > open_) & large_body & (lower_wick < body_size * wick_ratio)
+    is_strong_bear = (close < open_) & large_body & (upper_wick < body_size * wick_ratio)
+
+    # Compare each candle with the one before it; the first candle has none
+    bull_ob = np.zeros(len(close), dtype=bool)
+    bear_ob = np.zeros(len(close), dtype=bool)
+    bull_ob[1:] = is_strong_bull[:-1] & (low[:-1] > high[1:])
+    bear_ob[1:] = is_strong_bear[:-1] & (high[:-1] < low[1:])
+
+    return pd.DataFrame({
+        'body_size': body_size,
+        'upper_wick': upper_wick,
+        'lower_wick': lower_wick,
+        'is_strong_bull': is_strong_bull,
+        'is_strong_bear': is_strong_bear,
+        'bull_ob': bull_ob,
+        'bear_ob': bear_ob
+    }, index=data.index)
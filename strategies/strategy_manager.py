@@ -1,44 +1,62 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 import pandas as pd
 from .base_strategy import BaseStrategy
+from . import features
+from .feature_cache import FeatureCache, shared_cache
+from .zone_store import ZoneStore
 
 class StrategyManager:
-    def __init__(self, strategies: List[BaseStrategy]):
+    def __init__(self, strategies: List[BaseStrategy], max_workers: int = None,
+                 cache: FeatureCache = shared_cache):
+        """
+        Args:
+            strategies (List[BaseStrategy]): Strategies to evaluate on every bar,
+                all on the same symbol and timeframe
+            max_workers (int): Strategies analyzed at once, one per strategy
+                when None; 1 analyzes them one after another
+            cache (FeatureCache): Feature cache shared with the strategies,
+                None to always recompute
+        """
         self.strategies = strategies
         self.active_strategy = None
         self.last_trade_time = None
         self.min_trade_interval = pd.Timedelta(hours=4)  # Minimum time between trades
+        self.max_workers = max_workers or len(strategies)
+        self.last_timings = {}
+        self.cache = cache
+        self.zone_store = ZoneStore()
+        self._pool = None
         
     def analyze_all(self, data: pd.DataFrame) -> Dict:
         """
         Analyze market data using all strategies and select the best opportunity.
         
+        Per-strategy analysis times of the call are left in last_timings.
+        
         Args:
             data (pd.DataFrame): Historical price data
             
         Returns:
             Dict: Best trading opportunity or None if no valid signals
         """
-        best_signal = None
-        best_score = 0
-        
         # Check if enough time has passed since last trade
         if self.last_trade_time is not None:
             time_since_last_trade = pd.Timestamp.now() - self.last_trade_time
             if time_since_last_trade < self.min_trade_interval:
                 return None
         
-        # Analyze each strategy
-        for strategy in self.strategies:
-            signal = strategy.analyze(data)
-            if signal is not None:
-                # Calculate strategy score based on multiple factors
-                score = self._calculate_strategy_score(signal, data)
-                
-                if score > best_score:
-                    best_score = score
-                    best_signal = signal
-                    self.active_strategy = strategy
+        evaluation = self.evaluate(data)
+        self.last_timings = evaluation['timings']
+        
+        best_signal = None
+        best_score = 0
+        for strategy, signal, score in evaluation['signals']:
+            if score > best_score:
+                best_score = score
+                best_signal = signal
+                self.active_strategy = strategy
         
         if best_signal is not None:
             self.last_trade_time = pd.Timestamp.now()
@@ -46,23 +64,84 @@ class StrategyManager:
         
         return None
     
-    def _calculate_strategy_score(self, signal: Dict, data: pd.DataFrame) -> float:
+    def evaluate(self, data: pd.DataFrame) -> Dict:
+        """
+        Run every strategy on data and score its signal.
+        
+        Shared features (daily bias, ATR, swings, liquidity levels, and the
+        live FVGs and order blocks from zone_store) are computed once and
+        handed to every strategy and to the scoring, and the strategies run
+        concurrently.
+        
+        Args:
+            data (pd.DataFrame): Historical price data
+            
+        Returns:
+            Dict: signals, a list of (strategy, signal, score) in strategy
+                order for the strategies that signalled; timings, analysis ms
+                per strategy name plus 'features'; and the shared features
+        """
+        start = time.perf_counter()
+        shared = self._compute_features(data)
+        timings = {'features': (time.perf_counter() - start) * 1000}
+        
+        def run(strategy):
+            start = time.perf_counter()
+            signal = strategy.analyze_with_features(data, shared)
+            return signal, (time.perf_counter() - start) * 1000
+        
+        if self.max_workers > 1 and len(self.strategies) > 1:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='strategy')
+            futures = [self._pool.submit(run, strategy) for strategy in self.strategies]
+            results = [future.result() for future in futures]
+        else:
+            results = [run(strategy) for strategy in self.strategies]
+        
+        signals = []
+        for i, (strategy, (signal, elapsed)) in enumerate(zip(self.strategies, results)):
+            name = type(strategy).__name__
+            timings[name if name not in timings else f"{name}_{i}"] = elapsed
+            if signal is not None:
+                # Calculate strategy score based on multiple factors
+                signals.append((strategy, signal, self._calculate_strategy_score(signal, data, shared)))
+        
+        return {'signals': signals, 'timings': timings, 'features': shared}
+    
+    def _compute_features(self, data: pd.DataFrame) -> Dict:
+        """Shared features of data, through the feature cache, plus the live zones"""
+        first = self.strategies[0] if self.strategies else None
+        shared = features.compute_features(
+            data, cache=self.cache,
+            symbol=first.symbol if first else '', timeframe=first.timeframe if first else ''
+        )
+        self.zone_store.update(data)
+        shared['fair_value_gaps'] = self.zone_store.live('fvg')
+        shared['order_blocks'] = self.zone_store.live('order_block')
+        return shared
+    
+    def _calculate_strategy_score(self, signal: Dict, data: pd.DataFrame, shared: Dict = None) -> float:
         """
         Calculate a score for the trading signal based on multiple factors.
         
         Args:
             signal (Dict): Trading signal from strategy
             data (pd.DataFrame): Historical price data
+            shared (Dict): features.compute_features(data), computed when None
             
         Returns:
             float: Strategy score (0-100)
         """
+        if shared is None:
+            shared = self._compute_features(data)
         score = 0
+        action = signal['action'].lower()
+        zone_type = 'bullish' if action == 'buy' else 'bearish'
         
         # Factor 1: Daily Bias Alignment (30 points)
-        daily_bias = self.active_strategy.get_daily_bias(data)
-        if (signal['action'] == 'buy' and daily_bias == 'bullish') or \
-           (signal['action'] == 'sell' and daily_bias == 'bearish'):
+        daily_bias = shared['daily_bias']
+        if (action == 'buy' and daily_bias == 'bullish') or \
+           (action == 'sell' and daily_bias == 'bearish'):
             score += 30
         
         # Factor 2: Risk-Reward Ratio (20 points)
@@ -75,34 +154,25 @@ class StrategyManager:
             score += 15
         
         # Factor 3: Liquidity Level Proximity (20 points)
-        liquidity_levels = self.active_strategy.identify_liquidity_levels(data)
+        liquidity_levels = shared['liquidity_levels']
         current_price = data['close'].iloc[-1]
         
-        if signal['action'] == 'buy':
+        if action == 'buy' and liquidity_levels['recent_lows']:
             nearest_low = min(liquidity_levels['recent_lows'], key=lambda x: abs(x - current_price))
             if abs(current_price - nearest_low) < risk:
                 score += 20
-        else:
+        elif action != 'buy' and liquidity_levels['recent_highs']:
             nearest_high = min(liquidity_levels['recent_highs'], key=lambda x: abs(x - current_price))
             if abs(current_price - nearest_high) < risk:
                 score += 20
         
         # Factor 4: Market Structure (30 points)
-        # Check if price is near a Fair Value Gap or Order Block
-        fvgs = self.active_strategy.identify_fair_value_gaps(data)
-        order_blocks = self.active_strategy.identify_order_blocks(data)
-        
-        for fvg in fvgs:
-            if fvg['type'] == signal['action']:
-                if fvg['low'] <= current_price <= fvg['high']:
-                    score += 15
-                    break
-        
-        for ob in order_blocks:
-            if ob['type'] == signal['action']:
-                if ob['low'] <= current_price <= ob['high']:
-                    score += 15
-                    break
+        # Check if price is inside a live Fair Value Gap or Order Block of the signal's direction
+        if len(self.zone_store.index('fvg', zone_type).containing_positions(current_price)):
+            score += 15
+        
+        if len(self.zone_store.index('order_block', zone_type).containing_positions(current_price)):
+            score += 15
         
         return score
     
@@ -113,4 +183,11 @@ class StrategyManager:
     def reset(self):
         """Reset the strategy manager state"""
         self.active_strategy = None
-        self.last_trade_time = None 
\ No newline at end of file
+        self.last_trade_time = None
+        self.zone_store.reset()
+        
+    def close(self):
+        """Shut down the worker threads"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
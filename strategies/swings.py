@@ -0,0 +1,125 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+def fractals(high: np.ndarray, low: np.ndarray, left: int = 2, right: int = 2) -> tuple:
+    """
+    Find fractal swing points: bars whose high (low) is strictly above
+    (below) the left bars before and the right bars after it.
+
+    Args:
+        high (np.ndarray): Bar highs
+        low (np.ndarray): Bar lows
+        left (int): Bars compared before each candidate
+        right (int): Bars compared after each candidate
+
+    Returns:
+        tuple: (swing_high, swing_low) boolean arrays; the first left and the
+            last right bars are never swings
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    n = len(high)
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    if n < left + right + 1:
+        return swing_high, swing_low
+
+    # One comparison per neighbour offset, each over all candidates at once
+    stop = n - right
+    is_high = np.ones(stop - left, dtype=bool)
+    is_low = np.ones(stop - left, dtype=bool)
+    for offset in list(range(-left, 0)) + list(range(1, right + 1)):
+        is_high &= high[left:stop] > high[left + offset:stop + offset]
+        is_low &= low[left:stop] < low[left + offset:stop + offset]
+    swing_high[left:stop] = is_high
+    swing_low[left:stop] = is_low
+    return swing_high, swing_low
+
+
+def swing_points(data: pd.DataFrame, left: int = 2, right: int = 2) -> tuple:
+    """
+    Swing highs and lows of data as (bar position, price) lists, oldest first
+
+    Returns:
+        tuple: (swing_highs, swing_lows)
+    """
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    swing_high, swing_low = fractals(high, low, left, right)
+    highs = np.flatnonzero(swing_high)
+    lows = np.flatnonzero(swing_low)
+    return (list(zip(highs.tolist(), high[highs].tolist())),
+            list(zip(lows.tolist(), low[lows].tolist())))
+
+
+class SwingTracker:
+    """
+    Fractal swing points kept up to date one bar at a time.
+
+    A bar is confirmed as a swing once right more bars have arrived, so each
+    update() checks the bar right positions back. Agrees with fractals() on
+    the same bars.
+    """
+
+    def __init__(self, left: int = 2, right: int = 2, history: int = 100):
+        """
+        Args:
+            left (int): Bars compared before each candidate
+            right (int): Bars compared after each candidate
+            history (int): Most recent swings kept per side
+        """
+        # deque rejects NumPy integers as maxlen
+        self.left = int(left)
+        self.right = int(right)
+        self.count = 0
+        self.swing_highs = deque(maxlen=int(history))
+        self.swing_lows = deque(maxlen=int(history))
+        self._highs = deque(maxlen=self.left + self.right + 1)
+        self._lows = deque(maxlen=self.left + self.right + 1)
+
+    def seed(self, high, low):
+        """
+        Load history in one vectorized pass, oldest bar first
+
+        Returns:
+            SwingTracker: self, so seeding can be chained onto the constructor
+        """
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        swing_high, swing_low = fractals(high, low, self.left, self.right)
+        for position in np.flatnonzero(swing_high).tolist():
+            self.swing_highs.append((self.count + position, float(high[position])))
+        for position in np.flatnonzero(swing_low).tolist():
+            self.swing_lows.append((self.count + position, float(low[position])))
+        # Swings near the end of history are confirmed by later updates
+        window = self._highs.maxlen
+        self._highs.extend(high[-window:].tolist())
+        self._lows.extend(low[-window:].tolist())
+        self.count += len(high)
+        return self
+
+    def update(self, high: float, low: float) -> tuple:
+        """
+        Add one bar
+
+        Returns:
+            tuple: (is_swing_high, is_swing_low) for the bar right bars back
+        """
+        self._highs.append(high)
+        self._lows.append(low)
+        self.count += 1
+        if len(self._highs) < self._highs.maxlen:
+            return False, False
+
+        position = self.count - 1 - self.right
+        centre_high = self._highs[self.left]
+        centre_low = self._lows[self.left]
+        is_high = all(centre_high > x for i, x in enumerate(self._highs) if i != self.left)
+        is_low = all(centre_low < x for i, x in enumerate(self._lows) if i != self.left)
+        if is_high:
+            self.swing_highs.append((position, centre_high))
+        if is_low:
+            self.swing_lows.append((position, centre_low))
+        return is_high, is_low
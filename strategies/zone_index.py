@@ -0,0 +1,105 @@
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+
+class _Node:
+    """Interval tree node: the intervals that span its centre, sorted both ways"""
+
+    __slots__ = ('centre', 'lows', 'by_low', 'highs', 'by_high', 'left', 'right')
+
+    def __init__(self, centre, lows, by_low, highs, by_high, left, right):
+        self.centre = centre
+        self.lows = lows
+        self.by_low = by_low
+        self.highs = highs
+        self.by_high = by_high
+        self.left = left
+        self.right = right
+
+
+class ZoneIndex:
+    """
+    Price index over a fixed set of zones.
+
+    containing() walks a centred interval tree, where every node on the path
+    answers with one binary search, so a query costs O(log^2 n + k) for k
+    matches.
+    below() and above() are single binary searches over the zones sorted by
+    their upper and lower bounds.
+    """
+
+    def __init__(self, zones: np.ndarray):
+        """
+        Args:
+            zones (np.ndarray): Records with high and low fields, e.g.
+                patterns.ZONE_DTYPE; a zone spans min(high, low) to max(high, low)
+        """
+        self.zones = zones
+        high = zones['high'].astype(float)
+        low = zones['low'].astype(float)
+        self._low = np.minimum(low, high)
+        self._high = np.maximum(low, high)
+
+        self._by_high = np.argsort(self._high, kind='stable')
+        self._sorted_high = self._high[self._by_high]
+        self._by_low = np.argsort(self._low, kind='stable')
+        self._sorted_low = self._low[self._by_low]
+        self._root = self._build(np.arange(len(zones)))
+
+    def _build(self, members: np.ndarray):
+        if len(members) == 0:
+            return None
+        bounds = np.concatenate([self._low[members], self._high[members]])
+        centre = np.median(bounds)
+        lows = self._low[members]
+        highs = self._high[members]
+        left_side = highs < centre
+        right_side = lows > centre
+        spanning = members[~left_side & ~right_side]
+
+        by_low = spanning[np.argsort(self._low[spanning], kind='stable')]
+        by_high = spanning[np.argsort(self._high[spanning], kind='stable')]
+        # Bounds as lists: bisect on a short list beats np.searchsorted per call
+        return _Node(float(centre), self._low[by_low].tolist(), by_low,
+                     self._high[by_high].tolist(), by_high,
+                     self._build(members[left_side]), self._build(members[right_side]))
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def containing_positions(self, price: float) -> np.ndarray:
+        """Positions in zones of the zones with low <= price <= high, in zone order"""
+        found = []
+        node = self._root
+        while node is not None:
+            if price < node.centre:
+                # Spanning zones reach up to the centre; keep those starting at or below price
+                found.append(node.by_low[:bisect_right(node.lows, price)])
+                node = node.left
+            else:
+                # Spanning zones reach down to the centre; keep those ending at or above price
+                found.append(node.by_high[bisect_left(node.highs, price):])
+                node = node.right if price > node.centre else None
+        return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def containing(self, price: float) -> np.ndarray:
+        """Zones with low <= price <= high, in zone order"""
+        return self.zones[self.containing_positions(price)]
+
+    def below(self, price: float) -> np.ndarray:
+        """Zones lying entirely below price (high < price), in zone order"""
+        count = np.searchsorted(self._sorted_high, price, 'left')
+        return self.zones[np.sort(self._by_high[:count])]
+
+    def above(self, price: float) -> np.ndarray:
+        """Zones lying entirely above price (low > price), in zone order"""
+        start = np.searchsorted(self._sorted_low, price, 'right')
+        return self.zones[np.sort(self._by_low[start:])]
+
+    def any_below(self, price: float) -> bool:
+        """True when some zone lies entirely below price"""
+        return len(self._sorted_high) > 0 and self._sorted_high[0] < price
+
+    def any_above(self, price: float) -> bool:
+        """True when some zone lies entirely above price"""
+        return len(self._sorted_low) > 0 and self._sorted_low[-1] > price
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from . import patterns
+from .zone_index import ZoneIndex
+
+# Detectors used unless a store is given its own: kind -> detector(data)
+DEFAULT_DETECTORS = {
+    'fvg': patterns.fair_value_gaps,
+    'order_block': patterns.order_blocks,
+    'mitigation_block': patterns.mitigation_blocks
+}
+
+# Kinds invalidated by a wick through the zone; the rest need a close through it
+WICK_KINDS = ('fvg',)
+
+
+class ZoneStore:
+    """
+    Live price zones of one symbol and timeframe, kept up to date bar by bar.
+
+    Each update() runs the detectors over the new bars only (plus a few bars
+    of context), then retires zones as price deals with them:
+
+    - mitigated: price traded through the zone, a bullish zone below its low
+      or a bearish zone above its high. FVGs go on a wick, other kinds on a
+      close. A mitigated order block turns into a breaker of the opposite
+      type, which lives on under kind 'breaker'.
+    - expired: the zone is older than max_age bars.
+
+    At most max_zones zones are kept per kind, the newest ones, so memory and
+    query cost stay bounded however long the session runs; the cap applies
+    after each update, the rest does not depend on how bars are batched. Zone 'index' is
+    the bar number since the store first saw data, not a frame position.
+    Feed closed bars: a zone found on a bar that is still forming is kept.
+    """
+
+    def __init__(self, detectors: dict = None, lookback: int = 5, max_age: int = 500,
+                 max_zones: int = 200, breakers: bool = True):
+        """
+        Args:
+            detectors (dict): kind -> detector(data) returning ZONE_DTYPE records,
+                DEFAULT_DETECTORS when None
+            lookback (int): Bars before the new ones the detectors need to see,
+                covering their look-back and look-ahead
+            max_age (int): Bars a zone lives without being mitigated
+            max_zones (int): Live zones kept per kind
+            breakers (bool): Turn mitigated order blocks into breakers
+        """
+        self.detectors = DEFAULT_DETECTORS if detectors is None else detectors
+        self.lookback = lookback
+        self.max_age = max_age
+        self.max_zones = max_zones
+        self.breakers = breakers
+        self.kinds = list(self.detectors) + (['breaker'] if breakers and 'order_block' in self.detectors else [])
+        self.reset()
+
+    def reset(self):
+        """Forget every zone and bar seen"""
+        self.bars = 0
+        self.last_time = None
+        self._zones = {kind: np.empty(0, dtype=patterns.ZONE_DTYPE) for kind in self.kinds}
+        # Highest bar number ingested per kind, so overlapping scans add nothing twice
+        self._ingested_through = {kind: -1 for kind in self.kinds}
+        self._indexes = {}
+        self.counts = {kind: {'ingested': 0, 'mitigated': 0, 'expired': 0, 'dropped': 0}
+                       for kind in self.kinds}
+
+    def update(self, data: pd.DataFrame) -> int:
+        """
+        Ingest the bars of data newer than the last update
+
+        Args:
+            data (pd.DataFrame): OHLC bars, oldest first; may be the whole
+                history each time, only bars after the last one seen are used
+
+        Returns:
+            int: Number of new bars
+        """
+        if len(data) == 0:
+            return 0
+        if self.last_time is not None and data.index[-1] < self.last_time:
+            # A different or rewound series
+            self.reset()
+        first_new = 0 if self.last_time is None else int(data.index.searchsorted(self.last_time, 'right'))
+        new_bars = len(data) - first_new
+        if new_bars <= 0:
+            return 0
+
+        start = max(0, first_new - self.lookback)
+        window = data.iloc[start:]
+        # Bar number of window position 0
+        base = self.bars - (first_new - start)
+
+        for kind, detect in self.detectors.items():
+            zones = detect(window)
+            zones = zones[zones['index'] + base > self._ingested_through[kind]]
+            if len(zones):
+                zones = zones.copy()
+                zones['index'] += base
+                self._ingested_through[kind] = int(zones['index'].max())
+                self._add(kind, zones)
+
+        self._retire(window, base, first_new - start)
+        self.bars += new_bars
+        self.last_time = data.index[-1]
+        self._indexes = {}
+        return new_bars
+
+    def _add(self, kind: str, zones: np.ndarray):
+        self.counts[kind]['ingested'] += len(zones)
+        self._zones[kind] = np.concatenate([self._zones[kind], zones])
+
+    def _retire(self, window: pd.DataFrame, base: int, first_new: int):
+        """Drop zones the new bars of window mitigated, and expired or excess zones"""
+        high = window['high'].to_numpy(dtype=float)[first_new:]
+        low = window['low'].to_numpy(dtype=float)[first_new:]
+        close = window['close'].to_numpy(dtype=float)[first_new:]
+        times = patterns.bar_times(window)[first_new:]
+        first_bar = base + first_new
+        last_bar = first_bar + len(close) - 1
+
+        # Breakers come last, so ones born in this batch are checked too
+        for kind in self.kinds:
+            zones = self._zones[kind]
+            if len(zones) == 0:
+                continue
+            bottom = np.minimum(zones['low'], zones['high'])
+            top = np.maximum(zones['low'], zones['high'])
+            down, up = (low, high) if kind in WICK_KINDS else (close, close)
+            # Only bars after the one a zone was stamped on can mitigate it
+            start = np.maximum(zones['index'] + 1 - first_bar, 0)
+            bullish = zones['type'] == 'bullish'
+            hit = np.full(len(zones), len(close))
+            hit[bullish] = patterns._first_close_beyond(down, start[bullish], bottom[bullish], above=False)
+            hit[~bullish] = patterns._first_close_beyond(up, start[~bullish], top[~bullish], above=True)
+            # A zone that reached max_age first expired before price got to it
+            mitigated = (hit < len(close)) & (first_bar + hit - zones['index'] <= self.max_age)
+
+            if kind == 'order_block' and 'breaker' in self._zones and mitigated.any():
+                broken = zones[mitigated]
+                breakers = patterns.make_zones(
+                    np.where(broken['type'] == 'bullish', 'bearish', 'bullish'),
+                    broken['high'], broken['low'], hit[mitigated], times
+                )
+                breakers['index'] += first_bar
+                self._add('breaker', breakers)
+
+            expired = ~mitigated & (last_bar - zones['index'] > self.max_age)
+            zones = zones[~mitigated & ~expired]
+            dropped = max(0, len(zones) - self.max_zones)
+            self._zones[kind] = zones[dropped:]
+            self.counts[kind]['mitigated'] += int(mitigated.sum())
+            self.counts[kind]['expired'] += int(expired.sum())
+            self.counts[kind]['dropped'] += dropped
+
+    def live(self, kind: str, zone_type: str = None) -> np.ndarray:
+        """
+        Live zones of a kind, oldest first
+
+        Args:
+            kind (str): Detector name, or 'breaker'
+            zone_type (str): 'bullish' or 'bearish', both when None
+
+        Returns:
+            np.ndarray: ZONE_DTYPE records
+        """
+        zones = self._zones[kind]
+        return zones if zone_type is None else zones[zones['type'] == zone_type]
+
+    def index(self, kind: str, zone_type: str = None) -> ZoneIndex:
+        """ZoneIndex over live(kind, zone_type), rebuilt once per update"""
+        key = (kind, zone_type)
+        if key not in self._indexes:
+            self._indexes[key] = ZoneIndex(self.live(kind, zone_type))
+        return self._indexes[key]
+
+    def __len__(self) -> int:
+        return sum(len(zones) for zones in self._zones.values())
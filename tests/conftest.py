@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubServer:
+    """
+    Local HTTP server replaying canned responses.
+
+    routes maps a path to a list of (status, body) pairs served in turn, the
+    last one repeated; a body that is not a str is sent as JSON. Every reply
+    waits delay seconds first. hits counts
+    the requests per (method, path) and clients records the client port of
+    each request, to tell reused connections from new ones.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = {}
+        self.clients = []
+        self.delay = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                with stub._lock:
+                    key = (self.command, self.path)
+                    count = stub.hits.get(key, 0)
+                    stub.hits[key] = count + 1
+                    stub.clients.append(self.client_address[1])
+                    responses = stub.routes.get(self.path, [(404, '')])
+                    status, body = responses[min(count, len(responses) - 1)]
+                time.sleep(stub.delay)
+                if not isinstance(body, str):
+                    body = json.dumps(body)
+                payload = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from trading.avatrade_connector import AvaTradeAPI
+from trading.http_client import ConcurrentGetter, HTTPTransport
+
+
+@pytest.fixture
+def getter(stub_server):
+    transport = HTTPTransport(stub_server.url, retries=0)
+    getter = ConcurrentGetter(transport, max_workers=4)
+    yield getter
+    getter.close()
+    transport.close()
+
+
+@pytest.fixture
+def api(stub_server):
+    api = AvaTradeAPI()
+    api.close()
+    api.http = HTTPTransport(stub_server.url, retries=0)
+    api.getter = ConcurrentGetter(api.http)
+    yield api
+    api.close()
+
+
+def test_get_json_many_keeps_order(stub_server, getter):
+    for n in range(6):
+        stub_server.routes[f'/q/{n}'] = [(200, {'n': n})]
+    assert getter.get_json_many([f'/q/{n}' for n in range(6)]) == [{'n': n} for n in range(6)]
+
+
+def test_paths_in_flight_are_not_requested_twice(stub_server, getter):
+    stub_server.routes['/q'] = [(200, {'bid': 1.1})]
+    stub_server.delay = 0.2
+    assert getter.get_json_many(['/q'] * 5) == [{'bid': 1.1}] * 5
+    assert stub_server.hits[('GET', '/q')] == 1
+
+
+def test_invalid_json_becomes_none(stub_server, getter):
+    stub_server.routes['/bad'] = [(200, 'not json')]
+    assert getter.get_json('/bad').result(timeout=5) is None
+
+
+def test_market_prices_nan_rows_for_failures(stub_server, api):
+    stub_server.routes['/market/prices/EURUSD'] = [(200, {'bid': 1.1, 'ask': 1.1002})]
+    stub_server.routes['/market/prices/GBPUSD'] = [(200, '<html>maintenance</html>')]
+    stub_server.routes['/market/prices/USDJPY'] = [(500, '')]
+    stub_server.routes['/market/prices/GOLD'] = [(200, ['unexpected'])]
+
+    prices = api.get_market_prices(['EURUSD', 'GBPUSD', 'USDJPY', 'GOLD', 'AUDUSD'])
+
+    assert list(prices.index) == ['EURUSD', 'GBPUSD', 'USDJPY', 'GOLD', 'AUDUSD']
+    assert prices.loc['EURUSD', 'mid'] == pytest.approx(1.1001)
+    assert prices.loc['EURUSD', 'spread'] == pytest.approx(0.0002)
+    assert np.isnan(prices.drop('EURUSD').to_numpy()).all()
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.backtest import Backtest
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, 1500))
+    return pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=len(close), freq='5min'))
+
+
+def test_results_keep_list_types(bars):
+    backtest = Backtest(ICTCombinedStrategy('EURUSD', '5'))
+    results = backtest.run(bars, mode='vectorized')
+
+    assert results['total_trades'] > 0
+    assert isinstance(results['equity_curve'], list)
+    assert len(results['equity_curve']) == len(bars)
+    assert isinstance(results['trades'], list)
+    assert results['trades'][0].keys() >= {'entry_time', 'exit_time', 'entry_price',
+                                           'exit_price', 'profit', 'type'}
+    json.dumps({'trades': results['trades'], 'equity_curve': results['equity_curve']}, default=str)
+
+    # The arrays behind them stay on the backtest
+    np.testing.assert_array_equal(backtest.equity_curve.values, results['equity_curve'])
+    assert backtest.trades.records['profit'].tolist() == [t['profit'] for t in results['trades']]
+
+
+def test_engine_modes_agree(bars):
+    # 'full' re-analyzes every prefix, so it runs on a shorter slice
+    bars = bars.iloc[:600]
+    results = {mode: Backtest(ICTCombinedStrategy('EURUSD', '5')).run(bars, mode=mode)
+               for mode in ('full', 'incremental', 'vectorized')}
+
+    assert results['full']['total_trades'] > 0
+    for mode in ('incremental', 'vectorized'):
+        assert results[mode]['trades'] == results['full']['trades']
+        assert results[mode]['equity_curve'] == results['full']['equity_curve']
@@ -0,0 +1,138 @@
+import numpy as np
+
+from trading.bar_cache import BarCache, BarRingBuffer
+
+RATES_DTYPE = np.dtype([('time', 'i8'), ('open', 'f8'), ('high', 'f8'),
+                        ('low', 'f8'), ('close', 'f8'), ('tick_volume', 'i8')])
+
+
+class FakeTerminal:
+    """copy_rates_from_pos over a growing list of one-minute bars"""
+
+    def __init__(self, bars):
+        self.bars = []
+        self.calls = []
+        self.add(bars)
+
+    def add(self, count):
+        start = len(self.bars)
+        for i in range(start, start + count):
+            self.bars.append((60 * i, i, i + 0.5, i - 0.5, i + 0.25, 1))
+
+    def update_forming(self, close):
+        time, open_, high, low, _, volume = self.bars[-1]
+        self.bars[-1] = (time, open_, max(high, close), min(low, close), close, volume + 1)
+
+    def rates(self):
+        return np.array(self.bars, dtype=RATES_DTYPE)
+
+    def __call__(self, symbol, timeframe, start_pos, count):
+        self.calls.append(count)
+        rates = self.rates()
+        end = len(rates) - start_pos
+        return rates[max(end - count, 0):end]
+
+
+def test_first_get_loads_a_full_buffer_and_later_gets_fetch_only_new_bars():
+    terminal = FakeTerminal(50)
+    cache = BarCache(terminal, capacity=20, refresh_bars=3)
+
+    bars = cache.get('EURUSD', 'M1', 10)
+    assert terminal.calls == [20]
+    np.testing.assert_array_equal(bars, terminal.rates()[-10:])
+
+    # One new bar and a changed forming bar fit in the first small request
+    terminal.update_forming(60.0)
+    terminal.add(1)
+    bars = cache.get('EURUSD', 'M1', 20)
+    assert terminal.calls[1:] == [3]
+    np.testing.assert_array_equal(bars, terminal.rates()[-20:])
+    assert bars[-2]['close'] == 60.0
+
+
+def test_refresh_grows_the_request_until_it_overlaps_the_cache():
+    terminal = FakeTerminal(50)
+    cache = BarCache(terminal, capacity=20, refresh_bars=2)
+    cache.get('EURUSD', 'M1', 20)
+
+    terminal.add(6)
+    bars = cache.get('EURUSD', 'M1', 20)
+    assert terminal.calls[1:] == [2, 4, 8]
+    np.testing.assert_array_equal(bars, terminal.rates()[-20:])
+
+
+def test_a_gap_longer_than_the_buffer_starts_over():
+    terminal = FakeTerminal(50)
+    cache = BarCache(terminal, capacity=10, refresh_bars=2)
+    cache.get('EURUSD', 'M1', 10)
+
+    terminal.add(25)
+    bars = cache.get('EURUSD', 'M1', 10)
+    assert terminal.calls[-1] == 10
+    np.testing.assert_array_equal(bars, terminal.rates()[-10:])
+
+
+def test_ring_rolls_over_many_times_and_stays_contiguous():
+    terminal = FakeTerminal(7)
+    cache = BarCache(terminal, capacity=7, refresh_bars=3)
+    cache.get('EURUSD', 'M1', 7)
+
+    for step in range(40):
+        terminal.add(1 + step % 3)
+        bars = cache.get('EURUSD', 'M1', 7)
+        np.testing.assert_array_equal(bars, terminal.rates()[-7:])
+        assert not bars.flags.writeable
+
+    buffer = cache.peek('EURUSD', 'M1')
+    assert buffer.size == 7
+    assert buffer.first_time == terminal.bars[-7][0]
+    assert buffer.last_time == terminal.bars[-1][0]
+
+
+def test_keys_are_cached_separately():
+    terminal = FakeTerminal(30)
+    cache = BarCache(terminal, capacity=10)
+    cache.get('EURUSD', 'M1', 10)
+    cache.get('EURUSD', 'M5', 10)
+    cache.get('GBPUSD', 'M1', 10)
+    assert terminal.calls == [10, 10, 10]
+    assert cache.peek('GBPUSD', 'M5') is None
+
+
+def test_failed_fetch_returns_none():
+    cache = BarCache(lambda *args: None, capacity=10)
+    assert cache.get('EURUSD', 'M1', 10) is None
+    assert cache.peek('EURUSD', 'M1') is None
+
+    terminal = FakeTerminal(30)
+    cache = BarCache(terminal, capacity=10)
+    cache.get('EURUSD', 'M1', 10)
+    cache.fetch = lambda *args: np.array([], dtype=RATES_DTYPE)
+    assert cache.get('EURUSD', 'M1', 10) is None
+
+
+def test_range_returns_only_cached_bars_inside_the_window():
+    terminal = FakeTerminal(30)
+    cache = BarCache(terminal, capacity=10)
+    # Nothing cached yet, so there is nothing to slice
+    assert cache.range('EURUSD', 'M1', 0, 60 * 30) is None
+
+    cache.get('EURUSD', 'M1', 10)
+    bars = cache.range('EURUSD', 'M1', 60 * 22, 60 * 25)
+    assert list(bars['time']) == [60 * 22, 60 * 23, 60 * 24, 60 * 25]
+    # Older than the buffer reaches
+    assert cache.range('EURUSD', 'M1', 60 * 5, 60 * 25) is None
+
+
+def test_ring_buffer_view_shares_memory_with_later_writes():
+    buffer = BarRingBuffer(4, RATES_DTYPE)
+    rates = FakeTerminal(6).rates()
+    buffer.extend(rates[:3])
+    view = buffer.view()
+    assert list(view['time']) == [0, 60, 120]
+
+    buffer.replace_last(rates[3])
+    assert view[-1]['time'] == 180
+    buffer.extend(rates)
+    assert list(buffer.view()['time']) == [120, 180, 240, 300]
+    assert list(buffer.view(2)['time']) == [240, 300]
@@ -0,0 +1,60 @@
+import pytest
+
+from trading.bar_scheduler import BarScheduler
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def scheduler_at(now, **kwargs):
+    clock = FakeClock(now)
+    return BarScheduler(clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_wait_sleeps_to_the_next_boundary_plus_offset():
+    scheduler, clock = scheduler_at(900 * 1000 + 10.5, offset_seconds=1.0)
+    assert scheduler.wait() == ['M1']
+    assert clock.sleeps == [pytest.approx(50.5)]
+    assert clock.now == pytest.approx(900 * 1000 + 61)
+
+
+def test_boundaries_report_every_timeframe_closing():
+    scheduler, clock = scheduler_at(900 * 1000 - 30, offset_seconds=1.0)
+    assert scheduler.wait() == ['M1', 'M5', 'M15']
+    # Then the M1 bars up to the next M5 close
+    closes = [scheduler.wait() for _ in range(5)]
+    assert closes == [['M1']] * 4 + [['M1', 'M5']]
+    assert clock.sleeps[1:] == [pytest.approx(60)] * 5
+
+
+def test_early_wake_up_still_targets_the_bar_that_closed():
+    # Woken slightly before boundary + offset: the same bar, not the next one
+    scheduler, clock = scheduler_at(600 + 0.8, offset_seconds=1.0)
+    wake_time, closing = scheduler.next_close()
+    assert wake_time == pytest.approx(601)
+    assert closing == ['M1', 'M5']
+
+
+def test_unknown_timeframe_rejected():
+    with pytest.raises(ValueError):
+        BarScheduler(('M1', 'H4'))
+
+
+def test_is_new_bar_per_symbol_and_timeframe():
+    scheduler = BarScheduler()
+    assert scheduler.is_new_bar('EURUSD', 'M1', 60)
+    assert not scheduler.is_new_bar('EURUSD', 'M1', 60)
+    assert scheduler.is_new_bar('EURUSD', 'M5', 60)
+    assert scheduler.is_new_bar('GBPUSD', 'M1', 60)
+    assert scheduler.is_new_bar('EURUSD', 'M1', 120)
+    assert not scheduler.is_new_bar('EURUSD', 'M1', 120)
@@ -0,0 +1,155 @@
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+from backtesting.event_backtest import BAR_CLOSE, TICK, EventBacktest, bar_path_ticks, read_tick_file
+
+
+class ScriptedStrategy:
+    """Signals at fixed bar times and trades one unit"""
+
+    def __init__(self, signals=None, every_bar=None):
+        self.signals = signals or {}
+        self.every_bar = every_bar
+
+    def reset_incremental_state(self):
+        self.bars = []
+
+    def on_bar(self, timestamp, open_price, high, low, close):
+        self.bars.append(timestamp)
+        levels = self.every_bar or self.signals.get(timestamp)
+        if levels is None:
+            return None
+        action, stop_loss, take_profit = levels
+        return {'action': action, 'stop_loss': stop_loss, 'take_profit': take_profit,
+                'stop_loss_dollars': abs(close - stop_loss), 'time': timestamp}
+
+    def calculate_position_size(self, balance, stop_loss_dollars):
+        return 1.0
+
+
+def make_bars(rows, start='2024-01-01'):
+    return pd.DataFrame(rows, columns=['open', 'high', 'low', 'close'],
+                        index=pd.date_range(start, periods=len(rows), freq='1min'))
+
+
+class LoggedBacktest(EventBacktest):
+    def run(self, *args, **kwargs):
+        self.events = []
+        return super().run(*args, **kwargs)
+
+    def _check_exits(self, symbol, time_ns, price):
+        self.events.append((time_ns, TICK, symbol))
+        super()._check_exits(symbol, time_ns, price)
+
+    def _on_bar_close(self, symbol, time_ns, bar, last_prices):
+        self.events.append((time_ns, BAR_CLOSE, symbol))
+        super()._on_bar_close(symbol, time_ns, bar, last_prices)
+
+
+def test_bar_path_ticks_visit_the_nearer_extreme_first():
+    bars = make_bars([(1.0, 1.2, 0.9, 1.1), (1.1, 1.3, 1.0, 1.05)])
+    start = bars.index[0].value
+    step = pd.Timedelta('15s').value
+    assert list(bar_path_ticks(bars, pd.Timedelta('1min'))) == [
+        (start, 1.0), (start + step, 0.9), (start + 2 * step, 1.2), (start + 3 * step, 1.1),
+        (start + 4 * step, 1.1), (start + 5 * step, 1.3), (start + 6 * step, 1.0), (start + 7 * step, 1.05)
+    ]
+
+
+def test_bar_closes_come_before_ticks_at_the_same_time():
+    data = {'A': make_bars([(1.0, 1.01, 0.99, 1.0), (0.99, 0.995, 0.98, 0.985)]),
+            'B': make_bars([(2.0, 2.01, 1.99, 2.0), (2.0, 2.01, 1.99, 2.0)])}
+    bars = data['A']
+    strategies = {'A': ScriptedStrategy({bars.index[0]: ('buy', 0.995, 1.05)}),
+                  'B': ScriptedStrategy()}
+    backtest = LoggedBacktest(strategies)
+    results = backtest.run(data)
+
+    assert backtest.events == sorted(backtest.events, key=lambda event: event[:2])
+    second_open = bars.index[1].value
+    at_second_open = [(kind, symbol) for time_ns, kind, symbol in backtest.events if time_ns == second_open]
+    assert at_second_open == [(BAR_CLOSE, 'A'), (BAR_CLOSE, 'B'), (TICK, 'A'), (TICK, 'B')]
+
+    # The position opened at the first close is stopped by the gap at the next open
+    [trade] = results['trades']
+    assert trade['entry_time'] == bars.index[1]
+    assert trade['exit_time'] == bars.index[1]
+    assert trade['type'] == 'sl'
+    assert trade['exit_price'] == 0.995
+    assert trade['profit'] == pytest.approx(-0.005)
+
+
+@pytest.mark.parametrize('second_bar, exit_type, exit_price', [
+    ((1.0, 1.02, 0.98, 1.015), 'sl', 0.99),  # Bullish: low first
+    ((1.0, 1.02, 0.98, 0.985), 'tp', 1.01),  # Bearish: high first
+])
+def test_stops_and_targets_fill_at_the_tick_that_hits_them(second_bar, exit_type, exit_price):
+    bars = make_bars([(1.0, 1.001, 0.999, 1.0), second_bar, (1.0, 1.001, 0.999, 1.0)])
+    backtest = EventBacktest({'A': ScriptedStrategy({bars.index[0]: ('buy', 0.99, 1.01)})})
+    results = backtest.run({'A': bars})
+
+    [trade] = results['trades']
+    assert trade['type'] == exit_type
+    assert trade['exit_price'] == exit_price
+    assert trade['exit_time'] == bars.index[1] + pd.Timedelta('15s')
+    assert results['final_balance'] == pytest.approx(10000 + exit_price - 1.0)
+
+
+def test_read_tick_file_streams_chunks(tmp_path, monkeypatch):
+    path = tmp_path / 'ticks.csv'
+    times = pd.date_range('2024-01-01 00:01:05', periods=5, freq='10s')
+    prices = [1.0, 1.004, 1.012, 1.0, 0.98]
+    pd.DataFrame({'time': times.strftime('%Y-%m-%d %H:%M:%S'), 'bid': prices, 'ask': 0}).to_csv(path, index=False)
+
+    chunks = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        for chunk in read_csv(*args, **kwargs):
+            chunks.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(pd, 'read_csv', counting_read_csv)
+    stream = read_tick_file(str(path), chunksize=2)
+    assert next(stream) == (times[0].value, 1.0)
+    assert chunks == [2]
+    assert list(stream) == list(zip([t.value for t in times[1:]], prices[1:]))
+    assert chunks == [2, 2, 1]
+
+    # Replayed ticks take the place of the bar path; the 1.012 tick hits the target
+    bars = make_bars([(1.0, 1.001, 0.999, 1.0), (1.0, 1.02, 0.97, 1.0)])
+    backtest = EventBacktest({'A': ScriptedStrategy({bars.index[0]: ('buy', 0.99, 1.01)})})
+    results = backtest.run({'A': bars}, ticks={'A': read_tick_file(str(path), chunksize=2)})
+    [trade] = results['trades']
+    assert trade['type'] == 'tp'
+    assert trade['exit_time'] == times[2]
+
+
+def test_one_position_per_symbol_against_one_balance():
+    rows = [(1.0, 1.001, 0.999, 1.0)] * 4
+    data = {'A': make_bars(rows), 'B': make_bars(rows), 'C': make_bars(rows, start='2024-01-01 00:00:30')}
+    strategies = {symbol: ScriptedStrategy(every_bar=('buy', 0.5, 1.5)) for symbol in data}
+    backtest = EventBacktest(strategies)
+    results = backtest.run(data)
+
+    assert results['trades'] == []
+    assert sorted(p['symbol'] for p in backtest.positions) == ['A', 'B', 'C']
+    assert all(p['entry_time'] == data[p['symbol']].index[1] for p in backtest.positions)
+    # A and B close together, C half a bar later
+    assert len(backtest.equity_times) == 8
+    assert len(results['equity_curve']) == 8
+
+
+def test_plot_results_draws_equity_at_bar_close_times(monkeypatch):
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    data = {'A': make_bars([(1.0, 1.001, 0.999, 1.0)] * 3),
+            'B': make_bars([(2.0, 2.001, 1.999, 2.0)] * 3, start='2024-01-01 00:00:30')}
+    backtest = EventBacktest({symbol: ScriptedStrategy() for symbol in data})
+    backtest.run(data)
+    try:
+        backtest.plot_results(data)
+        equity_line = plt.gcf().axes[1].lines[0]
+        assert len(equity_line.get_xdata()) == len(backtest.equity_times) == 6
+    finally:
+        plt.close('all')
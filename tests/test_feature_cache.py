@@ -0,0 +1,154 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.feature_cache import FeatureCache, bar_key
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+
+
+@pytest.fixture
+def bars():
+    close = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 0.0005, 50))
+    return pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=len(close), freq='5min'))
+
+
+class Counter:
+    def __init__(self, value='value'):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_hits_and_misses(bars):
+    cache = FeatureCache()
+    compute = Counter()
+    assert cache.get('EURUSD', 'M5', 'atr', bars, compute, 14) == 'value'
+    assert cache.get('EURUSD', 'M5', 'atr', bars, compute, 14) == 'value'
+    assert compute.calls == 1
+
+    # Each part of the key is its own entry
+    cache.get('EURUSD', 'M5', 'atr', bars, compute, 20)
+    cache.get('GBPUSD', 'M5', 'atr', bars, compute, 14)
+    cache.get('EURUSD', 'M15', 'atr', bars, compute, 14)
+    cache.get('EURUSD', 'M5', 'volatility', bars, compute, 14)
+    assert compute.calls == 5
+    assert cache.stats() == {'hits': 1, 'misses': 5, 'hit_rate': 1 / 6, 'size': 5}
+
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0}
+
+
+def test_least_recently_used_entry_is_evicted(bars):
+    cache = FeatureCache(maxsize=2)
+    compute = Counter()
+    cache.get('EURUSD', 'M5', 'a', bars, compute)
+    cache.get('EURUSD', 'M5', 'b', bars, compute)
+    cache.get('EURUSD', 'M5', 'a', bars, compute)  # b is now the oldest
+    cache.get('EURUSD', 'M5', 'c', bars, compute)
+    assert len(cache) == 2
+    assert compute.calls == 3
+
+    cache.get('EURUSD', 'M5', 'a', bars, compute)
+    cache.get('EURUSD', 'M5', 'c', bars, compute)
+    assert compute.calls == 3
+    cache.get('EURUSD', 'M5', 'b', bars, compute)
+    assert compute.calls == 4
+
+
+def test_bar_key_changes_with_the_last_bar(bars):
+    cache = FeatureCache()
+    compute = Counter()
+    cache.get('EURUSD', 'M5', 'atr', bars, compute)
+    cache.get('EURUSD', 'M5', 'atr', bars.copy(), compute)
+    assert compute.calls == 1
+
+    # The forming bar ticks: same time, new close
+    forming = bars.copy()
+    forming.iloc[-1, forming.columns.get_loc('close')] += 0.0001
+    assert bar_key(forming) != bar_key(bars)
+    cache.get('EURUSD', 'M5', 'atr', forming, compute)
+    assert compute.calls == 2
+
+    # A new bar, and a window that slid by one bar
+    cache.get('EURUSD', 'M5', 'atr', bars.iloc[:-1], compute)
+    cache.get('EURUSD', 'M5', 'atr', bars.iloc[1:], compute)
+    assert compute.calls == 4
+    assert bar_key(bars.iloc[:0]) == (0,)
+
+
+def test_concurrent_callers_compute_a_missing_key_once(bars):
+    cache = FeatureCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(threading.current_thread().name)
+        started.set()
+        release.wait(5)
+        return 'slow value'
+
+    results = {}
+
+    def get(name):
+        results[name] = cache.get('EURUSD', 'M5', 'swings', bars, compute)
+
+    first = threading.Thread(target=get, args=('first',), name='first')
+    second = threading.Thread(target=get, args=('second',), name='second')
+    first.start()
+    assert started.wait(5)
+    second.start()
+    deadline = time.monotonic() + 5
+    while cache.hits == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    # The second caller found the pending entry and is waiting on it
+    assert cache.hits == 1
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == ['first']
+    assert results == {'first': 'slow value', 'second': 'slow value'}
+
+
+def test_failed_compute_is_not_cached(bars):
+    cache = FeatureCache()
+
+    def broken():
+        raise ValueError("not enough bars")
+
+    with pytest.raises(ValueError):
+        cache.get('EURUSD', 'M5', 'atr', bars, broken)
+    assert len(cache) == 0
+
+    compute = Counter(1.5)
+    assert cache.get('EURUSD', 'M5', 'atr', bars, compute) == 1.5
+    assert compute.calls == 1
+
+
+def test_strategy_cached_feature(bars):
+    strategy = ICTCombinedStrategy('EURUSD', '5')
+    strategy.feature_cache = FeatureCache()
+    compute = Counter()
+    strategy.cached_feature('custom', bars, compute, 3)
+    strategy.cached_feature('custom', bars, compute, 3)
+    assert compute.calls == 1
+    # Keys carry the strategy's symbol, so another symbol doesn't share the value
+    other = ICTCombinedStrategy('GBPUSD', '5')
+    other.feature_cache = strategy.feature_cache
+    other.cached_feature('custom', bars, compute, 3)
+    assert compute.calls == 2
+    # Built-in helpers go through the same cache
+    assert strategy.calculate_atr(bars) == strategy.calculate_atr(bars)
+    assert strategy.feature_cache.stats()['hits'] == 2
+
+    strategy.feature_cache = None
+    strategy.cached_feature('custom', bars, compute, 3)
+    strategy.cached_feature('custom', bars, compute, 3)
+    assert compute.calls == 4
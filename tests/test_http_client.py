@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from trading.http_client import AsyncHTTPTransport, HTTPTransport
+
+
+def test_connection_is_kept_alive(stub_server):
+    stub_server.routes['/price'] = [(200, {'bid': 1.1})]
+    with HTTPTransport(stub_server.url) as transport:
+        for _ in range(5):
+            assert transport.get('price').json() == {'bid': 1.1}
+    assert len(set(stub_server.clients)) == 1
+
+
+def test_get_retried_with_backoff(stub_server):
+    stub_server.routes['/price'] = [(503, ''), (503, ''), (200, {'bid': 1.1})]
+    with HTTPTransport(stub_server.url, retries=3, backoff_factor=0.1) as transport:
+        started = time.monotonic()
+        response = transport.get('/price')
+        elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert stub_server.hits[('GET', '/price')] == 3
+    # The first retry is immediate, the second sleeps 0.1 * 2 ** 1 s
+    assert 0.2 <= elapsed < 1
+
+
+def test_retries_give_up_with_last_response(stub_server):
+    stub_server.routes['/price'] = [(502, '')]
+    with HTTPTransport(stub_server.url, retries=2, backoff_factor=0) as transport:
+        assert transport.get('/price').status_code == 502
+    assert stub_server.hits[('GET', '/price')] == 3
+
+
+def test_post_not_retried_after_reaching_server(stub_server):
+    stub_server.routes['/orders'] = [(503, ''), (200, {'id': 1})]
+    with HTTPTransport(stub_server.url, retries=3, backoff_factor=0) as transport:
+        assert transport.post('/orders', json={'side': 'buy'}).status_code == 503
+    assert stub_server.hits[('POST', '/orders')] == 1
+
+
+def test_connection_errors_raise_after_retries(stub_server):
+    url = stub_server.url
+    stub_server.close()
+    with HTTPTransport(url, retries=1, backoff_factor=0, timeout=1) as transport:
+        with pytest.raises(requests.ConnectionError):
+            transport.get('/price')
+
+
+def test_async_requests_share_the_pool(stub_server):
+    stub_server.routes['/price'] = [(200, {'bid': 1.1})]
+    with HTTPTransport(stub_server.url, pool_maxsize=4) as transport:
+        client = AsyncHTTPTransport(transport)
+
+        async def fetch_all():
+            return await asyncio.gather(*(client.get('/price') for _ in range(12)))
+
+        try:
+            responses = asyncio.run(asyncio.wait_for(fetch_all(), timeout=5))
+        finally:
+            client.close()
+    assert [r.json() for r in responses] == [{'bid': 1.1}] * 12
+    # Connections are reused, at most one per pool slot
+    assert len(set(stub_server.clients)) <= 4
+
+
+def test_async_json_failures_become_none(stub_server):
+    stub_server.routes['/good'] = [(200, {'bid': 1.1})]
+    stub_server.routes['/bad'] = [(200, '<html>maintenance</html>')]
+    stub_server.routes['/missing'] = [(404, '')]
+    with HTTPTransport(stub_server.url, retries=0) as transport:
+        client = AsyncHTTPTransport(transport)
+        try:
+            result = asyncio.run(client.get_json_many(['/good', '/bad', '/missing']))
+        finally:
+            client.close()
+    assert result == [{'bid': 1.1}, None, None]
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+
+
+def test_tick_signals_match_pandas_rules():
+    rng = np.random.default_rng(4)
+    bid = 1900 + np.cumsum(rng.normal(0, 0.3, 3000))
+    ask = bid + 0.3
+    strategy = ICTCombinedStrategy('XAUUSD', '1')
+    actions = [[s['action'] for s in strategy.update({'bid': b, 'ask': a, 'time': n})]
+               for n, (b, a) in enumerate(zip(bid, ask))]
+
+    # The rules as the strategy stated them on a DataFrame of every tick
+    mid = pd.Series((bid + ask) / 2)
+    sma20 = mid.rolling(20).mean()
+    buy = (mid > sma20) & (mid.shift() <= sma20.shift())
+    sell = (mid < sma20) & (mid.shift() >= sma20.shift())
+    expected = [['BUY'] if b else ['SELL'] if s else [] for b, s in zip(buy, sell)]
+    expected[:20] = [[]] * 20
+
+    assert actions == expected
+    assert any(actions)
+
+
+def random_bars(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+    return pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+@pytest.mark.parametrize('seed', [0, 2])
+def test_analyze_batch_matches_analyze_on_growing_prefixes(seed):
+    bars = random_bars(600, seed)
+    growing = ICTCombinedStrategy('EURUSD', '5')
+    expected = [growing.analyze(bars.iloc[:i + 1]) for i in range(len(bars))]
+    batch = ICTCombinedStrategy('EURUSD', '5')
+    signals = batch.analyze_batch(bars)
+
+    assert list(signals.index) == list(bars.index)
+    assert list(signals) == expected
+    assert sum(signal is not None for signal in expected) > 0
+    # Daily trade counting ends in the same state
+    assert (batch.trades_today, batch.last_trade_time) == (growing.trades_today, growing.last_trade_time)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+
+from indicators.base import Indicator
+from indicators.extrema import RollingMax, RollingMin, _RollingExtreme
+from indicators.momentum import RSI
+from indicators.trend import EMA, SMA
+from indicators.volatility import ATR, ReturnVolatility
+
+
+def random_walk(n=2000, start=1.1, scale=0.0005, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.Series(start + np.cumsum(rng.normal(0, scale, n)))
+
+
+def ohlc(n=2000, seed=7):
+    rng = np.random.default_rng(seed)
+    close = random_walk(n, seed=seed)
+    spread = np.abs(rng.normal(0, 0.0003, n))
+    return pd.DataFrame({
+        'high': close + spread,
+        'low': close - spread,
+        'close': close
+    })
+
+
+def stream(indicator: Indicator, *columns) -> np.ndarray:
+    return np.array([indicator.update(*bar) for bar in zip(*columns)])
+
+
+def with_gaps(series: pd.Series, seed=3) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    gapped = series.copy()
+    gapped[rng.random(len(series)) < 0.1] = np.nan
+    gapped.iloc[:3] = np.nan
+    return gapped
+
+
+@pytest.mark.parametrize('span', [2, 12, 50])
+def test_ema_matches_pandas(span):
+    close = random_walk()
+    expected = close.ewm(span=span, adjust=False).mean()
+    np.testing.assert_allclose(stream(EMA(span), close), expected, rtol=0, atol=1e-12)
+
+
+def test_ema_matches_pandas_with_nans():
+    close = with_gaps(random_walk())
+    expected = close.ewm(alpha=0.1, adjust=False, min_periods=5).mean()
+    np.testing.assert_allclose(stream(EMA(alpha=0.1, min_periods=5), close), expected,
+                               rtol=0, atol=1e-12)
+
+
+def test_ema_needs_span_or_alpha():
+    with pytest.raises(ValueError):
+        EMA()
+
+
+@pytest.mark.parametrize('window, min_periods', [(20, None), (5, 2)])
+def test_sma_matches_pandas(window, min_periods):
+    close = with_gaps(random_walk())
+    expected = close.rolling(window, min_periods=min_periods).mean()
+    np.testing.assert_allclose(stream(SMA(window, min_periods), close), expected,
+                               rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('window', [5, 14])
+def test_rsi_matches_ta(window):
+    close = random_walk()
+    expected = RSIIndicator(close, window).rsi()
+    np.testing.assert_allclose(stream(RSI(window), close), expected, rtol=0, atol=1e-9)
+
+
+def test_atr_matches_rolling_true_range():
+    bars = ohlc()
+    previous = bars['close'].shift()
+    true_range = pd.concat([bars['high'] - bars['low'],
+                            (bars['high'] - previous).abs(),
+                            (bars['low'] - previous).abs()], axis=1).max(axis=1)
+    expected = true_range.rolling(14).mean()
+    result = stream(ATR(14), bars['high'], bars['low'], bars['close'])
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('indicator, method', [(RollingMax, 'max'), (RollingMin, 'min')])
+def test_rolling_extremes_match_pandas(indicator, method):
+    close = with_gaps(random_walk())
+    expected = getattr(close.rolling(10, min_periods=3), method)()
+    np.testing.assert_array_equal(stream(indicator(10, 3), close), expected)
+
+
+def test_rolling_extreme_is_abstract():
+    with pytest.raises(TypeError):
+        _RollingExtreme(5)
+
+
+def test_return_volatility_matches_pandas():
+    close = random_walk()
+    returns = close.pct_change()
+    expanding = returns.expanding(min_periods=2).std() * np.sqrt(252)
+    rolling = returns.rolling(30).std() * np.sqrt(252)
+    np.testing.assert_allclose(stream(ReturnVolatility(), close), expanding, rtol=1e-12)
+    np.testing.assert_allclose(stream(ReturnVolatility(30), close), rolling, rtol=1e-7)
+
+
+def test_seed_then_update_matches_streaming():
+    close = random_walk()
+    seeded = EMA(20).seed(close[:1500])
+    streamed = EMA(20)
+    stream(streamed, close[:1500])
+    assert seeded.value == streamed.value
+    assert seeded.update(close.iloc[1500]) == streamed.update(close.iloc[1500])
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.ledger import EquityBuffer, TradeLedger, max_drawdown, sharpe_ratio, trade_metrics
+
+
+def legacy_max_drawdown(equity_curve, initial_balance):
+    peak = initial_balance
+    drawdown = 0
+    for equity in equity_curve:
+        if equity > peak:
+            peak = equity
+        drawdown = max(drawdown, (peak - equity) / peak)
+    return drawdown
+
+
+def legacy_sharpe_ratio(equity_curve):
+    returns = pd.Series(equity_curve).pct_change().dropna()
+    return np.sqrt(252) * (returns.mean() - 0.02) / returns.std() if len(returns) > 0 else 0
+
+
+def legacy_trade_metrics(profits):
+    winning = [p for p in profits if p > 0]
+    losing = [p for p in profits if p <= 0]
+    total_loss = abs(sum(losing))
+    return {
+        'total_trades': len(profits),
+        'winning_trades': len(winning),
+        'losing_trades': len(losing),
+        'win_rate': len(winning) / len(profits) * 100,
+        'profit_factor': sum(winning) / total_loss if total_loss > 0 else float('inf')
+    }
+
+
+@pytest.fixture
+def equity():
+    rng = np.random.default_rng(1)
+    curve = 10000 + np.cumsum(rng.normal(0, 50, 500))
+    curve[200:260] -= np.linspace(0, 1500, 60)  # A deep dip
+    return curve
+
+
+def test_max_drawdown_matches_running_peak_loop(equity):
+    assert max_drawdown(equity, 10000) == pytest.approx(legacy_max_drawdown(equity, 10000), rel=1e-12)
+    # The initial balance counts as a peak even when equity never gets back to it
+    falling = np.array([9900.0, 9800.0, 9850.0])
+    assert max_drawdown(falling, 10000) == pytest.approx(0.02)
+    assert max_drawdown(falling, 10000) == pytest.approx(legacy_max_drawdown(falling, 10000))
+    assert max_drawdown(np.array([]), 10000) == 0.0
+
+
+def test_sharpe_ratio_matches_pandas_formula(equity):
+    assert sharpe_ratio(equity) == pytest.approx(legacy_sharpe_ratio(equity), rel=1e-9)
+    assert sharpe_ratio(equity[:1]) == legacy_sharpe_ratio(equity[:1]) == 0
+    assert np.isnan(sharpe_ratio(equity[:2])) and np.isnan(legacy_sharpe_ratio(equity[:2]))
+
+
+@pytest.mark.parametrize('profits', [
+    [120.0, -80.0, 0.0, 45.5, -10.0, 300.0],
+    [10.0, 20.0],
+    [-5.0, 0.0],
+])
+def test_trade_metrics_match_list_formulas(profits):
+    metrics = trade_metrics(np.array(profits))
+    expected = legacy_trade_metrics(profits)
+    assert metrics.keys() == expected.keys()
+    for key, value in expected.items():
+        assert metrics[key] == pytest.approx(value)
+
+
+def test_trade_ledger_grows_past_its_capacity():
+    ledger = TradeLedger(capacity=2)
+    times = pd.date_range('2024-01-01', periods=6, freq='h')
+    for i in range(5):
+        ledger.append(times[i], times[i + 1], 1.0 + i, 1.5 + i, profit=float(i), exit_type='tp',
+                      action='buy', symbol='EURUSD', size=2.0)
+
+    assert len(ledger) == 5
+    assert ledger.records['profit'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert ledger[-1] == {'entry_time': times[4], 'exit_time': times[5], 'entry_price': 5.0,
+                          'exit_price': 5.5, 'profit': 4.0, 'type': 'tp',
+                          'symbol': 'EURUSD', 'action': 'buy'}
+    assert [trade['entry_time'] for trade in ledger] == list(times[:5])
+    with pytest.raises(IndexError):
+        ledger[5]
+
+
+def test_trade_ledger_round_trips_timezones():
+    times = pd.date_range('2024-03-30 22:00', periods=4, freq='h', tz='Europe/London')
+    ledger = TradeLedger(capacity=1)
+    ledger.append(times[0], times[1], 1.0, 1.1, profit=10.0, exit_type='tp')
+    ledger.append(times[2], times[3], 1.1, 1.0, profit=-5.0, exit_type='sl')
+    ledger.append(times[3], None, 1.0, 1.0, profit=0.0, exit_type='sl')
+
+    assert str(ledger.tz) == 'Europe/London'
+    assert [trade['entry_time'] for trade in ledger] == [times[0], times[2], times[3]]
+    assert ledger[0]['exit_time'] == times[1]
+    assert str(ledger[0]['exit_time'].tz) == 'Europe/London'
+    assert ledger[2]['exit_time'] is None
+    # Blank symbol and action stay out of the dicts, as in the old lists
+    assert 'symbol' not in ledger[0] and 'action' not in ledger[0]
+
+    frame = ledger.to_frame()
+    assert frame['entry_time'].tolist() == [times[0], times[2], times[3]]
+    assert ledger.daily_pnl(by='entry_time').to_dict() == {times[0].date(): 10.0, times[2].date(): -5.0}
+
+    naive = TradeLedger()
+    naive.append(pd.Timestamp('2024-01-01 10:00'), pd.Timestamp('2024-01-01 11:00'), 1.0, 1.1,
+                 profit=1.0, exit_type='tp')
+    assert naive[0]['entry_time'] == pd.Timestamp('2024-01-01 10:00')
+    assert naive[0]['entry_time'].tz is None
+
+
+def test_equity_buffer_grows_past_its_capacity():
+    buffer = EquityBuffer(capacity=1)
+    for value in range(10):
+        buffer.append(float(value))
+    buffer[-1] = 99.0
+
+    assert len(buffer) == 10
+    assert buffer.values.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 99.0]
+    assert list(buffer) == buffer.values.tolist()
+    assert EquityBuffer(capacity=0).values.tolist() == []
@@ -0,0 +1,65 @@
+import csv
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.optimizer import Optimizer
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, 1500))
+    return pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=len(close), freq='5min'))
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_results_file_keeps_one_header_across_searches(bars, tmp_path):
+    path = tmp_path / 'results.csv'
+    with Optimizer(bars, 'EURUSD', '5', results_path=str(path), max_workers=2) as optimizer:
+        optimizer.grid_search({'min_risk_reward': [1.5, 2.0]})
+        optimizer.grid_search({'min_risk_reward': [3.0]})
+
+    rows = read_rows(path)
+    assert sorted(float(row['min_risk_reward']) for row in rows) == [1.5, 2.0, 3.0]
+    assert all(row['phase'] == 'search' for row in rows)
+    assert all(float(row['final_balance']) > 0 for row in rows)
+
+
+def test_results_file_rejects_other_parameters(bars, tmp_path):
+    path = tmp_path / 'results.csv'
+    with Optimizer(bars, 'EURUSD', '5', results_path=str(path), max_workers=2) as optimizer:
+        optimizer.grid_search({'min_risk_reward': [2.0]})
+        with pytest.raises(ValueError):
+            optimizer.grid_search({'max_daily_trades': [4]})
+
+    assert len(read_rows(path)) == 1
+
+
+def test_failed_backtests_are_left_out(bars):
+    # A string volatility cap makes the strategy raise a TypeError
+    with Optimizer(bars, 'EURUSD', '5', max_workers=2) as optimizer:
+        mixed = optimizer.grid_search({'max_volatility': ['high', 0.30]})
+        failed = optimizer.grid_search({'max_volatility': ['high']})
+
+    assert list(mixed['max_volatility']) == [0.30]
+    assert failed.empty
+    assert {'phase', 'fold', 'max_volatility', 'total_return', 'sharpe_ratio'} <= set(failed.columns)
+
+
+def test_walk_forward_skips_folds_without_training_results(bars):
+    with Optimizer(bars, 'EURUSD', '5', max_workers=2) as optimizer:
+        mixed = optimizer.walk_forward({'max_volatility': ['high', 0.30]}, train_bars=600, test_bars=300)
+        failed = optimizer.walk_forward({'max_volatility': ['high']}, train_bars=600, test_bars=300)
+
+    assert list(mixed['fold']) == [0, 1, 2]
+    assert list(mixed['max_volatility']) == [0.30] * 3
+    assert (mixed['phase'] == 'test').all()
+    assert failed.empty
+    assert 'fold' in failed.columns
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('MetaTrader5')
+from trading import order_executor
+from trading.order_executor import OrderExecutor
+
+
+class StubRegistry:
+    """Fixed properties and tick instead of a terminal"""
+
+    def __init__(self, **properties):
+        self._properties = {'point': 0.00001, 'digits': 5, 'volume_min': 0.01,
+                            'volume_max': 50.0, 'volume_step': 0.01, **properties}
+
+    def properties(self, symbol):
+        return self._properties
+
+    def tick(self, symbol, max_age=None):
+        return SimpleNamespace(bid=1.1, ask=1.1002)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    requests = []
+
+    def order_send(request):
+        requests.append(request)
+        return SimpleNamespace(retcode=order_executor.mt5.TRADE_RETCODE_DONE, order=len(requests),
+                               comment='done', price=request['price'])
+
+    monkeypatch.setattr(order_executor.mt5, 'order_send', order_send, raising=False)
+    return requests
+
+
+@pytest.mark.parametrize('volume, expected', [
+    (0.019, 0.01),   # rounded down, not to nearest
+    (0.3, 0.3),      # no float error pushes it a step lower
+    (0.001, 0.01),   # raised to volume_min
+    (80.0, 50.0)     # capped at volume_max
+])
+def test_volume_rounded_down_and_clamped(sent, volume, expected):
+    executor = OrderExecutor(StubRegistry())
+    try:
+        result = executor.submit('EURUSD', 'BUY', volume).result(timeout=5)
+    finally:
+        executor.close()
+    assert result['volume'] == expected
+    assert sent[0]['volume'] == expected
+
+
+def test_volume_step_larger_than_lot_fraction(sent):
+    executor = OrderExecutor(StubRegistry(volume_min=1.0, volume_step=0.5))
+    try:
+        result = executor.submit('GOLD', 'SELL', 2.9).result(timeout=5)
+    finally:
+        executor.close()
+    assert result['volume'] == 2.5
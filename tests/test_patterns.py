@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies import patterns
+
+
+def random_bars(n, seed, ties=False):
+    """OHLC bars; with ties, prices sit on a coarse grid so equal values are common"""
+    rng = np.random.default_rng(seed)
+    if ties:
+        open_ = rng.integers(0, 4, n).astype(float)
+        close = rng.integers(0, 4, n).astype(float)
+        high = np.maximum(open_, close) + rng.integers(0, 2, n)
+        low = np.minimum(open_, close) - rng.integers(0, 2, n)
+    else:
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, n))
+        open_ = np.r_[1.1, close[:-1]] + rng.normal(0, 0.0003, n)
+        high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.0005, n))
+        low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.0005, n))
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min', tz='UTC'))
+
+
+CASES = [(n, seed, ties) for seed in range(4) for ties in (False, True) for n in (0, 1, 3, 200)]
+
+
+def rows(zones):
+    """ZONE_DTYPE records as comparable (index, type, high, low) tuples"""
+    return [(int(z['index']), str(z['type']), float(z['high']), float(z['low'])) for z in zones]
+
+
+# The row-by-row loops BaseStrategy used before patterns.py, kept as the reference
+
+def legacy_fair_value_gaps(df):
+    fvgs = []
+    for i in range(2, len(df)):
+        if df['high'].iloc[i-2] > df['low'].iloc[i]:
+            fvgs.append((i, 'bullish', df['high'].iloc[i-2], df['low'].iloc[i]))
+        if df['low'].iloc[i-2] < df['high'].iloc[i]:
+            fvgs.append((i, 'bearish', df['high'].iloc[i], df['low'].iloc[i-2]))
+    return fvgs
+
+
+def legacy_order_blocks(df):
+    order_blocks = []
+    for i in range(1, len(df)-1):
+        if df['close'].iloc[i] > df['open'].iloc[i] and df['close'].iloc[i+1] < df['open'].iloc[i+1]:
+            order_blocks.append((i, 'bullish', df['high'].iloc[i], df['low'].iloc[i]))
+        if df['close'].iloc[i] < df['open'].iloc[i] and df['close'].iloc[i+1] > df['open'].iloc[i+1]:
+            order_blocks.append((i, 'bearish', df['high'].iloc[i], df['low'].iloc[i]))
+    return order_blocks
+
+
+def legacy_breaker_blocks(df):
+    # The old loop re-emitted a breaker on every bar beyond the block, and
+    # also checked bars before it; breaker_blocks() keeps the first later one
+    breakers = []
+    for position, kind, high, low in legacy_order_blocks(df):
+        for i in range(position + 1, len(df)):
+            if kind == 'bearish' and df['close'].iloc[i] > high:
+                breakers.append((i, 'bullish', high, low))
+                break
+            if kind == 'bullish' and df['close'].iloc[i] < low:
+                breakers.append((i, 'bearish', high, low))
+                break
+    return breakers
+
+
+def ordered(zones):
+    """Bar order, bullish before bearish on the same bar, as make_zones orders them"""
+    return sorted(zones, key=lambda z: (z[0], z[1] != 'bullish'))
+
+
+@pytest.mark.parametrize('n, seed, ties', CASES)
+def test_fair_value_gaps_match_loop(n, seed, ties):
+    bars = random_bars(n, seed, ties)
+    assert rows(patterns.fair_value_gaps(bars)) == ordered(legacy_fair_value_gaps(bars))
+
+
+@pytest.mark.parametrize('n, seed, ties', CASES)
+def test_order_blocks_match_loop(n, seed, ties):
+    bars = random_bars(n, seed, ties)
+    assert rows(patterns.order_blocks(bars)) == ordered(legacy_order_blocks(bars))
+
+
+@pytest.mark.parametrize('n, seed, ties', CASES)
+def test_breaker_blocks_match_loop(n, seed, ties):
+    bars = random_bars(n, seed, ties)
+    assert rows(patterns.breaker_blocks(bars)) == ordered(legacy_breaker_blocks(bars))
+
+
+def test_breaker_blocks_accept_dict_blocks():
+    bars = random_bars(200, 1)
+    blocks = [{'type': str(z['type']), 'high': z['high'], 'low': z['low'], 'index': z['index']}
+              for z in patterns.order_blocks(bars)]
+    assert rows(patterns.breaker_blocks(bars, blocks)) == rows(patterns.breaker_blocks(bars))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_first_close_beyond_matches_scan(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 70))
+    close = rng.integers(0, 6, n).astype(float)
+    start = rng.integers(0, n + 2, 50)
+    level = rng.integers(-1, 7, 50).astype(float)
+
+    for above in (True, False):
+        expected = []
+        for s, lv in zip(start, level):
+            hits = [i for i in range(s, n) if (close[i] > lv if above else close[i] < lv)]
+            expected.append(hits[0] if hits else n)
+        result = patterns._first_close_beyond(close, start, level, above)
+        assert result.tolist() == expected
+
+
+def test_zone_times_and_dicts():
+    bars = random_bars(50, 2)
+    zones = patterns.fair_value_gaps(bars)
+    assert (pd.DatetimeIndex(zones['time']).tz_localize('UTC') == bars.index[zones['index']]).all()
+    dicts = list(patterns.iter_zone_dicts(zones, tz=bars.index.tz))
+    assert [d['time'] for d in dicts] == list(bars.index[zones['index']])
+    assert [(d['type'], d['high'], d['low']) for d in dicts] == [r[1:] for r in rows(zones)]
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.backtest import Backtest
+from backtesting.portfolio_backtest import PortfolioBacktest
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+
+
+class ScriptedStrategy:
+    """Buys at fixed bar numbers with a fixed size; no analyze_batch"""
+
+    def __init__(self, signal_bars, take_profit=1.5, size=1.0):
+        self.signal_bars = signal_bars
+        self.take_profit = take_profit
+        self.size = size
+
+    def analyze(self, data):
+        if len(data) - 1 not in self.signal_bars:
+            return None
+        return {'action': 'buy', 'stop_loss': 0.5, 'take_profit': self.take_profit,
+                'stop_loss_dollars': data['close'].iloc[-1] - 0.5, 'time': data.index[-1]}
+
+    def calculate_position_size(self, balance, stop_loss_dollars):
+        return self.size
+
+
+def flat_bars(closes):
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({'open': closes, 'high': closes, 'low': closes, 'close': closes},
+                        index=pd.date_range('2024-01-01', periods=len(closes), freq='5min'))
+
+
+def test_single_symbol_matches_vectorized_backtest():
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, 1500))
+    bars = pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=len(close), freq='5min'))
+
+    expected = Backtest(ICTCombinedStrategy('EURUSD', '5')).run(bars, mode='vectorized')
+    results = PortfolioBacktest({'EURUSD': ICTCombinedStrategy('EURUSD', '5')}).run({'EURUSD': bars})
+
+    assert expected['total_trades'] > 0
+    assert [{key: trade[key] for key in expected['trades'][0]} for trade in results['trades']] \
+        == expected['trades']
+    assert all(trade['symbol'] == 'EURUSD' for trade in results['trades'])
+    assert results['equity_curve'] == expected['equity_curve']
+    for key in ('total_return', 'max_drawdown', 'sharpe_ratio', 'profit_factor'):
+        assert results[key] == expected[key]
+
+
+def test_max_open_positions_holds_back_later_symbols():
+    data = {'A': flat_bars([1, 1, 1.2, 1.2, 1.2]), 'B': flat_bars([1] * 5), 'C': flat_bars([1] * 5)}
+    strategies = {'A': ScriptedStrategy({0}, take_profit=1.1),
+                  'B': ScriptedStrategy({0}),
+                  'C': ScriptedStrategy({0, 3})}
+    backtest = PortfolioBacktest(strategies, leverage=1, max_open_positions=2)
+    results = backtest.run(data)
+
+    # A and B fill the two slots; C only gets in at its next signal after A's target
+    [trade] = results['trades']
+    assert (trade['symbol'], trade['type'], trade['exit_price']) == ('A', 'tp', 1.1)
+    assert trade['exit_time'] == data['A'].index[2]
+    assert backtest.margin_curve == [2, 2, 1, 2, 2]
+    assert results['final_balance'] == pytest.approx(10000.1)
+
+
+def test_margin_limit_skips_entries_the_equity_cannot_carry():
+    data = {'A': flat_bars([1, 1, 1.2, 1.2, 1.2]), 'B': flat_bars([1] * 5)}
+    strategies = {'A': ScriptedStrategy({0}, take_profit=1.1, size=6000),
+                  'B': ScriptedStrategy({0, 3}, size=6000)}
+    backtest = PortfolioBacktest(strategies, leverage=1)
+    results = backtest.run(data)
+
+    # 6000 + 6000 of margin is more than the 10000 equity, so B waits until A is out
+    [trade] = results['trades']
+    assert trade['symbol'] == 'A'
+    assert trade['profit'] == pytest.approx(600)
+    assert backtest.margin_curve == [6000, 6000, 0, 6000, 6000]
+    assert results['equity_curve'][-1] == pytest.approx(10600)
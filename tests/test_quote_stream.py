@@ -0,0 +1,63 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from trading.quote_stream import QuoteStream, ReplaySource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / 'quotes.csv'
+    rows = ['time,symbol,bid,ask']
+    for n in range(50):
+        symbol = 'EURUSD' if n % 2 else 'GBPUSD'
+        rows.append(f"{1700000000 + n * 0.01},{symbol},{1.1 + n * 1e-5},{1.1002 + n * 1e-5}")
+    path.write_text('\n'.join(rows) + '\n')
+    return str(path)
+
+
+def replay(stream, handlers):
+    async def main():
+        consumers = [stream.consume(symbol, handler) for symbol, handler in handlers.items()]
+        await asyncio.wait_for(asyncio.gather(stream.run(), *consumers), timeout=10)
+    asyncio.run(main())
+
+
+def test_replay_without_metatrader5():
+    # Block the import as on a machine without the terminal package
+    code = ("import sys; sys.modules['MetaTrader5'] = None; "
+            "from trading.quote_stream import ReplaySource, QuoteStream")
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+
+
+def test_block_policy_delivers_every_quote_in_order(recording):
+    stream = QuoteStream(ReplaySource(recording), maxsize=2, policy='block')
+    received = {'EURUSD': [], 'GBPUSD': []}
+    replay(stream, {symbol: quotes.append for symbol, quotes in received.items()})
+
+    assert stream.received == 50
+    assert len(received['EURUSD']) == len(received['GBPUSD']) == 25
+    for quotes in received.values():
+        times = [quote['time'] for quote in quotes]
+        assert times == sorted(times)
+
+
+def test_drop_oldest_keeps_latest_quotes(recording):
+    stream = QuoteStream(ReplaySource(recording), maxsize=3, policy='drop_oldest')
+    received = []
+
+    async def slow(quote):
+        received.append(quote)
+        await asyncio.sleep(0.01)
+
+    replay(stream, {'EURUSD': slow, 'GBPUSD': lambda quote: None})
+
+    assert stream.dropped['EURUSD'] > 0
+    assert len(received) + stream.dropped['EURUSD'] == 25
+    # The newest quote always gets through
+    assert received[-1]['time'] == pytest.approx(1700000000 + 49 * 0.01)
@@ -0,0 +1,38 @@
+import pytest
+
+from trading.scanner import MarketScanner
+
+
+def fetch(symbol):
+    if symbol == 'DOWN':
+        raise ConnectionError("terminal busy")
+    if symbol == 'EMPTY':
+        return None
+    return (len(symbol), symbol.lower())
+
+
+def analyze(symbol, length, lower):
+    # Module level, so worker processes can unpickle it
+    if symbol == 'BAD':
+        raise ValueError("broken analysis")
+    return {'symbol': symbol, 'length': length, 'lower': lower}
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_scan_returns_signal_per_symbol_and_survives_errors(use_processes):
+    scanner = MarketScanner(fetch, analyze, io_workers=4, analysis_workers=2,
+                            use_processes=use_processes)
+    try:
+        signals = scanner.scan(['EURUSD', 'GOLD', 'BAD', 'DOWN', 'EMPTY'])
+        again = scanner.scan(['USDJPY'])
+    finally:
+        scanner.close()
+
+    assert signals['EURUSD'] == {'symbol': 'EURUSD', 'length': 6, 'lower': 'eurusd'}
+    assert signals['GOLD'] == {'symbol': 'GOLD', 'length': 4, 'lower': 'gold'}
+    # A failed fetch or a fetch with no data leaves the symbol out
+    assert 'DOWN' not in signals and 'EMPTY' not in signals
+    # A failed analysis doesn't stop the others; inline it reads as no signal
+    assert signals.get('BAD') is None
+    assert again == {'USDJPY': {'symbol': 'USDJPY', 'length': 6, 'lower': 'usdjpy'}}
+    assert scanner.last_cycle['symbols'] == 1
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data.sources import CSVSource, DataSource
+from market_data.store import OHLCStore
+from run_backtest import download_data
+
+
+def minute_bars(start, end):
+    index = pd.date_range(start, end, freq='1min', inclusive='left', name='time')
+    close = 1.1 + np.arange(len(index)) * 1e-5
+    return pd.DataFrame({'open': close, 'high': close + 1e-4, 'low': close - 1e-4,
+                         'close': close, 'volume': 1.0}, index=index)
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # download_data checkpoints into the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def source(tmp_path):
+    # Two weeks of weekday minute bars, no weekend bars
+    bars = minute_bars('2024-01-01', '2024-01-15')
+    bars = bars[bars.index.dayofweek < 5]
+    bars.to_csv(tmp_path / 'EURUSD_1m.csv')
+    return CSVSource(str(tmp_path))
+
+
+class FailingSource(DataSource):
+    max_window = pd.Timedelta(days=7)
+
+    def fetch(self, symbol, timeframe, start, end):
+        raise ConnectionError("offline")
+
+
+def test_missing_reports_gaps_inside_stored_range(tmp_path):
+    store = OHLCStore(str(tmp_path / 'store'))
+    store.save_download('EURUSD', '1m', '2024-01-01', '2024-01-03',
+                        minute_bars('2024-01-01', '2024-01-03'))
+    store.save_download('EURUSD', '1m', '2024-01-08', '2024-01-10',
+                        minute_bars('2024-01-08', '2024-01-10'))
+
+    missing = store.missing('EURUSD', '1m', '2024-01-01', '2024-01-10')
+    assert [(str(a), str(b)) for a, b in missing] == [
+        # The newest bar of each download is refreshed, it may have been forming
+        ('2024-01-02 23:59:00+00:00', '2024-01-08 00:00:00+00:00'),
+        ('2024-01-09 23:59:00+00:00', '2024-01-10 00:00:00.000000001+00:00')
+    ]
+
+
+def test_empty_download_marks_range_covered(tmp_path):
+    store = OHLCStore(str(tmp_path / 'store'))
+    store.save_download('EURUSD', '1m', '2024-01-06', '2024-01-08', pd.DataFrame())
+    assert store.missing('EURUSD', '1m', '2024-01-06', '2024-01-07 23:59') == []
+
+
+def test_download_data_fills_holes(tmp_path, source):
+    store = OHLCStore(str(tmp_path / 'store'))
+    expected = source.fetch('EURUSD', '1m', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-12'))
+
+    download_data('EURUSD', '1m', '2024-01-01', '2024-01-02 23:59', store, tz='UTC', source=source)
+    download_data('EURUSD', '1m', '2024-01-08', '2024-01-09 23:59', store, tz='UTC', source=source)
+    data = download_data('EURUSD', '1m', '2024-01-01', '2024-01-11 23:59', store, tz='UTC', source=source)
+
+    assert len(data) == len(expected)
+    np.testing.assert_array_equal(data['close'].to_numpy(), expected['close'].to_numpy())
+
+
+def test_download_data_raises_instead_of_returning_partial_data(tmp_path, source):
+    store = OHLCStore(str(tmp_path / 'store'))
+    download_data('EURUSD', '1m', '2024-01-01', '2024-01-02 23:59', store, tz='UTC', source=source)
+
+    with pytest.raises(RuntimeError):
+        download_data('EURUSD', '1m', '2024-01-01', '2024-01-05', store, tz='UTC',
+                      source=FailingSource())
+    # Covered ranges still load offline
+    data = download_data('EURUSD', '1m', '2024-01-01', '2024-01-02 23:58', store, tz='UTC',
+                         source=FailingSource())
+    assert len(data) == 2 * 24 * 60 - 1
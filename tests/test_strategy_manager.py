@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from strategies import features
+from strategies.feature_cache import FeatureCache
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+from strategies.strategy_manager import StrategyManager
+from strategies.zone_store import ZoneStore
+
+
+def make_strategies(cache):
+    strategies = []
+    for threshold, risk_reward in [(65, 1.5), (40, 1.0), (80, 2.0)]:
+        strategy = ICTCombinedStrategy('EURUSD', '15')
+        strategy.min_score_threshold = threshold
+        strategy.min_risk_reward = risk_reward
+        strategy.max_daily_trades = 1000
+        strategy.feature_cache = cache
+        strategies.append(strategy)
+    return strategies
+
+
+def reference_score(signal, data, zones):
+    """The scoring rules applied to features recomputed from scratch"""
+    action = signal['action'].lower()
+    zone_type = 'bullish' if action == 'buy' else 'bearish'
+    price = data['close'].iloc[-1]
+    score = 0
+
+    bias = features.daily_bias_series(data).iloc[-1]
+    if (action == 'buy' and bias == 'bullish') or (action == 'sell' and bias == 'bearish'):
+        score += 30
+
+    risk = abs(signal['price'] - signal['stop_loss'])
+    rr_ratio = abs(signal['take_profit'] - signal['price']) / risk
+    score += 20 if rr_ratio >= 2 else 15 if rr_ratio >= 1.5 else 0
+
+    levels = features.liquidity_levels(data)['recent_lows' if action == 'buy' else 'recent_highs']
+    if levels and abs(price - min(levels, key=lambda x: abs(x - price))) < risk:
+        score += 20
+
+    for kind in ('fvg', 'order_block'):
+        if any(zone['type'] == zone_type and min(zone['low'], zone['high']) <= price <= max(zone['low'], zone['high'])
+               for zone in zones.live(kind)):
+            score += 15
+    return score
+
+
+def test_evaluate_matches_sequential_analysis():
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, 600))
+    bars = pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=len(close), freq='15min'))
+
+    # Threaded and cached against one-at-a-time and recomputed
+    cache = FeatureCache()
+    manager = StrategyManager(make_strategies(cache), max_workers=3, cache=cache)
+    sequential = make_strategies(cache=None)
+    zones = ZoneStore()
+    scores = set()
+    try:
+        for end in range(350, 600, 10):
+            data = bars.iloc[:end]
+            evaluation = manager.evaluate(data)
+            zones.update(data)
+
+            expected = []
+            for i, strategy in enumerate(sequential):
+                signal = strategy.analyze(data)
+                if signal is not None:
+                    expected.append((i, signal, reference_score(signal, data, zones)))
+            actual = [(manager.strategies.index(strategy), signal, score)
+                      for strategy, signal, score in evaluation['signals']]
+            assert actual == expected
+            scores.update(score for _, _, score in actual)
+            assert set(evaluation['timings']) >= {'features', 'ICTCombinedStrategy'}
+    finally:
+        manager.close()
+
+    # The walk reaches signals with and without the zone points
+    assert len(scores) > 1 and max(scores) > 70
+
+
+def test_zone_points_follow_the_signal_direction():
+    # Flat bars, then a jump up and a pull back into the gap it left
+    rows = [(1.0, 1.0005, 0.9995, 1.0)] * 30 + [
+        (1.0, 1.001, 0.999, 1.0009),
+        (1.001, 1.010, 1.001, 1.009),
+        (1.009, 1.012, 1.004, 1.011),
+        (1.011, 1.011, 1.0025, 1.003),
+    ]
+    data = pd.DataFrame(rows, columns=['open', 'high', 'low', 'close'],
+                        index=pd.date_range('2024-01-02', periods=len(rows), freq='5min'))
+    manager = StrategyManager([ICTCombinedStrategy('EURUSD', '5')], cache=None)
+    manager.zone_store.update(data)
+    price = data['close'].iloc[-1]
+    assert len(manager.zone_store.index('fvg', 'bullish').containing_positions(price))
+    assert len(manager.zone_store.index('fvg', 'bearish').containing_positions(price))
+
+    def signal(action):
+        # No reward and a tiny risk leave only the bias and zone factors
+        offset = 1e-9 if action.lower() == 'sell' else -1e-9
+        return {'action': action, 'price': price, 'stop_loss': price + offset, 'take_profit': price}
+
+    # Buys count bullish zones and sells bearish ones; comparing the zone type
+    # with the action itself never matched, so neither scored zone points
+    assert manager._calculate_strategy_score(signal('buy'), data) == 15
+    assert manager._calculate_strategy_score(signal('BUY'), data) == 15
+    # No previous day, so the bias reads bearish and adds 30 to the sell
+    assert manager._calculate_strategy_score(signal('sell'), data) == 30 + 15
+
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies import swings
+
+
+def random_bars(n, seed, ties=False):
+    """High/low bars; with ties, prices sit on a coarse grid so equal values are common"""
+    rng = np.random.default_rng(seed)
+    if ties:
+        low = rng.integers(0, 4, n).astype(float)
+        high = low + rng.integers(0, 3, n)
+    else:
+        mid = 2000 + np.cumsum(rng.normal(0, 0.5, n))
+        high = mid + np.abs(rng.normal(0, 0.3, n))
+        low = mid - np.abs(rng.normal(0, 0.3, n))
+    return pd.DataFrame({'high': high, 'low': low},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+# The row-wise 5-bar fractal loop ICTStrategy and LiquidityStrategy used before
+def legacy_swing_points(data):
+    swing_highs = []
+    swing_lows = []
+    for i in range(2, len(data)-2):
+        if data['high'].iloc[i] > data['high'].iloc[i-1] and \
+           data['high'].iloc[i] > data['high'].iloc[i-2] and \
+           data['high'].iloc[i] > data['high'].iloc[i+1] and \
+           data['high'].iloc[i] > data['high'].iloc[i+2]:
+            swing_highs.append((i, data['high'].iloc[i]))
+        if data['low'].iloc[i] < data['low'].iloc[i-1] and \
+           data['low'].iloc[i] < data['low'].iloc[i-2] and \
+           data['low'].iloc[i] < data['low'].iloc[i+1] and \
+           data['low'].iloc[i] < data['low'].iloc[i+2]:
+            swing_lows.append((i, data['low'].iloc[i]))
+    return swing_highs, swing_lows
+
+
+def brute_fractals(high, low, left, right):
+    n = len(high)
+
+    def neighbours(i):
+        return list(range(i - left, i)) + list(range(i + 1, i + right + 1))
+
+    swing_high = [left <= i < n - right and all(high[i] > high[j] for j in neighbours(i)) for i in range(n)]
+    swing_low = [left <= i < n - right and all(low[i] < low[j] for j in neighbours(i)) for i in range(n)]
+    return swing_high, swing_low
+
+
+CASES = [(n, seed, ties) for seed in range(4) for ties in (False, True) for n in (0, 3, 5, 300)]
+
+
+def track(bars, **kwargs):
+    tracker = swings.SwingTracker(**kwargs)
+    for high, low in zip(bars['high'].tolist(), bars['low'].tolist()):
+        tracker.update(high, low)
+    return tracker
+
+
+@pytest.mark.parametrize('n, seed, ties', CASES)
+def test_swing_points_and_tracker_match_loop(n, seed, ties):
+    bars = random_bars(n, seed, ties)
+    expected = legacy_swing_points(bars)
+    assert swings.swing_points(bars, left=2, right=2) == expected
+
+    tracker = track(bars, left=2, right=2, history=max(n, 1))
+    assert (list(tracker.swing_highs), list(tracker.swing_lows)) == expected
+
+
+@pytest.mark.parametrize('left, right', [(1, 1), (3, 1), (1, 4)])
+@pytest.mark.parametrize('ties', [False, True])
+def test_fractals_match_brute_force(left, right, ties):
+    bars = random_bars(200, 7, ties)
+    high, low = bars['high'].to_numpy(), bars['low'].to_numpy()
+    swing_high, swing_low = swings.fractals(high, low, left, right)
+    assert (swing_high.tolist(), swing_low.tolist()) == brute_fractals(high, low, left, right)
+
+    tracker = track(bars, left=left, right=right, history=len(bars))
+    assert [i for i, _ in tracker.swing_highs] == np.flatnonzero(swing_high).tolist()
+    assert [i for i, _ in tracker.swing_lows] == np.flatnonzero(swing_low).tolist()
+
+
+@pytest.mark.parametrize('ties', [False, True])
+def test_seeded_tracker_continues_like_a_fresh_one(ties):
+    bars = random_bars(300, 3, ties)
+    seeded = swings.SwingTracker(history=300).seed(bars['high'].iloc[:120], bars['low'].iloc[:120])
+    for high, low in zip(bars['high'].iloc[120:].tolist(), bars['low'].iloc[120:].tolist()):
+        seeded.update(high, low)
+
+    fresh = track(bars, history=300)
+    assert list(seeded.swing_highs) == list(fresh.swing_highs)
+    assert list(seeded.swing_lows) == list(fresh.swing_lows)
+    assert seeded.count == fresh.count == 300
+
+
+def test_tracker_accepts_numpy_integers_and_keeps_recent_swings():
+    bars = random_bars(300, 0)
+    tracker = track(bars, left=np.int64(2), right=np.int64(2), history=np.int64(3))
+    expected_highs, expected_lows = legacy_swing_points(bars)
+    assert list(tracker.swing_highs) == expected_highs[-3:]
+    assert list(tracker.swing_lows) == expected_lows[-3:]
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('MetaTrader5')
+from trading import symbol_registry
+from trading.symbol_registry import SymbolRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    calls = {'symbol_info': [], 'symbol_info_tick': []}
+
+    def symbol_info(symbol):
+        calls['symbol_info'].append(symbol)
+        if symbol == 'MISSING':
+            return None
+        return SimpleNamespace(point=0.00001, digits=5, volume_min=0.01, volume_max=50.0, volume_step=0.01)
+
+    def symbol_info_tick(symbol):
+        calls['symbol_info_tick'].append(symbol)
+        if symbol == 'MISSING':
+            return None
+        count = len(calls['symbol_info_tick'])
+        return SimpleNamespace(bid=1.1 + count * 0.0001, ask=1.1002 + count * 0.0001, time=count)
+
+    monkeypatch.setattr(symbol_registry.mt5, 'symbol_info', symbol_info, raising=False)
+    monkeypatch.setattr(symbol_registry.mt5, 'symbol_info_tick', symbol_info_tick, raising=False)
+    monkeypatch.setattr(symbol_registry.mt5, 'last_error', lambda: (1, 'stub'), raising=False)
+    return calls
+
+
+def test_tick_is_reused_until_the_ttl_expires(terminal):
+    clock = FakeClock()
+    registry = SymbolRegistry(ttl=0.5, clock=clock)
+
+    first = registry.tick('EURUSD')
+    clock.now += 0.4
+    assert registry.tick('EURUSD') is first
+    assert terminal['symbol_info_tick'] == ['EURUSD']
+
+    clock.now += 0.1  # Exactly ttl old counts as stale
+    second = registry.tick('EURUSD')
+    assert second is not first
+    assert terminal['symbol_info_tick'] == ['EURUSD', 'EURUSD']
+
+    # A looser max_age keeps serving the cached tick
+    clock.now += 2.0
+    assert registry.tick('EURUSD', max_age=5) is second
+
+
+def test_max_age_zero_always_asks_the_terminal(terminal):
+    registry = SymbolRegistry(ttl=10, clock=FakeClock())
+    ticks = [registry.tick('EURUSD', max_age=0) for _ in range(3)]
+    assert len(terminal['symbol_info_tick']) == 3
+    assert len({tick.time for tick in ticks}) == 3
+    # The fresh tick is cached for later default reads
+    assert registry.tick('EURUSD') is ticks[-1]
+
+
+def test_invalidate_drops_one_symbol_or_all(terminal):
+    registry = SymbolRegistry(ttl=10, clock=FakeClock())
+    registry.tick('EURUSD')
+    registry.tick('GBPUSD')
+
+    registry.invalidate('EURUSD')
+    registry.tick('EURUSD')
+    registry.tick('GBPUSD')
+    assert terminal['symbol_info_tick'] == ['EURUSD', 'GBPUSD', 'EURUSD']
+
+    registry.invalidate()
+    registry.tick('EURUSD')
+    registry.tick('GBPUSD')
+    assert terminal['symbol_info_tick'][3:] == ['EURUSD', 'GBPUSD']
+
+
+def test_properties_load_once_and_quote_combines_them(terminal):
+    registry = SymbolRegistry(clock=FakeClock())
+    registry.load(['EURUSD', 'GBPUSD'])
+    registry.properties('EURUSD')
+    assert terminal['symbol_info'] == ['EURUSD', 'GBPUSD']
+
+    quote = registry.quote('EURUSD')
+    assert quote['digits'] == 5
+    assert quote['spread'] == 20
+    assert quote['bid'] == pytest.approx(1.1001)
+
+
+def test_missing_symbol_returns_none_and_is_not_cached(terminal):
+    registry = SymbolRegistry(clock=FakeClock())
+    assert registry.properties('MISSING') is None
+    assert registry.tick('MISSING') is None
+    assert registry.quote('MISSING') is None
+    assert registry.tick('MISSING') is None
+    assert terminal['symbol_info_tick'] == ['MISSING'] * 3
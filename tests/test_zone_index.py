@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies import patterns
+from strategies.ict_strategy import ICTStrategy
+from strategies.zone_index import ZoneIndex
+
+
+def random_zones(n, seed):
+    """Zones on a coarse price grid: shared bounds, zero-width and inverted zones are common"""
+    rng = np.random.default_rng(seed)
+    zones = np.zeros(n, dtype=patterns.ZONE_DTYPE)
+    zones['type'] = rng.choice(['bullish', 'bearish'], n)
+    zones['high'] = rng.integers(0, 20, n)
+    zones['low'] = zones['high'] - rng.integers(-4, 5, n)  # Negative widths invert the pair
+    zones['index'] = np.arange(n)
+    return zones
+
+
+def query_prices(zones, seed):
+    """Every bound, the points between and beyond them, and random prices"""
+    bounds = np.unique(np.r_[zones['high'], zones['low']]).astype(float)
+    rng = np.random.default_rng(seed)
+    return np.unique(np.r_[bounds, bounds + 0.5, bounds - 0.5, -100.0, 100.0, rng.uniform(-2, 22, 20)])
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 7, 60, 400])
+@pytest.mark.parametrize('seed', range(3))
+def test_queries_match_brute_force(n, seed):
+    zones = random_zones(n, seed)
+    index = ZoneIndex(zones)
+    low = np.minimum(zones['low'], zones['high'])
+    high = np.maximum(zones['low'], zones['high'])
+    assert len(index) == n
+
+    for price in query_prices(zones, seed):
+        containing = [i for i in range(n) if low[i] <= price <= high[i]]
+        below = [i for i in range(n) if high[i] < price]
+        above = [i for i in range(n) if low[i] > price]
+
+        assert index.containing_positions(price).tolist() == containing
+        np.testing.assert_array_equal(index.containing(price), zones[containing])
+        np.testing.assert_array_equal(index.below(price), zones[below])
+        np.testing.assert_array_equal(index.above(price), zones[above])
+        assert index.any_below(price) == bool(below)
+        assert index.any_above(price) == bool(above)
+
+
+def test_empty_index():
+    index = ZoneIndex(np.empty(0, dtype=patterns.ZONE_DTYPE))
+    assert len(index) == 0
+    assert index.containing_positions(1.0).tolist() == []
+    assert len(index.containing(1.0)) == len(index.below(1.0)) == len(index.above(1.0)) == 0
+    assert not index.any_below(1.0) and not index.any_above(1.0)
+
+
+def test_prices_on_a_bound_are_inside_not_beyond():
+    zones = np.zeros(2, dtype=patterns.ZONE_DTYPE)
+    zones['high'] = [2.0, 1.0]
+    zones['low'] = [1.0, 2.0]  # The second pair is inverted
+    index = ZoneIndex(zones)
+    for price in (1.0, 2.0):
+        assert index.containing_positions(price).tolist() == [0, 1]
+        assert not index.any_below(price) and not index.any_above(price)
+    assert len(index.below(2.0 + 1e-9)) == 2 and len(index.above(1.0 - 1e-9)) == 2
+
+
+class PDArrayStrategy(ICTStrategy):
+    def analyze(self, data):
+        return self.generate_signals(data)
+
+
+def legacy_pd_zones(data, kind):
+    """The order block and FVG loops of the old identify_pd_array, with their bar"""
+    o, h, l, c = (data[column].to_numpy() for column in ('open', 'high', 'low', 'close'))
+    order_blocks, fvgs = [], []
+    for i in range(1, len(data) - 1):
+        if kind == 'bullish':
+            if c[i] > o[i] and l[i] < l[i-1] and l[i] < l[i+1]:
+                order_blocks.append((i, 'bullish', h[i], l[i]))
+            if l[i+1] > h[i]:
+                fvgs.append((i, 'bullish', h[i], l[i+1]))
+        else:
+            if c[i] < o[i] and h[i] > h[i-1] and h[i] > h[i+1]:
+                order_blocks.append((i, 'bearish', h[i], l[i]))
+            if h[i+1] < l[i]:
+                fvgs.append((i, 'bearish', l[i], h[i+1]))
+    return order_blocks, fvgs
+
+
+def unmitigated(zones, down, up):
+    """Zones no later bar has traded through: below a bullish zone or above a bearish one"""
+    live = []
+    for i, kind, high, low in zones:
+        if kind == 'bullish' and not (down[i + 1:] < min(high, low)).any():
+            live.append((i, kind, high, low))
+        if kind == 'bearish' and not (up[i + 1:] > max(high, low)).any():
+            live.append((i, kind, high, low))
+    return live
+
+
+def rows(zones):
+    return [(int(z['index']), str(z['type']), float(z['high']), float(z['low'])) for z in zones]
+
+
+@pytest.mark.parametrize('ties', [False, True])
+def test_identify_pd_array_returns_the_live_zones_of_the_shift(ties):
+    rng = np.random.default_rng(5)
+    n = 150
+    if ties:
+        open_ = rng.integers(0, 6, n).astype(float)
+        close = rng.integers(0, 6, n).astype(float)
+        high = np.maximum(open_, close) + rng.integers(0, 2, n)
+        low = np.minimum(open_, close) - rng.integers(0, 2, n)
+    else:
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, n))
+        open_ = np.r_[1.1, close[:-1]] + rng.normal(0, 0.0005, n)
+        high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.0005, n))
+        low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.0005, n))
+    bars = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+    strategy = PDArrayStrategy('EURUSD', '5')
+    assert strategy.identify_pd_array(bars, None) is None
+    for end in range(3, n + 1):
+        data = bars.iloc[:end]
+        for kind in ('bullish', 'bearish'):
+            pd_array = strategy.identify_pd_array(data, {'type': kind})
+            order_blocks, fvgs = legacy_pd_zones(data, kind)
+            close_, low_, high_ = (data[c].to_numpy() for c in ('close', 'low', 'high'))
+            # Order blocks go on a close through them, FVGs on a wick
+            assert sorted(rows(pd_array['order_blocks'])) == unmitigated(order_blocks, close_, close_)
+            assert sorted(rows(pd_array['fvgs'])) == unmitigated(fvgs, low_, high_)
+
+            price = pd_array['current_price']
+            assert price == data['close'].iloc[-1]
+            inside = [zone for zone in rows(pd_array['order_blocks']) if min(zone[2:]) <= price <= max(zone[2:])]
+            assert rows(pd_array['order_block_index'].containing(price)) == inside
+            assert len(pd_array['fvg_index']) == len(pd_array['fvgs'])
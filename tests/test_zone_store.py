@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies import patterns
+from strategies.ict_combined_strategy import ICTCombinedStrategy
+from strategies.ict_strategy import ICTStrategy
+from strategies.zone_store import DEFAULT_DETECTORS, ZoneStore
+
+ICT_DETECTORS = {'order_block': patterns.swing_order_blocks, 'fvg': patterns.adjacent_fair_value_gaps}
+
+
+def random_bars(n, seed, ties=False):
+    """OHLC bars; with ties, prices sit on a coarse grid so equal values are common"""
+    rng = np.random.default_rng(seed)
+    if ties:
+        open_ = rng.integers(0, 6, n).astype(float)
+        close = rng.integers(0, 6, n).astype(float)
+        high = np.maximum(open_, close) + rng.integers(0, 2, n)
+        low = np.minimum(open_, close) - rng.integers(0, 2, n)
+    else:
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, n))
+        open_ = np.r_[1.1, close[:-1]] + rng.normal(0, 0.0005, n)
+        high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.0005, n))
+        low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.0005, n))
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def rows(zones):
+    return [(int(z['index']), str(z['type']), float(z['high']), float(z['low'])) for z in zones]
+
+
+def feed(store, bars, start=1):
+    """Update store with every prefix of bars, as a live loop would"""
+    for end in range(start, len(bars) + 1):
+        store.update(bars.iloc[:end])
+
+
+def prices(bars, kind):
+    """Bar prices that mitigate a kind, (down, up): wicks for FVGs, closes for the rest"""
+    if kind == 'fvg':
+        return bars['low'].to_numpy(), bars['high'].to_numpy()
+    close = bars['close'].to_numpy()
+    return close, close
+
+
+def first_hit(zone, down, up, last):
+    """First bar after the zone's own that traded through it, or None"""
+    index, kind, high, low = zone
+    for j in range(index + 1, last + 1):
+        if (down[j] < min(high, low)) if kind == 'bullish' else (up[j] > max(high, low)):
+            return j
+    return None
+
+
+def brute_live(bars, detectors, max_age, breakers=True):
+    """Live zones per kind after the last bar of bars, scanning every zone's history"""
+    last = len(bars) - 1
+    live = {}
+    broken = []
+    for kind, detect in detectors.items():
+        down, up = prices(bars, kind)
+        live[kind] = []
+        for zone in rows(detect(bars)):
+            hit = first_hit(zone, down, up, last)
+            if hit is not None and hit - zone[0] <= max_age:
+                if kind == 'order_block':
+                    index, zone_type, high, low = zone
+                    broken.append((hit, 'bearish' if zone_type == 'bullish' else 'bullish', high, low))
+            elif last - zone[0] <= max_age:
+                live[kind].append(zone)
+    if breakers and 'order_block' in detectors:
+        down, up = prices(bars, 'breaker')
+        live['breaker'] = [zone for zone in broken
+                           if last - zone[0] <= max_age and
+                           (first_hit(zone, down, up, last) is None or first_hit(zone, down, up, last) - zone[0] > max_age)]
+    return {kind: sorted(zones) for kind, zones in live.items()}
+
+
+@pytest.mark.parametrize('detectors', [DEFAULT_DETECTORS, ICT_DETECTORS], ids=['default', 'ict'])
+@pytest.mark.parametrize('ties', [False, True])
+@pytest.mark.parametrize('max_age', [3, 20, 500])
+def test_bar_by_bar_matches_brute_force(detectors, ties, max_age):
+    bars = random_bars(160, 11, ties)
+    store = ZoneStore(detectors, max_age=max_age, max_zones=10_000)
+    for end in range(1, len(bars) + 1):
+        store.update(bars.iloc[:end])
+        if end % 20 == 0 or end == len(bars):
+            expected = brute_live(bars.iloc[:end], detectors, max_age)
+            assert {kind: sorted(rows(store.live(kind))) for kind in store.kinds} == expected
+            for kind in store.kinds:
+                live = store.live(kind)
+                assert (np.diff(live['index']) >= 0).all()  # Oldest first
+                assert rows(store.live(kind, 'bullish')) == [z for z in rows(live) if z[1] == 'bullish']
+
+
+def test_wick_mitigates_fvgs_and_close_mitigates_the_rest():
+    # A bullish zone from 1.0 to 1.2 for every kind, then a bar that wicks
+    # below it but closes inside it
+    zone = patterns.make_zones(['bullish'], [1.2], [1.0], [0], np.zeros(1, dtype='datetime64[ns]'))
+    detectors = {kind: (lambda data: zone) for kind in ('fvg', 'order_block', 'mitigation_block')}
+    bars = pd.DataFrame({'open': [1.1, 1.1, 1.1], 'high': [1.2, 1.15, 1.15],
+                         'low': [1.0, 0.9, 1.05], 'close': [1.1, 1.05, 1.05]},
+                        index=pd.date_range('2024-01-01', periods=3, freq='5min'))
+    store = ZoneStore(detectors)
+    feed(store, bars)
+
+    assert len(store.live('fvg')) == 0
+    assert rows(store.live('order_block')) == [(0, 'bullish', 1.2, 1.0)]
+    assert rows(store.live('mitigation_block')) == [(0, 'bullish', 1.2, 1.0)]
+    assert store.counts['fvg']['mitigated'] == 1
+
+    # A close below the zone takes the rest, and the order block becomes a breaker
+    store.update(pd.concat([bars, pd.DataFrame({'open': [1.05], 'high': [1.06], 'low': [0.9], 'close': [0.95]},
+                                               index=[bars.index[-1] + pd.Timedelta('5min')])]))
+    assert len(store.live('order_block')) == len(store.live('mitigation_block')) == 0
+    assert rows(store.live('breaker')) == [(3, 'bearish', 1.2, 1.0)]
+
+
+def test_max_zones_keeps_the_newest_live_zones():
+    bars = random_bars(200, 4)
+    max_zones = 3
+    store = ZoneStore(DEFAULT_DETECTORS, max_age=40, max_zones=max_zones)
+
+    # Apply the same rules bar by bar, then trim each kind to the newest max_zones
+    live = {kind: [] for kind in store.kinds}
+    seen = {kind: set() for kind in DEFAULT_DETECTORS}
+    for t in range(len(bars)):
+        data = bars.iloc[:t + 1]
+        store.update(data)
+        for kind, detect in DEFAULT_DETECTORS.items():
+            for zone in rows(detect(data)):
+                if zone not in seen[kind]:
+                    seen[kind].add(zone)
+                    live[kind].append(zone)
+        for kind in store.kinds:
+            down, up = prices(bars, kind)
+            kept = []
+            for zone in live[kind]:
+                index, zone_type, high, low = zone
+                beyond = t > index and ((down[t] < min(high, low)) if zone_type == 'bullish' else (up[t] > max(high, low)))
+                if beyond and t - index <= store.max_age:
+                    if kind == 'order_block':
+                        live['breaker'].append((t, 'bearish' if zone_type == 'bullish' else 'bullish', high, low))
+                elif t - index <= store.max_age:
+                    kept.append(zone)
+            live[kind] = kept[-max_zones:]
+
+        for kind in store.kinds:
+            assert rows(store.live(kind)) == live[kind]
+    assert any(counts['dropped'] for counts in store.counts.values())
+
+
+@pytest.mark.parametrize('detectors', [DEFAULT_DETECTORS, ICT_DETECTORS], ids=['default', 'ict'])
+def test_batching_does_not_change_the_result(detectors):
+    bars = random_bars(150, 2)
+    one_by_one = ZoneStore(detectors, max_age=30)
+    feed(one_by_one, bars)
+    at_once = ZoneStore(detectors, max_age=30)
+    at_once.update(bars)
+    in_chunks = ZoneStore(detectors, max_age=30)
+    for end in (7, 8, 50, 51, 52, 149, 150):
+        in_chunks.update(bars.iloc[:end])
+
+    for kind in one_by_one.kinds:
+        expected = sorted(rows(one_by_one.live(kind)))
+        assert sorted(rows(at_once.live(kind))) == expected
+        assert sorted(rows(in_chunks.live(kind))) == expected
+
+
+def test_rewound_series_resets_the_store():
+    bars = random_bars(80, 1)
+    store = ZoneStore()
+    store.update(bars)
+    assert store.update(bars) == 0
+    store.update(bars.iloc[:40])
+    assert store.bars == 40
+    fresh = ZoneStore()
+    fresh.update(bars.iloc[:40])
+    for kind in store.kinds:
+        assert rows(store.live(kind)) == rows(fresh.live(kind))
+
+
+class PDArrayStrategy(ICTStrategy):
+    def analyze(self, data):
+        return self.generate_signals(data)
+
+
+def test_strategy_live_zones_use_its_zone_store():
+    bars = random_bars(120, 6)
+    combined = ICTCombinedStrategy('EURUSD', '5')
+    ict = PDArrayStrategy('EURUSD', '5')
+    default_store, ict_store = ZoneStore(), ZoneStore(ICT_DETECTORS)
+    assert combined.zone_store is None
+
+    for end in range(1, len(bars) + 1):
+        data = bars.iloc[:end]
+        default_store.update(data)
+        ict_store.update(data)
+        np.testing.assert_array_equal(combined.live_zones(data, 'fvg'), default_store.live('fvg'))
+        np.testing.assert_array_equal(combined.live_zones(data, 'order_block', 'bearish'),
+                                      default_store.live('order_block', 'bearish'))
+        np.testing.assert_array_equal(ict.live_zones(data, 'order_block'), ict_store.live('order_block'))
+
+    # Each strategy made its own store on first use, with its own detectors
+    assert combined.zone_store.detectors is DEFAULT_DETECTORS
+    assert ict.zone_store.detectors['fvg'] is patterns.adjacent_fair_value_gaps
+    assert ict.create_zone_store() is not ict.zone_store
+
+
+def legacy_mitigation_blocks(df):
+    """The old ICTCombinedStrategy.identify_mitigation_blocks loop, with each block's bar"""
+    blocks = []
+    for i in range(2, len(df)-1):
+        if df['high'].iloc[i] < df['high'].iloc[i-1] and df['low'].iloc[i] < df['low'].iloc[i-2]:
+            blocks.append((i, {'type': 'bearish', 'high': df['high'].iloc[i], 'low': df['low'].iloc[i],
+                               'time': df.index[i]}))
+        if df['low'].iloc[i] > df['low'].iloc[i-1] and df['high'].iloc[i] > df['high'].iloc[i-2]:
+            blocks.append((i, {'type': 'bullish', 'high': df['high'].iloc[i], 'low': df['low'].iloc[i],
+                               'time': df.index[i]}))
+    return blocks
+
+
+@pytest.mark.parametrize('tz', [None, 'America/New_York'])
+def test_identify_mitigation_blocks_returns_the_live_legacy_blocks(tz):
+    bars = random_bars(120, 9)
+    if tz:
+        bars.index = bars.index.tz_localize('UTC').tz_convert(tz)
+    strategy = ICTCombinedStrategy('EURUSD', '5')
+    for end in range(4, len(bars) + 1, 4):
+        data = bars.iloc[:end]
+        close = data['close'].to_numpy()
+        expected = [block for i, block in legacy_mitigation_blocks(data)
+                    if first_hit((i, block['type'], block['high'], block['low']), close, close, end - 1) is None]
+        expected.sort(key=lambda block: (block['time'], block['type'] != 'bullish'))
+        assert strategy.identify_mitigation_blocks(data) == expected
@@ -2,13 +2,19 @@ import requests
 import logging
 from datetime import datetime
 import json
+import numpy as np
+import pandas as pd
+from .http_client import HTTPTransport, AsyncHTTPTransport, ConcurrentGetter
 
 class AvaTradeAPI:
     def __init__(self, demo=True):
         self.demo = demo
         # Official AvaTrade API endpoint
         self.base_url = "https://live.avatrade.com/api/v1" if not demo else "https://demo.avatrade.com/api/v1"
-        self.session = requests.Session()
+        self.http = HTTPTransport(self.base_url)
+        self.session = self.http.session
+        self.async_http = None
+        self.getter = ConcurrentGetter(self.http)
         self.token = None
         
     def login(self, username, password):
@@ -25,8 +31,8 @@ class AvaTradeAPI:
                 'password': 'Abel3078@'   # Your demo account password
             }
             
-            response = requests.post(
-                f"{self.base_url}/authentication/login", 
+            response = self.http.post(
+                "/authentication/login",
                 headers=headers,
                 data=data
             )
@@ -51,7 +57,7 @@ class AvaTradeAPI:
     def get_account_info(self):
         """Get real account information"""
         try:
-            response = self.session.get(f"{self.base_url}/account/details")
+            response = self.http.get("/account/details")
             if response.status_code == 200:
                 return response.json()
             logging.error(f"Failed to get account info: {response.text}")
@@ -76,7 +82,7 @@ class AvaTradeAPI:
             if take_profit:
                 data["takeProfit"] = take_profit
 
-            response = self.session.post(f"{self.base_url}/trading/order", json=data)
+            response = self.http.post("/trading/order", json=data)
             if response.status_code == 200:
                 return response.json()
             logging.error(f"Order failed: {response.text}")
@@ -88,7 +94,7 @@ class AvaTradeAPI:
     def get_positions(self):
         """Get real open positions"""
         try:
-            response = self.session.get(f"{self.base_url}/trading/positions")
+            response = self.http.get("/trading/positions")
             if response.status_code == 200:
                 return response.json()
             return []
@@ -99,7 +105,7 @@ class AvaTradeAPI:
     def get_instruments(self):
         """Get available trading instruments"""
         try:
-            response = self.session.get(f"{self.base_url}/instruments")
+            response = self.http.get("/instruments")
             if response.status_code == 200:
                 return response.json()
             return []
@@ -110,10 +116,72 @@ class AvaTradeAPI:
     def get_market_price(self, symbol):
         """Get real-time market price"""
         try:
-            response = self.session.get(f"{self.base_url}/market/prices/{symbol}")
+            response = self.http.get(f"/market/prices/{symbol}")
             if response.status_code == 200:
                 return response.json()
             return None
         except Exception as e:
             logging.error(f"Get market price error: {str(e)}")
-            return None 
\ No newline at end of file
+            return None 
+
+    def get_market_prices(self, symbols):
+        """
+        Get real-time prices for many symbols at once
+        
+        Requests run concurrently, at most getter's max_workers at a time,
+        and a symbol whose price is already being fetched is not asked for twice.
+        
+        Returns:
+            pd.DataFrame: bid, ask, mid and spread indexed by symbol in the
+                order given; NaN for symbols whose price could not be fetched
+        """
+        quotes = self.getter.get_json_many([f"/market/prices/{symbol}" for symbol in symbols])
+        return price_snapshot(symbols, quotes)
+
+    async def get_market_price_async(self, symbol):
+        """Get real-time market price without blocking the event loop"""
+        try:
+            response = await self._async_http().get(f"/market/prices/{symbol}")
+            if response.status_code == 200:
+                return response.json()
+            return None
+        except Exception as e:
+            logging.error(f"Get market price error: {str(e)}")
+            return None
+
+    def _async_http(self):
+        """asyncio transport sharing this client's session, created on first use"""
+        if self.async_http is None:
+            self.async_http = AsyncHTTPTransport(self.http)
+        return self.async_http
+
+    def close(self):
+        """Close pooled connections"""
+        if self.async_http is not None:
+            self.async_http.close()
+        self.getter.close()
+        self.http.close()
+
+
+def price_snapshot(symbols, quotes):
+    """
+    Align price quotes into one table
+    
+    Args:
+        symbols: Symbols in the order the rows should have
+        quotes: Quote dict with 'bid' and 'ask' per symbol; None or any
+            other value leaves the row NaN
+        
+    Returns:
+        pd.DataFrame: bid, ask, mid and spread indexed by symbol
+    """
+    prices = np.full((len(symbols), 2), np.nan)
+    for i, quote in enumerate(quotes):
+        if isinstance(quote, dict):
+            prices[i] = quote.get('bid', np.nan), quote.get('ask', np.nan)
+    return pd.DataFrame({
+        'bid': prices[:, 0],
+        'ask': prices[:, 1],
+        'mid': prices.mean(axis=1),
+        'spread': prices[:, 1] - prices[:, 0]
+    }, index=pd.Index(list(symbols), name='symbol'))
@@ -1,18 +1,22 @@
 import requests
 import logging
 from datetime import datetime
+from .http_client import HTTPTransport, ConcurrentGetter
+from .avatrade_connector import price_snapshot
 
 class AvaTradeWebTrader:
     def __init__(self):
         # Updated to use the correct WebTrader URL
         self.base_url = "https://webtrader7.avatrade.com"
-        self.session = requests.Session()
+        self.http = HTTPTransport(self.base_url)
+        self.session = self.http.session
+        self.getter = ConcurrentGetter(self.http)
         self.logged_in = False
 
     def login(self):
         """Login to AvaTrade WebTrader"""
         try:
-            login_url = f"{self.base_url}/auth/login"
+            login_url = "/auth/login"
             
             # WebTrader login data
             data = {
@@ -28,7 +32,7 @@ class AvaTradeWebTrader:
                 'Referer': 'https://webtrader7.avatrade.com/login'
             }
 
-            response = requests.post(login_url, json=data, headers=headers)
+            response = self.http.post(login_url, json=data, headers=headers)
             
             if response.status_code == 200:
                 token = response.json().get('token')
@@ -52,8 +56,8 @@ class AvaTradeWebTrader:
     def get_price(self, symbol='EURUSD'):
         """Get current price for a symbol"""
         try:
-            price_url = f"{self.base_url}/prices/{symbol}"
-            response = self.session.get(price_url)
+            price_url = f"/prices/{symbol}"
+            response = self.http.get(price_url)
             
             if response.status_code == 200:
                 return response.json()
@@ -62,11 +66,22 @@ class AvaTradeWebTrader:
             logging.error(f"Price fetch error: {str(e)}")
             return None
 
+    def get_prices(self, symbols):
+        """
+        Get current prices for many symbols at once, fetched concurrently
+        
+        Returns:
+            pd.DataFrame: bid, ask, mid and spread indexed by symbol in the
+                order given; NaN for symbols whose price could not be fetched
+        """
+        quotes = self.getter.get_json_many([f"/prices/{symbol}" for symbol in symbols])
+        return price_snapshot(symbols, quotes)
+
     def get_account_info(self):
         """Get account information"""
         try:
-            account_url = f"{self.base_url}/account/info"
-            response = self.session.get(account_url)
+            account_url = "/account/info"
+            response = self.http.get(account_url)
             
             if response.status_code == 200:
                 return response.json()
@@ -78,7 +93,7 @@ class AvaTradeWebTrader:
     def place_order(self, symbol, direction, volume):
         """Place a market order"""
         try:
-            order_url = f"{self.base_url}/trading/order"
+            order_url = "/trading/order"
             
             data = {
                 "symbol": symbol,
@@ -88,11 +103,16 @@ class AvaTradeWebTrader:
                 "timeInForce": "GTC"
             }
             
-            response = self.session.post(order_url, json=data)
+            response = self.http.post(order_url, json=data)
             
             if response.status_code == 200:
                 return response.json()
             return None
         except Exception as e:
             logging.error(f"Order placement error: {str(e)}")
-            return None 
\ No newline at end of file
+            return None 
+
+    def close(self):
+        """Close pooled connections"""
+        self.getter.close()
+        self.http.close()
@@ -0,0 +1,162 @@
+import logging
+import threading
+import numpy as np
+
+
+class BarRingBuffer:
+    """
+    Fixed-capacity OHLC history for one symbol and timeframe.
+
+    Every bar is stored twice, at pos and pos + capacity, so the most recent
+    bars are always one contiguous slice and view() never has to copy.
+    """
+
+    def __init__(self, capacity: int, dtype: np.dtype):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._written = 0
+        self.size = 0
+
+    @property
+    def first_time(self):
+        """Open time of the oldest bar held"""
+        return self.view()[0]['time'] if self.size else None
+
+    @property
+    def last_time(self):
+        """Open time of the newest bar held"""
+        return self._data[(self._written - 1) % self.capacity]['time'] if self.size else None
+
+    def extend(self, bars: np.ndarray):
+        """Append bars, oldest first, dropping the oldest held bars when full"""
+        bars = bars[-self.capacity:]
+        positions = (self._written + np.arange(len(bars))) % self.capacity
+        self._data[positions] = bars
+        self._data[positions + self.capacity] = bars
+        self._written += len(bars)
+        self.size = min(self.size + len(bars), self.capacity)
+
+    def replace_last(self, bar):
+        """Overwrite the newest bar, e.g. with a fresher copy of the forming bar"""
+        pos = (self._written - 1) % self.capacity
+        self._data[pos] = bar
+        self._data[pos + self.capacity] = bar
+
+    def merge(self, bars: np.ndarray):
+        """Add bars that overlap the held history, refreshing the newest held bar"""
+        bars = bars[bars['time'] >= self.last_time]
+        if len(bars) and bars[0]['time'] == self.last_time:
+            self.replace_last(bars[0])
+            bars = bars[1:]
+        self.extend(bars)
+
+    def clear(self):
+        """Drop all held bars"""
+        self._written = 0
+        self.size = 0
+
+    def view(self, count: int = None) -> np.ndarray:
+        """
+        Read-only view of the most recent bars, oldest first.
+
+        The view shares memory with the buffer, so it reflects later writes;
+        copy it if it has to outlive the next refresh.
+        """
+        count = self.size if count is None else min(count, self.size)
+        end = self._written % self.capacity + self.capacity
+        view = self._data[end - count:end]
+        view.flags.writeable = False
+        return view
+
+
+class BarCache:
+    """
+    Rolling per-(symbol, timeframe) bar history that only downloads new bars.
+
+    The first request for a key loads a full buffer. Later requests fetch a
+    handful of the latest bars, growing the request only until it overlaps
+    the cached history, and merge them in.
+    """
+
+    def __init__(self, fetch_from_pos, capacity: int = 500, refresh_bars: int = 3):
+        """
+        Args:
+            fetch_from_pos: fetch(symbol, timeframe, start_pos, count) returning
+                an MT5 rates array, like mt5.copy_rates_from_pos
+            capacity (int): Bars held per symbol and timeframe
+            refresh_bars (int): Bars requested first on a refresh
+        """
+        self.fetch = fetch_from_pos
+        self.capacity = capacity
+        self.refresh_bars = refresh_bars
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, timeframe, count: int):
+        """
+        Refresh and return the most recent bars for a symbol and timeframe.
+
+        Args:
+            symbol (str): Trading symbol
+            timeframe: Timeframe passed through to the fetch function
+            count (int): Number of bars wanted, at most the cache capacity
+
+        Returns:
+            np.ndarray: Read-only view of up to count bars, or None when the
+                data could not be fetched
+        """
+        buffer = self.refresh(symbol, timeframe)
+        return buffer.view(count) if buffer is not None else None
+
+    def peek(self, symbol: str, timeframe):
+        """Return the cached buffer for a key without refreshing it, or None"""
+        with self._lock:
+            return self._buffers.get((symbol, timeframe))
+
+    def refresh(self, symbol: str, timeframe):
+        """Bring the buffer for a key up to date and return it"""
+        buffer = self.peek(symbol, timeframe)
+        if buffer is None or buffer.size == 0:
+            rates = self.fetch(symbol, timeframe, 0, self.capacity)
+            if rates is None or len(rates) == 0:
+                logging.error(f"Unable to get {timeframe} bars for {symbol}")
+                return None
+            buffer = BarRingBuffer(self.capacity, rates.dtype)
+            buffer.extend(rates)
+            with self._lock:
+                self._buffers[(symbol, timeframe)] = buffer
+            return buffer
+
+        count = self.refresh_bars
+        while True:
+            rates = self.fetch(symbol, timeframe, 0, count)
+            if rates is None or len(rates) == 0:
+                logging.error(f"Unable to refresh {timeframe} bars for {symbol}")
+                return None
+            if len(rates) < count or rates[0]['time'] <= buffer.last_time or count >= self.capacity:
+                break
+            count = min(count * 2, self.capacity)
+
+        if rates[0]['time'] > buffer.last_time:
+            # More bars passed than the buffer holds; start over
+            buffer.clear()
+            buffer.extend(rates)
+        else:
+            buffer.merge(rates)
+        return buffer
+
+    def range(self, symbol: str, timeframe, start_time, end_time):
+        """
+        Return cached bars with start_time <= time <= end_time.
+
+        Returns:
+            np.ndarray: Read-only view, or None when the cache doesn't reach
+                back to start_time
+        """
+        buffer = self.refresh(symbol, timeframe) if self.peek(symbol, timeframe) else None
+        if buffer is None or buffer.first_time > start_time:
+            return None
+        bars = buffer.view()
+        lo = np.searchsorted(bars['time'], start_time, side='left')
+        hi = np.searchsorted(bars['time'], end_time, side='right')
+        return bars[lo:hi]
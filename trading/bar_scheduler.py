@@ -0,0 +1,88 @@
+import logging
+import math
+import time
+
+# Bar length in seconds. These timeframes close on multiples of their length
+# since the epoch; H4 and D1 depend on the broker's server timezone and are
+# left out.
+TIMEFRAME_SECONDS = {
+    'M1': 60,
+    'M5': 300,
+    'M15': 900,
+    'M30': 1800,
+    'H1': 3600
+}
+
+
+class BarScheduler:
+    """
+    Wake up right after bars close instead of polling on a fixed interval,
+    and remember the last bar seen per (symbol, timeframe) so unchanged bars
+    can be skipped.
+    """
+
+    def __init__(self, timeframes=('M1', 'M5', 'M15'), offset_seconds: float = 1.0,
+                 clock=time.time, sleep=time.sleep):
+        """
+        Args:
+            timeframes: Timeframes to wake up for, keys of TIMEFRAME_SECONDS
+            offset_seconds (float): Delay after the bar boundary, giving the
+                broker time to publish the new bar
+            clock: Returns the current epoch time in seconds
+            sleep: Sleeps for a number of seconds
+        """
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_SECONDS]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {unknown}")
+
+        self.timeframes = list(timeframes)
+        self.offset_seconds = offset_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.last_bars = {}
+
+    @property
+    def period(self) -> int:
+        """Seconds between wake-ups, the length of the shortest timeframe"""
+        return min(TIMEFRAME_SECONDS[tf] for tf in self.timeframes)
+
+    def next_close(self, now: float = None):
+        """
+        Find the next bar boundary after now.
+
+        Returns:
+            tuple: (wake-up epoch time including the offset, timeframes closing then)
+        """
+        now = self.clock() if now is None else now
+        # Boundaries are compared before the offset is added, so a wake-up that
+        # lands a little early still targets the bar that just closed
+        boundary = (math.floor((now - self.offset_seconds) / self.period) + 1) * self.period
+        closing = [tf for tf in self.timeframes if boundary % TIMEFRAME_SECONDS[tf] == 0]
+        return boundary + self.offset_seconds, closing
+
+    def wait(self) -> list:
+        """
+        Sleep until the next bar close plus the offset.
+
+        Returns:
+            list: Timeframes whose bar just closed
+        """
+        wake_time, closing = self.next_close()
+        delay = wake_time - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+        logging.debug(f"Bar close for {', '.join(closing)}")
+        return closing
+
+    def is_new_bar(self, symbol: str, timeframe: str, bar_time) -> bool:
+        """
+        Record the latest bar of a symbol and timeframe.
+
+        Returns:
+            bool: True when bar_time differs from the last bar recorded
+        """
+        key = (symbol, timeframe)
+        if self.last_bars.get(key) == bar_time:
+            return False
+        self.last_bars[key] = bar_time
+        return True
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HTTPTransport:
+    """
+    Shared HTTP session for a REST API.
+
+    Connections are pooled and kept alive between calls, every request gets
+    a timeout, and idempotent requests (GET, PUT, DELETE, ...) are retried
+    with exponential backoff on connection errors and the statuses in
+    RETRY_STATUSES. POST is only retried when the connection failed before
+    the request was sent, so an order is never submitted twice.
+    """
+
+    def __init__(self, base_url: str, timeout=DEFAULT_TIMEOUT, retries: int = 3,
+                 backoff_factor: float = 0.3, pool_maxsize: int = 20, headers: dict = None):
+        """
+        Args:
+            base_url (str): Prefix for request paths
+            timeout: Seconds, or a (connect, read) tuple, for every request
+            retries (int): Retries after the first attempt
+            backoff_factor (float): The first retry is immediate, retry n
+                after it sleeps backoff_factor * 2 ** (n - 1) seconds
+            pool_maxsize (int): Connections kept open to the host
+            headers (dict): Headers sent with every request
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    @property
+    def headers(self):
+        """Headers sent with every request, e.g. to set the auth token"""
+        return self.session.headers
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request on the pooled session with the default timeout"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request('POST', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConcurrentGetter:
+    """
+    Run many GET requests concurrently with a bounded number in flight.
+
+    A GET for a path that is already in flight, from this call or any other
+    thread, waits for the pending response instead of sending a duplicate.
+    """
+
+    def __init__(self, transport: HTTPTransport, max_workers: int = 8):
+        """
+        Args:
+            transport (HTTPTransport): Session to send the requests on
+            max_workers (int): Requests in flight at once
+        """
+        self.transport = transport
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http-get')
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, path: str):
+        """
+        Start a GET, or join the one already in flight for path
+
+        Returns:
+            Future: Resolves to the parsed JSON, or None when the request
+                failed, did not return 200 or returned a body that is not JSON
+        """
+        with self._lock:
+            future = self._in_flight.get(path)
+            if future is not None:
+                return future
+            future = self._pool.submit(self._fetch, path)
+            self._in_flight[path] = future
+        # Outside the lock: the callback runs at once if the request already finished
+        future.add_done_callback(lambda f: self._forget(path, f))
+        return future
+
+    def get_json_many(self, paths: list) -> list:
+        """GET several paths concurrently and return their JSON in order"""
+        futures = [self.get_json(path) for path in paths]
+        return [future.result() for future in futures]
+
+    def _fetch(self, path: str):
+        try:
+            response = self.transport.get(path)
+            return response.json() if response.status_code == 200 else None
+        except Exception as e:
+            # Transport errors and bodies that are not JSON (ValueError) alike
+            logging.error(f"Request error for {path}: {str(e)}")
+            return None
+
+    def _forget(self, path: str, future):
+        with self._lock:
+            if self._in_flight.get(path) is future:
+                del self._in_flight[path]
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class AsyncHTTPTransport:
+    """
+    asyncio front end for an HTTPTransport.
+
+    Requests run on a thread pool sized to the connection pool, so many
+    coroutines can wait on responses at once while reusing the same
+    keep-alive connections, timeouts and retries as the synchronous calls.
+    """
+
+    def __init__(self, transport: HTTPTransport, max_concurrency: int = None):
+        """
+        Args:
+            transport (HTTPTransport): Session to send the requests on
+            max_concurrency (int): Requests in flight at once, defaults to
+                the transport's pool size
+        """
+        self.transport = transport
+        self.max_concurrency = max_concurrency or transport.pool_maxsize
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='http')
+
+    async def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, lambda: self.transport.request(method, path, **kwargs)
+        )
+
+    async def get(self, path: str, **kwargs) -> requests.Response:
+        return await self.request('GET', path, **kwargs)
+
+    async def get_json_many(self, paths: list) -> list:
+        """
+        GET several paths concurrently.
+
+        Returns:
+            list: Parsed JSON per path, in order, or None where the request
+                failed, did not return 200 or returned a body that is not JSON
+        """
+        async def fetch(path):
+            try:
+                response = await self.get(path)
+                return response.json() if response.status_code == 200 else None
+            except Exception as e:
+                logging.error(f"Request error for {path}: {str(e)}")
+                return None
+
+        return await asyncio.gather(*(fetch(path) for path in paths))
+
+    def close(self):
+        self._pool.shutdown(wait=False)
@@ -5,10 +5,28 @@ import time
 import logging
 from dotenv import load_dotenv
 import os
+from .bar_cache import BarCache
+from .order_executor import OrderExecutor
+from .symbol_registry import SymbolRegistry
+from market_data.store import OHLCStore, to_utc
+
+# Timeframe strings used by the strategies, mapped to MT5 timeframes
+TIMEFRAMES = {
+    '1m': mt5.TIMEFRAME_M1,
+    '5m': mt5.TIMEFRAME_M5,
+    '15m': mt5.TIMEFRAME_M15,
+    '1h': mt5.TIMEFRAME_H1,
+    '4h': mt5.TIMEFRAME_H4,
+    '1d': mt5.TIMEFRAME_D1
+}
 
 class MT5Connector:
-    def __init__(self):
+    def __init__(self, store: OHLCStore = None):
         self.connected = False
+        self.bar_cache = BarCache(mt5.copy_rates_from_pos)
+        self.store = store
+        self.registry = SymbolRegistry()
+        self.executor = None
         # Your AvaTrade MT5 demo credentials
         self.login = 101490832
         self.password = "Abel3078@"
@@ -33,6 +51,9 @@ class MT5Connector:
                 return False
                 
             self.connected = True
+            if self.executor is None:
+                # One worker thread for the connector's life; reconnecting keeps it
+                self.executor = OrderExecutor(self.registry)
             account_info = mt5.account_info()
             logging.info(f"Successfully connected to MT5. Balance: ${account_info.balance}")
             return True
@@ -69,18 +90,18 @@ class MT5Connector:
             return None
             
         try:
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                logging.error(f"Failed to get symbol info: {mt5.last_error()}")
+            # Static fields are cached for good, bid/ask for the registry's TTL
+            quote = self.registry.quote(symbol)
+            if quote is None:
                 return None
                 
             return {
-                'bid': symbol_info.bid,
-                'ask': symbol_info.ask,
-                'spread': symbol_info.spread,
-                'digits': symbol_info.digits,
-                'volume_min': symbol_info.volume_min,
-                'volume_step': symbol_info.volume_step
+                'bid': quote['bid'],
+                'ask': quote['ask'],
+                'spread': quote['spread'],
+                'digits': quote['digits'],
+                'volume_min': quote['volume_min'],
+                'volume_step': quote['volume_step']
             }
         except Exception as e:
             logging.error(f"Symbol info error: {str(e)}")
@@ -88,46 +109,39 @@ class MT5Connector:
 
     def place_order(self, symbol, order_type, volume, price=None, 
                    stop_loss=None, take_profit=None):
-        """Place a trading order"""
-        if not self.connected:
+        """Place a trading order and wait for the result"""
+        future = self.submit_order(symbol, order_type, volume, price, stop_loss, take_profit)
+        if future is None:
             return None
             
         try:
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                return None
-                
-            point = symbol_info.point
-            
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": symbol,
-                "volume": float(volume),
-                "type": mt5.ORDER_TYPE_BUY if order_type.upper() == 'BUY' else mt5.ORDER_TYPE_SELL,
-                "price": price or (symbol_info.ask if order_type.upper() == 'BUY' else symbol_info.bid),
-                "deviation": 20,
-                "magic": 234000,
-                "comment": "Python Trading Bot",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
-            
-            if stop_loss:
-                request["sl"] = stop_loss
-            if take_profit:
-                request["tp"] = take_profit
-                
-            result = mt5.order_send(request)
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
-                logging.error(f"Order failed: {result.comment}")
-                return None
-                
-            logging.info(f"Order placed successfully: {result.order}")
-            return result.order
-            
+            return future.result()['order']
         except Exception as e:
             logging.error(f"Order placement error: {str(e)}")
             return None
+            
+    def submit_order(self, symbol, order_type, volume, price=None,
+                     stop_loss=None, take_profit=None, signal_time=None):
+        """
+        Queue a trading order on the order executor without waiting for it
+        
+        Returns:
+            Future: Resolves to the executor's fill result dict, or None when
+                not connected
+        """
+        if not self.connected:
+            return None
+            
+        return self.executor.submit(
+            symbol,
+            order_type,
+            volume,
+            price=price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            comment="Python Trading Bot",
+            signal_time=signal_time
+        )
 
     def get_positions(self):
         """Get open positions"""
@@ -156,31 +170,53 @@ class MT5Connector:
     def close(self):
         """Disconnect from MT5"""
         if self.connected:
+            self.executor.close()
+            self.executor = None
             mt5.shutdown()
             self.connected = False
             logging.info("Disconnected from MT5")
         
     def get_historical_data(self, symbol: str, timeframe: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """Get historical data from the local store, if any, topped up from MT5"""
+        if self.store is None:
+            return self._download_historical_data(symbol, timeframe, start_date, end_date)
+            
+        # Only download the ranges the store doesn't cover yet, gaps
+        # included. Reads work offline.
+        start, end = to_utc(start_date), to_utc(end_date)
+        for fetch_start, fetch_end in self.store.missing(symbol, timeframe, start, end):
+            # MT5 works in whole seconds and includes bars at the end time
+            df = self._download_historical_data(
+                symbol, timeframe,
+                fetch_start.ceil('s').tz_localize(None).to_pydatetime(),
+                (fetch_end - pd.Timedelta(1, 'ns')).floor('s').tz_localize(None).to_pydatetime()
+            )
+            if df is None:
+                # Stored bars alone would have a hole where this range is
+                return None
+            self.store.save_download(symbol, timeframe, fetch_start, fetch_end, df)
+                
+        df = self.store.read(symbol, timeframe, start, end, tz=None)
+        return df if not df.empty else None
+        
+    def _download_historical_data(self, symbol: str, timeframe: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
         """Get historical data from MT5"""
         if not self.connected:
             return None
             
-        # Convert timeframe string to MT5 timeframe
-        timeframe_map = {
-            '1m': mt5.TIMEFRAME_M1,
-            '5m': mt5.TIMEFRAME_M5,
-            '15m': mt5.TIMEFRAME_M15,
-            '1h': mt5.TIMEFRAME_H1,
-            '4h': mt5.TIMEFRAME_H4,
-            '1d': mt5.TIMEFRAME_D1
-        }
-        
-        if timeframe not in timeframe_map:
+        if timeframe not in TIMEFRAMES:
             logging.error(f"Invalid timeframe: {timeframe}")
             return None
             
-        # Get historical data
-        rates = mt5.copy_rates_range(symbol, timeframe_map[timeframe], start_date, end_date)
+        # Serve the range from the rolling bar cache when it reaches back far
+        # enough, otherwise download it
+        rates = self.bar_cache.range(
+            symbol, TIMEFRAMES[timeframe],
+            int(pd.Timestamp(start_date).timestamp()),
+            int(pd.Timestamp(end_date).timestamp())
+        )
+        if rates is None:
+            rates = mt5.copy_rates_range(symbol, TIMEFRAMES[timeframe], start_date, end_date)
         if rates is None:
             logging.error(f"Failed to get historical data: {mt5.last_error()}")
             return None
@@ -201,6 +237,25 @@ class MT5Connector:
         
         return df
         
+    def get_recent_rates(self, symbol: str, timeframe: str, count: int = 100):
+        """
+        Get the most recent bars as a read-only view of the rolling bar cache.
+        
+        Only bars that arrived since the previous call are downloaded. The
+        view shares memory with the cache; copy it to keep it past the next call.
+        
+        Returns:
+            np.ndarray: MT5 rates records, oldest first, or None on failure
+        """
+        if not self.connected:
+            return None
+            
+        if timeframe not in TIMEFRAMES:
+            logging.error(f"Invalid timeframe: {timeframe}")
+            return None
+            
+        return self.bar_cache.get(symbol, TIMEFRAMES[timeframe], count)
+        
     def close_order(self, order_id: int) -> bool:
         """Close an existing order"""
         if not self.connected:
@@ -213,6 +268,9 @@ class MT5Connector:
             return False
             
         order = order[0]
+        tick = self.registry.tick(order.symbol, max_age=0)
+        if tick is None:
+            return False
         
         # Prepare close request
         request = {
@@ -221,7 +279,7 @@ class MT5Connector:
             "volume": order.volume,
             "type": mt5.ORDER_TYPE_SELL if order.type == mt5.POSITION_TYPE_BUY else mt5.ORDER_TYPE_BUY,
             "position": order.ticket,
-            "price": mt5.symbol_info_tick(order.symbol).bid if order.type == mt5.POSITION_TYPE_BUY else mt5.symbol_info_tick(order.symbol).ask,
+            "price": tick.bid if order.type == mt5.POSITION_TYPE_BUY else tick.ask,
             "deviation": 20,
             "magic": 234000,
             "comment": "Python Trading Bot - Close",
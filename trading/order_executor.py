@@ -0,0 +1,200 @@
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import MetaTrader5 as mt5
+from .symbol_registry import SymbolRegistry
+
+# Placed on the queue to stop the worker
+_STOP = object()
+
+
+class OrderExecutor:
+    """
+    Send market orders from a dedicated worker thread.
+
+    submit() only queues the order and returns a Future, so a slow fill never
+    holds up the caller. The worker drains everything queued since its last
+    pass as one batch: it reads one fresh tick per symbol in the batch, then
+    sends the orders back to back. Symbol properties and ticks come from a
+    SymbolRegistry, so static data is fetched once.
+    """
+
+    def __init__(self, registry: SymbolRegistry = None, magic: int = 234000, deviation: int = 20,
+                 max_batch: int = 32, latency_history: int = 1000):
+        """
+        Args:
+            registry (SymbolRegistry): Shared symbol metadata, a new one when None
+            magic (int): Magic number stamped on every order
+            deviation (int): Allowed slippage in points
+            max_batch (int): Most orders sent in one pass
+            latency_history (int): Signal-to-fill latencies kept for stats
+        """
+        self.magic = magic
+        self.deviation = deviation
+        self.max_batch = max_batch
+        self.latencies = deque(maxlen=latency_history)
+        self.registry = registry or SymbolRegistry()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='order-executor', daemon=True)
+        self._worker.start()
+
+    def prefetch(self, symbols: list):
+        """Load the static properties of symbols before trading them"""
+        self.registry.load(symbols)
+
+    def submit(self, symbol: str, order_type: str, volume: float, price: float = None,
+               stop_loss: float = None, take_profit: float = None, sl_points: float = None,
+               tp_points: float = None, comment: str = "python", signal_time: float = None) -> Future:
+        """
+        Queue a market order.
+
+        Stops are given either as prices (stop_loss, take_profit) or as
+        distances in points from the fill price (sl_points, tp_points).
+
+        Args:
+            symbol (str): Trading symbol
+            order_type (str): 'BUY' or 'SELL'
+            volume (float): Lots, rounded down to the symbol's volume step and
+                clamped to its volume_min and volume_max
+            price (float): Order price, the current ask/bid when None
+            signal_time (float): time.perf_counter() when the signal was
+                produced, defaults to now; used for the latency figure
+
+        Returns:
+            Future: Resolves to a dict with the order ticket (None unless
+                filled), retcode, comment, price, volume and latency_ms
+        """
+        future = Future()
+        self._queue.put((future, {
+            'symbol': symbol,
+            'order_type': order_type.upper(),
+            'volume': volume,
+            'price': price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'sl_points': sl_points,
+            'tp_points': tp_points,
+            'comment': comment,
+            'signal_time': signal_time if signal_time is not None else time.perf_counter()
+        }))
+        return future
+
+    def latency_stats(self) -> dict:
+        """Mean, median and worst signal-to-fill latency in ms over recent orders"""
+        if not self.latencies:
+            return None
+        values = sorted(self.latencies)
+        return {
+            'orders': len(values),
+            'mean_ms': sum(values) / len(values),
+            'median_ms': values[len(values) // 2],
+            'max_ms': values[-1]
+        }
+
+    def _run(self):
+        """Worker loop: wait for an order, then send everything queued as a batch"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            orders = [item for item in batch if item is not _STOP]
+            if orders:
+                self._send_batch(orders)
+            if stop:
+                return
+
+    def _send_batch(self, orders: list):
+        """Send queued orders; orders on the same symbol share one tick read"""
+        ticks = {}
+        for future, order in orders:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                symbol = order['symbol']
+                if symbol not in ticks:
+                    # Read the tick fresh for the first order of each symbol
+                    ticks[symbol] = self.registry.tick(symbol, max_age=0)
+                future.set_result(self._send(order, ticks[symbol]))
+            except Exception as e:
+                logging.error(f"Order placement error for {order['symbol']}: {str(e)}")
+                future.set_exception(e)
+
+    def _send(self, order: dict, tick) -> dict:
+        """Build and send one order request"""
+        symbol = order['symbol']
+        properties = self.registry.properties(symbol)
+        if properties is None or tick is None:
+            return self._result(order, None, None, "No symbol info or tick")
+
+        buy = order['order_type'] == 'BUY'
+        price = order['price'] or (tick.ask if buy else tick.bid)
+        point, digits = properties['point'], properties['digits']
+        step = properties['volume_step']
+        # Round down to the volume step, allowing for float error in the
+        # division, then clamp to what the symbol accepts
+        volume = math.floor(order['volume'] / step + 1e-9) * step
+        volume = min(max(volume, properties['volume_min']), properties['volume_max'])
+
+        stop_loss, take_profit = order['stop_loss'], order['take_profit']
+        if order['sl_points'] is not None:
+            stop_loss = price - order['sl_points'] * point if buy else price + order['sl_points'] * point
+        if order['tp_points'] is not None:
+            take_profit = price + order['tp_points'] * point if buy else price - order['tp_points'] * point
+
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": symbol,
+            "volume": float(round(volume, 8)),
+            "type": mt5.ORDER_TYPE_BUY if buy else mt5.ORDER_TYPE_SELL,
+            "price": price,
+            "deviation": self.deviation,
+            "magic": self.magic,
+            "comment": order['comment'],
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+        if stop_loss:
+            request["sl"] = round(stop_loss, digits)
+        if take_profit:
+            request["tp"] = round(take_profit, digits)
+
+        result = mt5.order_send(request)
+        if result is None:
+            return self._result(order, None, None, f"order_send failed: {mt5.last_error()}", request)
+        filled = result.retcode == mt5.TRADE_RETCODE_DONE
+        if not filled:
+            logging.error(f"Order failed for {symbol}: {result.comment}")
+        return self._result(order, result.order if filled else None, result.retcode, result.comment,
+                            request, getattr(result, 'price', price))
+
+    def _result(self, order: dict, ticket, retcode, comment: str, request: dict = None,
+                price: float = None) -> dict:
+        """Package an order outcome and record its latency"""
+        latency_ms = (time.perf_counter() - order['signal_time']) * 1000
+        self.latencies.append(latency_ms)
+        if ticket:
+            logging.info(f"Order placed successfully: {ticket} ({order['symbol']}, {latency_ms:.0f} ms after signal)")
+        return {
+            'symbol': order['symbol'],
+            'order': ticket,
+            'retcode': retcode,
+            'comment': comment,
+            'price': price,
+            'volume': request['volume'] if request else None,
+            'latency_ms': latency_ms
+        }
+
+    def close(self, wait: bool = True):
+        """Stop the worker after the orders already queued"""
+        self._queue.put(_STOP)
+        if wait:
+            self._worker.join()
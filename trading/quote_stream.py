@@ -0,0 +1,236 @@
+import asyncio
+import csv
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+
+# A quote is a dict {'symbol', 'bid', 'ask', 'time'}, time in epoch seconds.
+
+
+class QuoteSource(ABC):
+    """Push-style source of quotes for one or more symbols"""
+
+    @abstractmethod
+    def quotes(self):
+        """Async iterator of quote dicts, running until the source ends"""
+        pass
+
+
+class AvaTradeWebSocketSource(QuoteSource):
+    """
+    Quotes pushed over an AvaTrade websocket.
+
+    Subscribes to the symbols after connecting and reconnects with growing
+    delays when the connection drops. Needs the websockets package.
+    """
+
+    def __init__(self, url: str, symbols: list, token: str = None, max_backoff: float = 30):
+        """
+        Args:
+            url (str): Websocket endpoint
+            symbols (list): Symbols to subscribe to
+            token (str): Bearer token from the REST login, if required
+            max_backoff (float): Longest wait in seconds between reconnects
+        """
+        self.url = url
+        self.symbols = symbols
+        self.token = token
+        self.max_backoff = max_backoff
+
+    async def quotes(self):
+        import websockets
+
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else None
+        backoff = 1
+        while True:
+            try:
+                async with websockets.connect(self.url, extra_headers=headers) as ws:
+                    await ws.send(json.dumps({'action': 'subscribe', 'symbols': self.symbols}))
+                    backoff = 1
+                    async for message in ws:
+                        quote = self.parse(message)
+                        if quote:
+                            yield quote
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Quote websocket error, reconnecting in {backoff}s: {str(e)}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    @staticmethod
+    def parse(message):
+        """Turn one websocket message into a quote, or None for other messages"""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return None
+        symbol = data.get('symbol') or data.get('instrumentName')
+        if not symbol or 'bid' not in data or 'ask' not in data:
+            return None
+        return {
+            'symbol': symbol,
+            'bid': float(data['bid']),
+            'ask': float(data['ask']),
+            'time': float(data.get('time', time.time()))
+        }
+
+
+class MT5TickSource(QuoteSource):
+    """
+    Quotes polled from the MT5 terminal, emitted only when a tick changes.
+    Needs the MetaTrader5 package, imported here so the other sources work
+    without it.
+    """
+
+    def __init__(self, symbols: list, interval: float = 0.1):
+        """
+        Args:
+            symbols (list): Symbols to poll
+            interval (float): Seconds between polls
+        """
+        import MetaTrader5 as mt5
+        self.mt5 = mt5
+        self.symbols = symbols
+        self.interval = interval
+
+    async def quotes(self):
+        last_seen = {}
+        while True:
+            ticks = await asyncio.to_thread(lambda: [(s, self.mt5.symbol_info_tick(s)) for s in self.symbols])
+            for symbol, tick in ticks:
+                if tick is None or last_seen.get(symbol) == tick.time_msc:
+                    continue
+                last_seen[symbol] = tick.time_msc
+                yield {'symbol': symbol, 'bid': tick.bid, 'ask': tick.ask, 'time': tick.time_msc / 1000}
+            await asyncio.sleep(self.interval)
+
+
+class ReplaySource(QuoteSource):
+    """
+    Quotes replayed from a CSV file with time, symbol, bid and ask columns,
+    e.g. recorded from a live feed. Useful for tests and offline runs.
+    """
+
+    def __init__(self, path: str, speed: float = None):
+        """
+        Args:
+            path (str): CSV file, sorted by time (epoch seconds)
+            speed (float): Replay speed relative to the recorded pace, None
+                to replay as fast as the consumers allow
+        """
+        self.path = path
+        self.speed = speed
+
+    async def quotes(self):
+        with open(self.path, newline='') as f:
+            first_time = start = None
+            for row in csv.DictReader(f):
+                quote = {
+                    'symbol': row['symbol'],
+                    'bid': float(row['bid']),
+                    'ask': float(row['ask']),
+                    'time': float(row['time'])
+                }
+                if self.speed:
+                    if first_time is None:
+                        first_time, start = quote['time'], time.monotonic()
+                    delay = (quote['time'] - first_time) / self.speed - (time.monotonic() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    # Let consumers run between quotes
+                    await asyncio.sleep(0)
+                yield quote
+
+
+class QuoteStream:
+    """
+    Fan quotes from a source out into one bounded asyncio queue per symbol.
+
+    When a symbol's consumer falls behind, policy 'block' pauses the whole
+    source until there is room again, while 'drop_oldest' discards the
+    stalest queued quote so consumers always see the latest prices.
+    """
+
+    def __init__(self, source: QuoteSource, maxsize: int = 1000, policy: str = 'drop_oldest'):
+        """
+        Args:
+            source (QuoteSource): Where quotes come from
+            maxsize (int): Quotes queued per symbol
+            policy (str): 'block' or 'drop_oldest' when a queue is full
+        """
+        if policy not in ('block', 'drop_oldest'):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.source = source
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queues = {}
+        self.dropped = {}
+        self.received = 0
+
+    def queue(self, symbol: str) -> asyncio.Queue:
+        """The queue a symbol's quotes are delivered to"""
+        if symbol not in self.queues:
+            self.queues[symbol] = asyncio.Queue(maxsize=self.maxsize)
+            self.dropped[symbol] = 0
+        return self.queues[symbol]
+
+    async def run(self):
+        """Pump quotes from the source into the queues until it ends"""
+        async for quote in self.source.quotes():
+            self.received += 1
+            await self._put(quote['symbol'], quote)
+        # Tell consumers the stream has ended
+        for symbol in list(self.queues):
+            await self._put(symbol, None)
+
+    async def _put(self, symbol: str, item):
+        queue = self.queue(symbol)
+        if self.policy == 'block':
+            await queue.put(item)
+            return
+        if queue.full():
+            queue.get_nowait()
+            self.dropped[symbol] += 1
+        queue.put_nowait(item)
+
+    async def consume(self, symbol: str, handler):
+        """
+        Call handler(quote) for every quote of a symbol until the stream ends.
+
+        handler may be a plain function, e.g. strategy.update, or a coroutine
+        function.
+        """
+        queue = self.queue(symbol)
+        while True:
+            quote = await queue.get()
+            if quote is None:
+                return
+            result = handler(quote)
+            if asyncio.iscoroutine(result):
+                await result
+
+
+async def run_strategies(stream: QuoteStream, strategies: dict, on_signals=None):
+    """
+    Feed each strategy the quotes of its symbol as they arrive.
+
+    Args:
+        stream (QuoteStream): Quote stream to read
+        strategies (dict): Strategy per symbol with an update(quote) method
+            returning a list of signals, like ICTCombinedStrategy
+        on_signals: Called with (symbol, signals, latency_ms) for every
+            non-empty signal list; latency is measured from the quote's time
+    """
+    def handler_for(symbol, strategy):
+        def handle(quote):
+            signals = strategy.update(quote)
+            if signals and on_signals:
+                on_signals(symbol, signals, (time.time() - quote['time']) * 1000)
+        return handle
+
+    consumers = [stream.consume(symbol, handler_for(symbol, strategy))
+                 for symbol, strategy in strategies.items()]
+    await asyncio.gather(stream.run(), *consumers)
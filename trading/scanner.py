@@ -0,0 +1,98 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+
+class MarketScanner:
+    """
+    Fetch market data for many symbols concurrently and analyse it in parallel.
+
+    Fetches run on a thread pool, since they are I/O bound calls into the
+    terminal. Analysis runs in a process pool so the pandas work of one symbol
+    doesn't hold the GIL for the others. The analyse callable must be a
+    module-level function so it can be sent to the worker processes.
+    """
+
+    def __init__(self, fetch, analyze, io_workers: int = 8, analysis_workers: int = None,
+                 use_processes: bool = True):
+        """
+        Args:
+            fetch: fetch(symbol) -> tuple of arguments for analyze, or None
+            analyze: analyze(symbol, *data) -> signal dict or None
+            io_workers (int): Threads used for data fetches. Use 1 to keep all
+                terminal calls on a single dedicated I/O thread.
+            analysis_workers (int): Worker processes, defaults to the CPU count
+            use_processes (bool): Analyse in the calling thread instead when False
+        """
+        self.fetch = fetch
+        self.analyze = analyze
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='market-io')
+        self.analysis_pool = ProcessPoolExecutor(max_workers=analysis_workers) if use_processes else None
+        self.last_cycle = None
+
+    def scan(self, symbols: list) -> dict:
+        """
+        Run one fetch and analysis cycle over the given symbols.
+
+        Analysis of a symbol starts as soon as its data arrives, so slow
+        fetches overlap with the analysis of symbols that are already in.
+
+        Args:
+            symbols (list): Symbols to scan
+
+        Returns:
+            dict: Signal (or None) per symbol that could be fetched and analysed
+        """
+        start = time.perf_counter()
+        fetches = {self.io_pool.submit(self.fetch, symbol): symbol for symbol in symbols}
+        analyses = {}
+        signals = {}
+
+        for future in as_completed(fetches):
+            symbol = fetches[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                logging.error(f"Error fetching data for {symbol}: {str(e)}")
+                continue
+            if data is None:
+                continue
+            if self.analysis_pool:
+                analyses[symbol] = self.analysis_pool.submit(self.analyze, symbol, *data)
+            else:
+                signals[symbol] = self._analyze_inline(symbol, data)
+        fetched = time.perf_counter()
+
+        for symbol, future in analyses.items():
+            try:
+                signals[symbol] = future.result()
+            except Exception as e:
+                logging.error(f"Error analysing {symbol}: {str(e)}")
+        finished = time.perf_counter()
+
+        self.last_cycle = {
+            'symbols': len(symbols),
+            'fetch_ms': (fetched - start) * 1000,
+            'analysis_ms': (finished - fetched) * 1000,
+            'total_ms': (finished - start) * 1000
+        }
+        logging.info(
+            f"Scanned {len(symbols)} symbols in {self.last_cycle['total_ms']:.0f} ms "
+            f"(fetch {self.last_cycle['fetch_ms']:.0f} ms, "
+            f"analysis {self.last_cycle['analysis_ms']:.0f} ms)"
+        )
+        return signals
+
+    def _analyze_inline(self, symbol: str, data: tuple):
+        """Analyse one symbol in the calling thread"""
+        try:
+            return self.analyze(symbol, *data)
+        except Exception as e:
+            logging.error(f"Error analysing {symbol}: {str(e)}")
+            return None
+
+    def close(self):
+        """Shut down the worker pools"""
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        if self.analysis_pool:
+            self.analysis_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+import MetaTrader5 as mt5
+
+
+class SymbolRegistry:
+    """
+    Symbol metadata with as few terminal round trips as possible.
+
+    Static properties (point, digits, volume limits) are loaded from
+    mt5.symbol_info once per symbol. Live bid/ask comes from
+    mt5.symbol_info_tick and is reused for ttl seconds, so several reads of
+    the same price within one trading cycle share a single call.
+    """
+
+    def __init__(self, ttl: float = 0.5, clock=time.monotonic):
+        """
+        Args:
+            ttl (float): Seconds a tick is served from the cache
+            clock: Returns the current time in seconds
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self._properties = {}
+        self._ticks = {}
+        self._lock = threading.Lock()
+
+    def load(self, symbols: list):
+        """Load the static properties of symbols up front"""
+        for symbol in symbols:
+            self.properties(symbol)
+
+    def properties(self, symbol: str) -> dict:
+        """
+        Static properties of a symbol, fetched from the terminal once
+
+        Returns:
+            dict: point, digits, volume_min, volume_max and volume_step, or None
+        """
+        with self._lock:
+            if symbol in self._properties:
+                return self._properties[symbol]
+
+        info = mt5.symbol_info(symbol)
+        if info is None:
+            logging.error(f"Failed to get symbol info for {symbol}: {mt5.last_error()}")
+            return None
+        properties = {
+            'point': info.point,
+            'digits': info.digits,
+            'volume_min': info.volume_min,
+            'volume_max': info.volume_max,
+            'volume_step': info.volume_step
+        }
+        with self._lock:
+            self._properties[symbol] = properties
+        return properties
+
+    def tick(self, symbol: str, max_age: float = None):
+        """
+        Latest tick of a symbol, from the cache when younger than max_age
+
+        Args:
+            symbol (str): Trading symbol
+            max_age (float): Oldest acceptable tick in seconds, defaults to ttl;
+                0 always asks the terminal
+
+        Returns:
+            The mt5 tick (bid, ask, time, ...), or None
+        """
+        max_age = self.ttl if max_age is None else max_age
+        now = self.clock()
+        with self._lock:
+            cached = self._ticks.get(symbol)
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
+
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            logging.error(f"Failed to get tick for {symbol}: {mt5.last_error()}")
+            return None
+        with self._lock:
+            self._ticks[symbol] = (now, tick)
+        return tick
+
+    def quote(self, symbol: str, max_age: float = None) -> dict:
+        """
+        Static properties plus live bid, ask and spread in points
+
+        Returns:
+            dict: The keys of properties() plus bid, ask and spread, or None
+        """
+        properties = self.properties(symbol)
+        tick = self.tick(symbol, max_age)
+        if properties is None or tick is None:
+            return None
+        return {
+            **properties,
+            'bid': tick.bid,
+            'ask': tick.ask,
+            'spread': int(round((tick.ask - tick.bid) / properties['point']))
+        }
+
+    def invalidate(self, symbol: str = None):
+        """Forget cached ticks, of one symbol or of all"""
+        with self._lock:
+            if symbol is None:
+                self._ticks.clear()
+            else:
+                self._ticks.pop(symbol, None)